@@ -1,15 +1,32 @@
-from flask import Flask
-from flask_sqlalchemy import SQLAlchemy
-from flask_cors import CORS
 from .config import Config
 
-db = SQLAlchemy()
+# Flask and Flask-SQLAlchemy are imported by create_app()/the first use of
+# `db`, so CLI scripts importing app.services do not load the web stack
+_db = None
+_apps = []
+
+def __getattr__(name):
+    global _db
+    if name == 'db':
+        if _db is None:
+            from flask_sqlalchemy import SQLAlchemy
+            _db = SQLAlchemy()
+            for app in _apps:
+                _db.init_app(app)
+        return _db
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def create_app(config_class=Config):
+    from flask import Flask
+    from flask_cors import CORS
+
     app = Flask(__name__)
     app.config.from_object(config_class)
 
-    db.init_app(app)
+    # The database extension is set up when the models first use `db`
+    _apps.append(app)
+    if _db is not None:
+        _db.init_app(app)
     CORS(app)
 
     from .api import bp as api_bp
@@ -1,15 +1,22 @@
-from flask import jsonify, request, send_from_directory, send_file, current_app
+from flask import jsonify, request, send_from_directory, send_file, current_app, url_for
 from . import bp
-from ..services.data_fetcher import MarketDataFetcher
-from ..services.technical_analysis import TechnicalAnalyzer
-from ..services.report_generator import ReportGenerator
-from ..services.chart_generator import ChartGenerator
+from ..services.artifact_cache import default_artifact_cache
+from ..services.job_queue import get_job_queue
+from ..services.response_cache import ResponseCache, http_date, ttl_for_interval
 from datetime import datetime
+from functools import lru_cache
 import os
+import time
 
-data_fetcher = MarketDataFetcher()
-report_generator = ReportGenerator()
-chart_generator = ChartGenerator()
+# Services that need pandas/TA-Lib/matplotlib/ReportLab are imported on first
+# use (or inside report jobs), so the API starts without the scientific stack
+@lru_cache(maxsize=None)
+def get_data_fetcher():
+    from ..services.data_fetcher import MarketDataFetcher
+    return MarketDataFetcher()
+
+artifact_cache = default_artifact_cache()
+market_data_cache = ResponseCache()
 
 @bp.route('/reports/view/<filename>', methods=['GET'])
 def view_report(filename):
@@ -20,130 +27,128 @@ def view_report(filename):
     reports_dir = os.path.join(project_root, 'reports')
     return send_from_directory(reports_dir, filename)
 
+@bp.route('/reports/latest/<symbol>', methods=['GET'])
+def latest_report(symbol):
+    """Serve the newest cached report for a symbol (?weekly=1 for the weekly one)"""
+    kind = 'weekly_report' if request.args.get('weekly') else 'report'
+    entry = artifact_cache.latest(kind, symbol.upper()) if artifact_cache else None
+    if entry is None:
+        return jsonify({'error': f'No cached report for {symbol}'}), 404
+    return send_file(entry['path'], mimetype='application/pdf', download_name=entry['filename'])
+
 @bp.route('/reports/preview/<filename>/<int:page>', methods=['GET'])
 def preview_report_page(filename, page):
-    """Render a PDF page to PNG for quick preview"""
+    """PNG of a PDF page (?size=thumb for a thumbnail), served from the preview cache"""
+    from ..services.preview_cache import get_preview_cache
+    # Get project root directory
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+    reports_dir = os.path.join(project_root, 'reports')
+    pdf_path = os.path.join(reports_dir, os.path.basename(filename))
+    if not os.path.exists(pdf_path):
+        return jsonify({'error': 'File not found'}), 404
     try:
-        import fitz
-        import io
-        # Get project root directory
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
-        reports_dir = os.path.join(project_root, 'reports')
-        pdf_path = os.path.join(reports_dir, filename)
-        if not os.path.exists(pdf_path):
-            return jsonify({'error': 'File not found'}), 404
-        doc = fitz.open(pdf_path)
-        if page < 1 or page > len(doc):
-            return jsonify({'error': 'Invalid page index'}), 400
-        zoom = 2.0
-        mat = fitz.Matrix(zoom, zoom)
-        pix = doc.load_page(page - 1).get_pixmap(matrix=mat, alpha=False)
-        img_bytes = pix.tobytes("png")
-        return send_file(io.BytesIO(img_bytes), mimetype='image/png')
+        png, etag = get_preview_cache().get(pdf_path, page, request.args.get('size', 'full'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+    response = current_app.response_class(png, mimetype='image/png')
+    response.set_etag(etag)
+    # Keyed by the PDF's content hash, so a page image never changes under its ETag
+    response.cache_control.public = True
+    response.cache_control.max_age = 86400
+    return response.make_conditional(request)
+
 @bp.route('/health', methods=['GET'])
 def health_check():
     return jsonify({'status': 'healthy', 'service': 'trading-report-generator-api'})
 
 @bp.route('/market-data/<symbol>', methods=['GET'])
 def get_market_data(symbol):
-    """Fetch market data for a symbol"""
-    try:
-        period = request.args.get('period', '3mo')
-        data = data_fetcher.fetch_data(symbol, period)
-        
-        return jsonify({
+    """Fetch market data for a symbol (cached per interval; supports ETag/If-Modified-Since)"""
+    period = request.args.get('period', '3mo')
+    interval = request.args.get('interval', '1d')
+
+    def load():
+        data = get_data_fetcher().fetch_data(symbol, period, interval=interval)
+        return {
             'success': True,
             'symbol': symbol,
             'data': data.tail(10).to_dict('records'),  # Last 10 candles
             'latest_price': float(data['Close'].iloc[-1])
-        })
+        }
+
+    try:
+        ttl = ttl_for_interval(interval)
+        entry = market_data_cache.get((symbol.upper(), period, interval), load, ttl)
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+    response = jsonify(entry['body'])
+    response.set_etag(entry['etag'])
+    response.last_modified = http_date(entry['last_modified'])
+    response.cache_control.public = True
+    response.cache_control.max_age = max(0, int(entry['expires'] - time.time()))
+    return response.make_conditional(request)
+
+@bp.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    """Hit rates of the API response cache"""
+    return jsonify({'market_data': market_data_cache.get_stats()})
+
 @bp.route('/reports/generate', methods=['POST'])
 def generate_report():
-    """Generate trading report with technical analysis"""
+    """Queue a report job; poll the returned status_url for progress and the PDF URL"""
+    data = request.get_json(silent=True) or {}
+    params = {
+        'symbol': data.get('symbol', 'BANKNIFTY'),
+        'period': data.get('period', '3mo'),
+        'report_date': data.get('report_date'),
+    }
+    if params['report_date']:
+        try:
+            datetime.strptime(params['report_date'], '%Y-%m-%d')
+        except ValueError:
+            return jsonify({'error': 'report_date must be YYYY-MM-DD'}), 400
+
     try:
-        data = request.json
-        symbol = data.get('symbol', 'BANKNIFTY')
-        period = data.get('period', '3mo')
-        report_date_str = data.get('report_date')
-        
-        if report_date_str:
-            report_datetime = datetime.strptime(report_date_str, '%Y-%m-%d')
-        else:
-            report_datetime = datetime.now()
-        
-        # Fetch market data
-        market_data = data_fetcher.fetch_data(symbol, period)
-        
-        # Perform technical analysis
-        analyzer = TechnicalAnalyzer(market_data)
-        indicators = analyzer.calculate_all_indicators()
-        trend = analyzer.get_trend()
-        signals = analyzer.get_signal()
-        support_resistance = analyzer.get_support_resistance()
-        patterns = analyzer.get_candlestick_patterns()
-        trade_bias = analyzer.get_trade_bias()
-        risk_context = analyzer.get_risk_context()
-        market_regime = analyzer.get_market_regime()
-        position_sizing = analyzer.get_position_sizing()
-        overall_signal = analyzer.get_overall_signal()
-        action_plan = analyzer.generate_actionable_plan()
-        timeframe = {
-            'data_period': '3 months daily data' if period == '3mo' else period,
-            'analysis_type': 'Swing/Positional (1-5 days)',
-            'chart_interval': '1 Day'
-        }
-        
-        # Generate Chart
-        chart_path = chart_generator.generate_chart(symbol, market_data, indicators, support_resistance)
+        job_id, coalesced = get_job_queue().submit('report', params)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        # Prepare report data
-        report_data = {
-            'symbol': symbol,
-            'date': report_datetime.strftime('%Y-%m-%d %H:%M:%S'),
-            'indicators': indicators,
-            'trend': trend,
-            'signals': signals,
-            'support_resistance': support_resistance,
-            'patterns': patterns,
-            'chart_path': chart_path,
-            'trade_bias': trade_bias,
-            'risk_context': risk_context,
-            'timeframe': timeframe,
-            'market_regime': market_regime,
-            'position_sizing': position_sizing,
-            'overall_signal': overall_signal,
-            'action_plan': action_plan
-        }
-        
-        # Clean up old reports before generating new ones
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
-        reports_dir = os.path.join(project_root, 'reports')
-        
-        # Delete all old reports except weekly ones (if any)
-        files_deleted = 0
-        for filename in os.listdir(reports_dir):
-            file_path = os.path.join(reports_dir, filename)
-            if os.path.isfile(file_path) and filename.endswith('.pdf'):
-                os.remove(file_path)
-                files_deleted += 1
-        print(f"Deleted {files_deleted} old reports from {reports_dir}")
-        
-        # Generate PDF
-        pdf_path = report_generator.generate_pdf(report_data)
-        
-        return jsonify({
+    status_url = url_for('api.report_job_status', job_id=job_id)
+    response = jsonify({
+        'success': True,
+        'job_id': job_id,
+        'coalesced': coalesced,
+        'status_url': status_url,
+    })
+    response.headers['Location'] = status_url
+    return response, 202
+
+@bp.route('/reports/jobs/<job_id>', methods=['GET'])
+def report_job_status(job_id):
+    """Stage and progress of a report job; links the PDF once it is done"""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+
+    body = {
+        'job_id': job_id,
+        'status': job['status'],
+        'stage': job['stage'],
+        'progress': job['progress'],
+    }
+    if job['status'] == 'done':
+        result = job['result']
+        body.update({
             'success': True,
-            'report_path': pdf_path,
-            'data': report_data
+            'report_path': result['report_path'],
+            'report_url': url_for('api.view_report', filename=result['report_filename']),
+            'data': result['data'],
         })
-    
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    elif job['status'] == 'failed':
+        body.update({'success': False, 'error': job['error']})
+    return jsonify(body)
@@ -3,8 +3,24 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+def env_flag(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///app.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     ALPHA_VANTAGE_API_KEY = os.environ.get('ALPHA_VANTAGE_API_KEY')
+    # Market data provider: yfinance | tradingview | replay | synthetic
+    DATA_SOURCE = os.environ.get('DATA_SOURCE') or 'yfinance'
+    REPLAY_DIR = os.environ.get('REPLAY_DIR')
+    REPLAY_AS_OF = os.environ.get('REPLAY_AS_OF')
+    SYNTHETIC_SEED = int(os.environ.get('SYNTHETIC_SEED') or 42)
+    SYNTHETIC_END = os.environ.get('SYNTHETIC_END') or '2024-12-31'
+    # Report jobs run on Celery when a broker is configured, otherwise in-process
+    CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL')
+    CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND')
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS') or 2)
@@ -80,9 +80,9 @@ class OptionData(db.Model):
     option_type = db.Column(db.String(4), nullable=False) # CALL or PUT
     ltp = db.Column(db.Numeric(10, 2))
     open_interest = db.Column(db.BigInteger)
-    delta = db.Column(db.Numeric(5, 4))
-    gamma = db.Column(db.Numeric(5, 4))
-    theta = db.Column(db.Numeric(5, 4))
-    vega = db.Column(db.Numeric(5, 4))
+    delta = db.Column(db.Numeric(6, 4))
+    gamma = db.Column(db.Numeric(12, 8)) # index gammas are ~1e-4
+    theta = db.Column(db.Numeric(12, 4)) # points per day
+    vega = db.Column(db.Numeric(12, 4)) # points per volatility point
     timestamp = db.Column(db.DateTime, nullable=False)
     __table_args__ = (db.UniqueConstraint('underlying_symbol', 'expiry_date', 'strike_price', 'option_type', 'timestamp', name='_option_uc'),)
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from ..config import env_flag
+from .file_lock import FileLock
+
+DEFAULT_ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'artifact_cache')
+
+def artifact_key(*parts):
+    """
+    SHA-256 over the inputs that determine an artifact. DataFrames/Series are
+    hashed by index and values, everything else through canonical JSON.
+    """
+    # Imported here so cache lookups by path (cleanup, API) stay light
+    import numpy as np
+    import pandas as pd
+
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            if isinstance(part, pd.DataFrame):
+                digest.update(json.dumps([str(c) for c in part.columns]).encode())
+            digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+        elif isinstance(part, np.ndarray):
+            digest.update(np.ascontiguousarray(part).tobytes())
+        elif isinstance(part, bytes):
+            digest.update(part)
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+def file_digest(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _link_or_copy(src, dest):
+    """Hard-link src to dest (atomically replacing dest), copying across filesystems"""
+    tmp_path = f"{dest}.{os.getpid()}.tmp"
+    try:
+        os.link(src, tmp_path)
+    except OSError:
+        shutil.copy2(src, tmp_path)
+    os.replace(tmp_path, dest)
+
+class ArtifactCache:
+    """
+    Content-addressed store for rendered charts and reports.
+
+    Artifacts live under objects/ named by the hash of their inputs;
+    manifest.json records, per key, which inputs produced the file plus the
+    newest artifact of each kind per symbol. A hit is hard-linked to the
+    requested output path, so re-runs on unchanged data skip rendering.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or os.environ.get('ARTIFACT_CACHE_DIR', DEFAULT_ARTIFACT_DIR)
+        self.objects_dir = os.path.join(self.cache_dir, 'objects')
+        self.manifest_path = os.path.join(self.cache_dir, 'manifest.json')
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0}
+
+    def _object_path(self, key, ext):
+        return os.path.join(self.objects_dir, f"{key}{ext}")
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'entries': {}, 'latest': {}}
+
+    def _write_manifest(self, manifest):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1, default=str)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _update_manifest(self, update):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with FileLock(f"{self.manifest_path}.lock"):
+            manifest = self._read_manifest()
+            update(manifest)
+            self._write_manifest(manifest)
+
+    def lookup(self, key):
+        """Manifest entry for key (with its absolute 'path'), or None"""
+        entry = self._read_manifest()['entries'].get(key)
+        if entry is None:
+            return None
+        path = os.path.join(self.objects_dir, entry['object'])
+        if not os.path.exists(path):
+            return None
+        return {**entry, 'path': path}
+
+    def materialize(self, key, dest):
+        """Link the cached artifact for key to dest; returns dest, or None on a miss"""
+        entry = self.lookup(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        _link_or_copy(entry['path'], dest)
+        self.stats['hits'] += 1
+
+        def touch(manifest):
+            if key in manifest['entries']:
+                manifest['entries'][key]['last_used'] = time.time()
+        self._update_manifest(touch)
+        return dest
+
+    def store(self, key, src, kind, symbol=None, inputs=None):
+        """Add the file at src under key and record it as the latest `kind` for symbol"""
+        os.makedirs(self.objects_dir, exist_ok=True)
+        ext = os.path.splitext(src)[1]
+        _link_or_copy(src, self._object_path(key, ext))
+        now = time.time()
+
+        def add(manifest):
+            manifest['entries'][key] = {
+                'kind': kind,
+                'symbol': symbol,
+                'object': f"{key}{ext}",
+                'filename': os.path.basename(src),
+                'inputs': inputs or {},
+                'created': now,
+                'last_used': now,
+            }
+            if symbol:
+                manifest['latest'][f"{kind}:{symbol}"] = key
+        self._update_manifest(add)
+        self.stats['stores'] += 1
+        return self._object_path(key, ext)
+
+    def get_text(self, key):
+        """Cached text artifact for key, or None"""
+        entry = self.lookup(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        with open(entry['path'], 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def put_text(self, key, text, kind, symbol=None, inputs=None):
+        os.makedirs(self.objects_dir, exist_ok=True)
+        tmp_path = os.path.join(self.objects_dir, f".{key}.{os.getpid()}.txt")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        try:
+            self.store(key, tmp_path, kind, symbol, inputs)
+        finally:
+            os.remove(tmp_path)
+
+    def record_latest(self, key, kind, symbol):
+        """Mark an existing entry as the newest `kind` for symbol (after a hit)"""
+        def mark(manifest):
+            if key in manifest['entries']:
+                manifest['latest'][f"{kind}:{symbol}"] = key
+        self._update_manifest(mark)
+
+    def latest(self, kind, symbol):
+        """Newest cached artifact of kind for symbol, or None"""
+        key = self._read_manifest()['latest'].get(f"{kind}:{symbol}")
+        return self.lookup(key) if key else None
+
+    def prune(self, max_age_days=30):
+        """Drop artifacts not used for max_age_days; returns the number removed"""
+        if not os.path.exists(self.manifest_path):
+            return 0
+        cutoff = time.time() - max_age_days * 86400
+        removed = []
+
+        def drop_old(manifest):
+            for key, entry in list(manifest['entries'].items()):
+                if entry.get('last_used', 0) < cutoff:
+                    del manifest['entries'][key]
+                    removed.append(entry['object'])
+            manifest['latest'] = {name: key for name, key in manifest['latest'].items()
+                                  if key in manifest['entries']}
+        self._update_manifest(drop_old)
+
+        for name in removed:
+            try:
+                os.remove(os.path.join(self.objects_dir, name))
+            except FileNotFoundError:
+                pass
+        return len(removed)
+
+    def get_stats(self):
+        return {**self.stats, 'entries': len(self._read_manifest()['entries'])}
+
+def default_artifact_cache():
+    """Shared on-disk cache, or None when disabled with ARTIFACT_CACHE=0"""
+    if not env_flag('ARTIFACT_CACHE', default=True):
+        return None
+    return ArtifactCache()
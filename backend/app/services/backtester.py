@@ -0,0 +1,167 @@
+from datetime import time
+
+import numpy as np
+import pandas as pd
+
+from .incremental_indicators import IncrementalIndicators
+from .strategy import TradingStrategy
+from .trade_rules import (check_exit, entry_block_reason, expiry_adjusted_filters, lot_capacity, mock_chain,
+                          mock_premium, parse_contract, select_contract)
+
+LEDGER_COLUMNS = ['day', 'entry_time', 'exit_time', 'signal', 'confidence', 'symbol', 'lots', 'entry_price',
+                  'exit_price', 'outcome', 'exit_reason', 'pnl']
+
+class Backtester:
+    """
+    Event-driven replay of intraday bars through the live trading rules.
+
+    Every bar updates one IncrementalIndicators engine (no analyzer rebuilds).
+    Bars inside the trading window are the moments execute_trades would run:
+    an open position is marked with the simulated premium and closed on SL/TP,
+    otherwise TradingStrategy.get_signal() decides on a new entry, subject to
+    the same daily limits and contract filters. Fills are at the bar's
+    simulated premium (no latency or slippage). A position still open at the
+    last window bar of the day is closed there ('EOD').
+
+    chain(spot) returns the option chain to trade from (default: the mock
+    chain execute_trades falls back to); premium(symbol, spot) marks open
+    positions (default: the mock chain formula for that contract).
+    """
+
+    def __init__(self, capital, lot_size, premium_min=50.0, premium_max=200.0, allocation_pct=0.6,
+                 max_spread_pct=0.02, oi_change_pct=0.08, window=(time(10, 0), time(14, 0)),
+                 expiry_weekday=None, tz='Asia/Kolkata', chain=None, premium=None, warmup_bars=0):
+        if capital <= 0 or lot_size <= 0:
+            raise ValueError("Invalid capital or lot size.")
+        self.capital = capital
+        self.lot_size = lot_size
+        self.premium_min = premium_min
+        self.premium_max = premium_max
+        self.allocation_pct = allocation_pct
+        self.max_spread_pct = max_spread_pct
+        self.oi_change_pct = oi_change_pct
+        self.window = window
+        self.expiry_weekday = expiry_weekday
+        self.tz = tz
+        self.chain = chain or mock_chain
+        self.premium = premium or self._mock_mark
+        self.warmup_bars = warmup_bars
+
+    @staticmethod
+    def _mock_mark(symbol, spot):
+        strike, option_type = parse_contract(symbol)
+        return mock_premium(spot, strike, option_type)
+
+    def _local_index(self, index):
+        index = pd.DatetimeIndex(index)
+        if index.tz is None:
+            return index.tz_localize(self.tz)
+        return index.tz_convert(self.tz)
+
+    def run(self, data):
+        """
+        Replay an OHLC DataFrame of intraday bars.
+        Returns {'trades': ledger DataFrame, 'equity': Series, 'summary': dict}.
+        """
+        index = self._local_index(data.index)
+        bars = data[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=float)
+        days = index.normalize()
+        clock = index.time
+        in_window = np.array([self.window[0] <= t <= self.window[1] for t in clock], dtype=bool)
+        # Last in-window bar of each day: forced exit
+        window_pos = np.flatnonzero(in_window)
+        last_of_day = np.zeros(len(index), dtype=bool)
+        if len(window_pos):
+            window_days = days[window_pos]
+            last_of_day[window_pos[np.r_[window_days[1:] != window_days[:-1], True]]] = True
+
+        engine = IncrementalIndicators()
+        trades = []
+        equity = np.empty(len(index))
+        realized = 0.0
+        day_state = {}
+        current_day = None
+        position = None
+
+        for i, ts in enumerate(index):
+            o, h, l, c = bars[i]
+            engine.advance({'timestamp': ts, 'open': o, 'high': h, 'low': l, 'close': c})
+            if days[i] != current_day:
+                current_day = days[i]
+                day_state = {}
+
+            if in_window[i] and i >= self.warmup_bars:
+                if position is not None:
+                    mark = self.premium(position['symbol'], c)
+                    hit = check_exit(position['entry_price'], mark)
+                    if hit is None and last_of_day[i]:
+                        hit = ('profit' if mark > position['entry_price'] else 'loss', 'EOD')
+                    if hit is not None:
+                        realized += self._close(position, ts, mark, hit, trades)
+                        day_state.update(outcome=hit[0])
+                        position = None
+                elif entry_block_reason(day_state) is None and not last_of_day[i]:
+                    position = self._enter(engine, ts, c, day_state)
+
+            unrealized = 0.0
+            if position is not None:
+                unrealized = (self.premium(position['symbol'], c) - position['entry_price']) * position['quantity']
+            equity[i] = self.capital + realized + unrealized
+
+        ledger = pd.DataFrame(trades, columns=LEDGER_COLUMNS)
+        equity_curve = pd.Series(equity, index=index, name='equity')
+        return {'trades': ledger, 'equity': equity_curve, 'summary': self.summarize(ledger, equity_curve)}
+
+    def _enter(self, engine, ts, spot, day_state):
+        signal = TradingStrategy(None, indicators=engine.snapshot()).get_signal()
+        if signal['action'] == 'WAIT':
+            return None
+        is_expiry = self.expiry_weekday is not None and ts.weekday() == self.expiry_weekday
+        eff_spread, eff_oi = expiry_adjusted_filters(self.max_spread_pct, self.oi_change_pct, is_expiry)
+        selected = select_contract(self.chain(spot), signal['action'], self.premium_min, self.premium_max,
+                                   eff_spread, eff_oi)
+        if not selected:
+            return None
+        lots = lot_capacity(self.capital, self.allocation_pct, selected['premium'], self.lot_size)
+        if lots < 1:
+            return None
+        # Mirrors the state execute_trades writes on entry (a new entry drops the last outcome)
+        trades_done = int(day_state.get('trades_executed', 0))
+        day_state.clear()
+        day_state['trades_executed'] = trades_done + 1
+        return {
+            'day': ts.strftime('%Y-%m-%d'), 'entry_time': ts, 'signal': signal['action'],
+            'confidence': signal['confidence'], 'symbol': selected['symbol'], 'lots': lots,
+            'quantity': lots * self.lot_size, 'entry_price': selected['premium'],
+        }
+
+    def _close(self, position, ts, mark, hit, trades):
+        outcome, reason = hit
+        pnl = (mark - position['entry_price']) * position['quantity']
+        trades.append({**{k: position[k] for k in LEDGER_COLUMNS if k in position},
+                       'exit_time': ts, 'exit_price': mark, 'outcome': outcome, 'exit_reason': reason,
+                       'pnl': round(pnl, 2)})
+        return pnl
+
+    @staticmethod
+    def summarize(ledger, equity):
+        if equity.empty:
+            return {'trades': 0}
+        peak = equity.cummax()
+        drawdown = (equity - peak) / peak
+        summary = {
+            'trades': int(len(ledger)),
+            'net_pnl': round(float(ledger['pnl'].sum()), 2) if len(ledger) else 0.0,
+            'final_equity': round(float(equity.iloc[-1]), 2),
+            'max_drawdown_pct': round(float(drawdown.min() * 100), 2),
+        }
+        if len(ledger):
+            wins = ledger['pnl'] > 0
+            summary.update({
+                'win_rate': round(float(wins.mean()), 4),
+                'avg_win': round(float(ledger.loc[wins, 'pnl'].mean()), 2) if wins.any() else 0.0,
+                'avg_loss': round(float(ledger.loc[~wins, 'pnl'].mean()), 2) if (~wins).any() else 0.0,
+                'exit_reasons': ledger['exit_reason'].value_counts().to_dict(),
+                'trading_days': int(ledger['day'].nunique()),
+            })
+        return summary
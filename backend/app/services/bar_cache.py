@@ -0,0 +1,172 @@
+import json
+import os
+import re
+import time
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (parquet engine)
+except ImportError:
+    pyarrow = None
+
+from ..config import env_flag
+from .file_lock import FileLock
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'bar_cache')
+
+# Calendar span of the yfinance `period` strings that are measured in months/years
+PERIOD_OFFSETS = {
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+def cache_file_stem(symbol, interval):
+    """File name (without extension) used for one symbol/interval"""
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', f"{symbol}_{interval}")
+
+def period_days(period):
+    """Approximate calendar days covered by a yfinance period string"""
+    if period == 'max':
+        return float('inf')
+    if period == 'ytd':
+        return 366
+    match = re.fullmatch(r'(\d+)(d|mo|y)', period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+    count, unit = int(match.group(1)), match.group(2)
+    return count * {'d': 1, 'mo': 31, 'y': 366}[unit]
+
+def slice_period(data, period):
+    """
+    Bars of `period` ending at the last cached bar, following yfinance semantics:
+    'Nd' is the last N sessions, months/years are calendar offsets.
+    """
+    if data.empty or period == 'max':
+        return data
+    if period == 'ytd':
+        return data[data.index >= data.index[-1].replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)]
+    if period.endswith('d'):
+        sessions = data.index.normalize()
+        keep = sessions.unique()[-int(period[:-1]):]
+        return data[sessions.isin(keep)]
+    start = data.index[-1] - PERIOD_OFFSETS.get(period, pd.Timedelta(days=period_days(period)))
+    return data[data.index > start]
+
+class BarCache:
+    """
+    Persistent OHLCV store, one Parquet file per (symbol, interval).
+
+    get() downloads only the bars after the last cached timestamp (the last
+    bar is re-fetched since it may still have been forming), merges them and
+    serves the requested period from disk. A per-file lock lets parallel
+    report jobs share the cache. In offline mode the network is never used.
+    """
+
+    def __init__(self, cache_dir=None, offline=None, refresh_after=60, namespace=None):
+        self.cache_dir = cache_dir or os.environ.get('BAR_CACHE_DIR', DEFAULT_CACHE_DIR)
+        if namespace:
+            # Keeps bars from different providers apart
+            self.cache_dir = os.path.join(self.cache_dir, namespace)
+        self.offline = env_flag('BAR_CACHE_OFFLINE') if offline is None else offline
+        # Skip the delta fetch when the file was refreshed this recently (seconds)
+        self.refresh_after = refresh_after
+
+    @staticmethod
+    def available():
+        return pyarrow is not None
+
+    def _paths(self, symbol, interval):
+        base = os.path.join(self.cache_dir, cache_file_stem(symbol, interval))
+        return f"{base}.parquet", f"{base}.json"
+
+    def load(self, symbol, interval='1d'):
+        """Cached bars for symbol/interval, or None"""
+        data_path, _ = self._paths(symbol, interval)
+        if not os.path.exists(data_path):
+            return None
+        return pd.read_parquet(data_path)
+
+    def _load_meta(self, meta_path):
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, data, meta, data_path, meta_path):
+        tmp_path = f"{data_path}.tmp"
+        data.to_parquet(tmp_path)
+        os.replace(tmp_path, data_path)
+        tmp_meta = f"{meta_path}.tmp"
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, meta_path)
+
+    @staticmethod
+    def _merge(cached, fresh):
+        if cached is None or cached.empty:
+            merged = fresh
+        elif fresh is None or fresh.empty:
+            merged = cached
+        else:
+            merged = pd.concat([cached, fresh])
+            merged = merged[~merged.index.duplicated(keep='last')]
+        return merged.sort_index()
+
+    def get(self, symbol, period, interval, download):
+        """
+        Bars for `period` from the cache, topped up through
+        download(symbol, period=None, start=None, interval=...) when online.
+        """
+        data_path, meta_path = self._paths(symbol, interval)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        with FileLock(f"{data_path}.lock"):
+            cached = self.load(symbol, interval)
+            meta = self._load_meta(meta_path)
+
+            if self.offline:
+                if cached is None or cached.empty:
+                    raise ValueError(f"No cached bars for {symbol} ({interval}) in offline mode")
+                return slice_period(cached, period)
+
+            covered = cached is not None and not cached.empty and \
+                period_days(meta.get('period', '1d')) >= period_days(period)
+            fresh_enough = covered and time.time() - meta.get('updated', 0) < self.refresh_after
+
+            if not fresh_enough:
+                fresh = None
+                if covered:
+                    try:
+                        fresh = download(symbol, start=cached.index[-1], interval=interval)
+                    except Exception as e:
+                        # e.g. intraday history limits: fall back to a full window
+                        print(f"Delta fetch failed for {symbol} ({interval}): {e}")
+                        fresh = None
+                    # The start bar is repeated, so a delta that adds nothing after it is no refresh
+                    if fresh is None or fresh.empty or fresh.index[-1] <= cached.index[-1]:
+                        covered = False
+                if not covered:
+                    fresh = download(symbol, period=period, interval=interval)
+                    if fresh is not None and not fresh.empty:
+                        meta['period'] = period if cached is None else max(period, meta.get('period', period), key=period_days)
+
+                if fresh is None or fresh.empty:
+                    if cached is None or cached.empty:
+                        raise ValueError(f"No data found for symbol: {symbol}")
+                    # Keep the cache stale so the next call tries again
+                    print(f"No new bars for {symbol} ({interval}); serving cached bars")
+                    return slice_period(cached, period)
+
+                merged = self._merge(cached, fresh)
+                meta['updated'] = time.time()
+                self._write(merged, meta, data_path, meta_path)
+                cached = merged
+
+            return slice_period(cached, period)
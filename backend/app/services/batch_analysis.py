@@ -0,0 +1,382 @@
+import numpy as np
+import pandas as pd
+
+from .technical_analysis import DEFAULT_PLAN_PARAMS, INDICATOR_PRECISION, TechnicalAnalyzer, trend_regime_confidence
+
+# Kernels below take (n_bars, n_symbols) arrays and step through time once,
+# updating every symbol with one vector operation per bar. The update rules
+# are written exactly like TA-Lib's (and pandas' EWM for the MACD) so the
+# results equal TechnicalAnalyzer's per-symbol output.
+
+_EPSILON = 0.00000001
+
+def _empty(values):
+    return np.full(values.shape, np.nan)
+
+def _sequential_sum(values, start, stop):
+    total = np.zeros(values.shape[1])
+    for t in range(start, stop):
+        total = total + values[t]
+    return total
+
+def _sma(values, period):
+    out = _empty(values)
+    n_bars = len(values)
+    if n_bars < period:
+        return out
+    total = _sequential_sum(values, 0, period - 1)
+    for t in range(period - 1, n_bars):
+        total = total + values[t]
+        out[t] = total / period
+        total = total - values[t - period + 1]
+    return out
+
+def _ema(values, period):
+    """TA-Lib EMA: SMA seed, then k = 2 / (period + 1)"""
+    out = _empty(values)
+    if len(values) < period:
+        return out
+    k = 2.0 / (period + 1)
+    prev = _sequential_sum(values, 0, period) / period
+    out[period - 1] = prev
+    for t in range(period, len(values)):
+        prev = ((values[t] - prev) * k) + prev
+        out[t] = prev
+    return out
+
+def _pandas_ewm(values, span):
+    """pandas ewm(span, adjust=False).mean(), step by step"""
+    out = _empty(values)
+    if len(values) == 0:
+        return out
+    alpha = 1.0 / (1.0 + (span - 1) / 2.0)
+    old_wt = 1.0 - alpha
+    prev = values[0].copy()
+    out[0] = prev
+    for t in range(1, len(values)):
+        prev = (old_wt * prev + alpha * values[t]) / (old_wt + alpha)
+        out[t] = prev
+    return out
+
+def _wilder_average(values, period):
+    """Wilder average of values[1:], seeded with the mean of values[1..period]"""
+    out = _empty(values)
+    if len(values) <= period:
+        return out
+    prev = _sequential_sum(values, 1, period + 1) / period
+    out[period] = prev
+    for t in range(period + 1, len(values)):
+        prev = (prev * (period - 1) + values[t]) / period
+        out[t] = prev
+    return out
+
+def _true_range(high, low, close):
+    tr = _empty(close)
+    prev_close = close[:-1]
+    tr[1:] = np.maximum(high[1:] - low[1:], np.maximum(np.abs(prev_close - high[1:]), np.abs(prev_close - low[1:])))
+    return tr
+
+def _rsi(close, period=14):
+    diff = np.full(close.shape, np.nan)
+    diff[1:] = close[1:] - close[:-1]
+    gains = np.where(diff < 0, 0.0, diff)
+    losses = np.where(diff < 0, -diff, 0.0)
+    avg_gain = _wilder_average(gains, period)
+    avg_loss = _wilder_average(losses, period)
+    total = avg_gain + avg_loss
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 * (avg_gain / total)
+    return np.where(np.abs(total) < _EPSILON, 0.0, rsi)
+
+def _adx(high, low, tr, period=14):
+    n = period
+    out = _empty(high)
+    n_bars = len(high)
+    if n_bars < 2 * n:
+        return out
+    diff_p = np.full(high.shape, np.nan)
+    diff_m = np.full(high.shape, np.nan)
+    diff_p[1:] = high[1:] - high[:-1]
+    diff_m[1:] = low[:-1] - low[1:]
+    is_minus = (diff_m > 0) & (diff_p < diff_m)
+    is_plus = ~is_minus & (diff_p > 0) & (diff_p > diff_m)
+    minus_dm = np.where(is_minus, diff_m, 0.0)
+    plus_dm = np.where(is_plus, diff_p, 0.0)
+
+    prev_minus = _sequential_sum(minus_dm, 1, n)
+    prev_plus = _sequential_sum(plus_dm, 1, n)
+    prev_tr = _sequential_sum(tr, 1, n)
+    sum_dx = np.zeros(high.shape[1])
+    prev_adx = None
+    for t in range(n, n_bars):
+        prev_minus = prev_minus - prev_minus / n + minus_dm[t]
+        prev_plus = prev_plus - prev_plus / n + plus_dm[t]
+        prev_tr = prev_tr - (prev_tr / n) + tr[t]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            minus_di = 100.0 * (prev_minus / prev_tr)
+            plus_di = 100.0 * (prev_plus / prev_tr)
+            di_sum = minus_di + plus_di
+            dx = 100.0 * (np.abs(minus_di - plus_di) / di_sum)
+        # TA-Lib skips the DX update when the smoothed TR or DI sum is ~0
+        valid = (np.abs(prev_tr) >= _EPSILON) & (np.abs(di_sum) >= _EPSILON)
+        if t < 2 * n:
+            sum_dx = sum_dx + np.where(valid, dx, 0.0)
+            if t == 2 * n - 1:
+                prev_adx = sum_dx / n
+                out[t] = prev_adx
+        else:
+            prev_adx = np.where(valid, ((prev_adx * (n - 1)) + dx) / n, prev_adx)
+            out[t] = prev_adx
+    return out
+
+def _bbands(close, period=20, dev=2.0):
+    middle = _sma(close, period)
+    upper = _empty(close)
+    lower = _empty(close)
+    n_bars = len(close)
+    if n_bars < period:
+        return upper, middle, lower
+    squares = close * close
+    total2 = _sequential_sum(squares, 0, period - 1)
+    for t in range(period - 1, n_bars):
+        total2 = total2 + squares[t]
+        mean2 = total2 / period
+        total2 = total2 - squares[t - period + 1]
+        variance = mean2 - middle[t] * middle[t]
+        std = np.where(variance < _EPSILON, 0.0, np.sqrt(np.maximum(variance, 0.0)))
+        band = dev * std
+        upper[t] = middle[t] + band
+        lower[t] = middle[t] - band
+    return upper, middle, lower
+
+def _stoch(high, low, close, fastk_period=14, slowk_period=3, slowd_period=3):
+    fastk = _empty(close)
+    if len(close) >= fastk_period:
+        windows_high = np.lib.stride_tricks.sliding_window_view(high, fastk_period, axis=0)
+        windows_low = np.lib.stride_tricks.sliding_window_view(low, fastk_period, axis=0)
+        highest = windows_high.max(axis=-1)
+        lowest = windows_low.min(axis=-1)
+        diff = (highest - lowest) / 100.0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fastk[fastk_period - 1:] = np.where(diff != 0, (close[fastk_period - 1:] - lowest) / diff, 0.0)
+    lookback = fastk_period - 1 + slowk_period - 1 + slowd_period - 1
+    slowk = _empty(close)
+    slowd = _empty(close)
+    if len(close) > lookback:
+        valid_k = _sma(fastk[fastk_period - 1:], slowk_period)
+        slowk[fastk_period - 1:] = valid_k
+        slowd[fastk_period - 1 + slowk_period - 1:] = _sma(valid_k[slowk_period - 1:], slowd_period)
+        slowk[:lookback] = np.nan
+    return slowk, slowd
+
+class BatchTechnicalAnalyzer:
+    """
+    TechnicalAnalyzer for many aligned symbols at once.
+    Inputs are 2D arrays shaped (n_symbols, n_bars); every indicator is computed
+    for all symbols in one vectorized pass, and results come back per symbol in
+    the same dict shapes as TechnicalAnalyzer.
+    """
+
+    def __init__(self, symbols, open_, high, low, close, volume=None, index=None, plan_params=None):
+        """plan_params: overrides of DEFAULT_PLAN_PARAMS, as for TechnicalAnalyzer"""
+        self.symbols = list(symbols)
+        self.plan_params = {**DEFAULT_PLAN_PARAMS, **(plan_params or {})}
+        shape = np.shape(close)
+        if len(shape) != 2 or shape[0] != len(self.symbols):
+            raise ValueError("Expected arrays shaped (n_symbols, n_bars)")
+        self.index = index if index is not None else pd.RangeIndex(shape[1])
+
+        def time_major(values):
+            return np.ascontiguousarray(np.asarray(values, dtype=float).T)
+
+        self.open = time_major(open_)
+        self.high = time_major(high)
+        self.low = time_major(low)
+        self.close = time_major(close)
+        self.volume = time_major(volume) if volume is not None else None
+        self._arrays = None
+        self._frames = None
+
+    @classmethod
+    def from_frames(cls, frames, plan_params=None):
+        """
+        Build from {symbol: OHLCV DataFrame}. Frames are aligned on the bars
+        common to all symbols.
+        """
+        symbols = list(frames)
+        index = None
+        for df in frames.values():
+            index = df.index if index is None else index.intersection(df.index)
+        index = index.sort_values()
+        has_volume = all('Volume' in df.columns for df in frames.values())
+        columns = ['Open', 'High', 'Low', 'Close'] + (['Volume'] if has_volume else [])
+
+        def aligned(df):
+            if not df.index.equals(index):
+                df = df.reindex(index)
+            return np.column_stack([df[column].to_numpy(dtype=float) for column in columns])
+
+        # (n_symbols, n_bars, n_columns)
+        stacked = np.stack([aligned(frames[s]) for s in symbols])
+        return cls(
+            symbols,
+            stacked[:, :, 0], stacked[:, :, 1], stacked[:, :, 2], stacked[:, :, 3],
+            stacked[:, :, 4] if has_volume else None,
+            index=index,
+            plan_params=plan_params,
+        )
+
+    # ------------------------------------------------------------------
+    # Indicators
+    # ------------------------------------------------------------------
+    def indicator_arrays(self):
+        """
+        {indicator: array (n_bars, n_symbols)}: the indicator_frame() columns
+        except the talib_macd* ones (macd* follows the pandas EWM update),
+        plus current_price, open, high and low.
+        """
+        if self._arrays is not None:
+            return self._arrays
+        close, high, low = self.close, self.high, self.low
+        arrays = {'current_price': close, 'high': high, 'low': low, 'open': self.open}
+        arrays['rsi'] = _rsi(close)
+
+        ema12 = _pandas_ewm(close, 12)
+        ema26 = _pandas_ewm(close, 26)
+        arrays['macd'] = ema12 - ema26
+        arrays['macd_signal'] = _pandas_ewm(arrays['macd'], 9)
+        arrays['macd_histogram'] = arrays['macd'] - arrays['macd_signal']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_close = np.log(close)
+        arrays['macd_log'] = _pandas_ewm(log_close, 12) - _pandas_ewm(log_close, 26)
+        arrays['macd_log_signal'] = _pandas_ewm(arrays['macd_log'], 9)
+        arrays['macd_log_histogram'] = arrays['macd_log'] - arrays['macd_log_signal']
+        arrays['macd_pct'] = (ema12 - ema26) / ema26 * 100
+        arrays['macd_pct_signal'] = _pandas_ewm(arrays['macd_pct'], 9)
+        arrays['macd_pct_histogram'] = arrays['macd_pct'] - arrays['macd_pct_signal']
+
+        arrays['bb_upper'], arrays['bb_middle'], arrays['bb_lower'] = _bbands(close)
+        for period in (20, 50, 200):
+            arrays[f'ema_{period}'] = _ema(close, period)
+
+        tr = _true_range(high, low, close)
+        arrays['atr'] = _wilder_average(tr, 14)
+        arrays['adx'] = _adx(high, low, tr)
+        arrays['stoch_k'], arrays['stoch_d'] = _stoch(high, low, close)
+        self._arrays = arrays
+        return arrays
+
+    def indicator_frames(self):
+        """{indicator: DataFrame (time x symbols)}, the batch counterpart of indicator_frame()"""
+        if self._frames is None:
+            self._frames = {
+                key: pd.DataFrame(values, index=self.index, columns=self.symbols)
+                for key, values in self.indicator_arrays().items()
+            }
+        return self._frames
+
+    def latest_indicators(self):
+        """[calculate_all_indicators()-style dict per symbol]"""
+        arrays = self.indicator_arrays()
+        last = {key: arrays[key][-1] for key in INDICATOR_PRECISION}
+        results = []
+        for i in range(len(self.symbols)):
+            results.append({
+                key: TechnicalAnalyzer._safe_float(last[key][i], precision)
+                for key, precision in INDICATOR_PRECISION.items()
+            })
+        return results
+
+    # ------------------------------------------------------------------
+    # Derived views (vectorized over symbols)
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _column(indicators, key):
+        return np.array([np.nan if d[key] is None else d[key] for d in indicators], dtype=float)
+
+    def _volume_surge(self):
+        n = len(self.symbols)
+        if self.volume is None or len(self.volume) < 20:
+            return np.zeros(n, dtype=bool)
+        volume = self.volume
+        avg_volume = volume[-20:].mean(axis=0)
+        current = volume[-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(avg_volume > 0, current / avg_volume, 1.0)
+        return ratio > 1.2
+
+    def _levels(self):
+        """Pivot points and CPR from the previous bar for every symbol"""
+        n_bars = len(self.close)
+        if n_bars < 2:
+            return [None] * len(self.symbols), [None] * len(self.symbols)
+        high = self.high[-2]
+        low = self.low[-2]
+        close = self.close[-2]
+        pivot = (high + low + close) / 3
+        pivot_levels = {
+            'pivot': pivot,
+            'r1': (2 * pivot) - low,
+            's1': (2 * pivot) - high,
+            'r2': pivot + (high - low),
+            's2': pivot - (high - low),
+            'r3': high + 2 * (pivot - low),
+            's3': low - 2 * (high - pivot),
+        }
+        cpr_pivot = (high + low + close) / 3.0
+        bc = (high + low) / 2.0
+        tc = (2 * cpr_pivot) - bc
+        cpr_levels = {'pivot': cpr_pivot, 'bc': bc, 'tc': tc, 'width': tc - bc}
+        pivots = [{k: round(float(v[i]), 2) for k, v in pivot_levels.items()} for i in range(len(self.symbols))]
+        cprs = [{k: round(float(v[i]), 2) for k, v in cpr_levels.items()} for i in range(len(self.symbols))]
+        return pivots, cprs
+
+    def analyze(self):
+        """
+        One result per symbol:
+        {'symbol', 'indicators', 'trend', 'market_regime', 'trade_bias', 'pivots', 'cpr'}
+        with the same shapes TechnicalAnalyzer returns.
+        """
+        indicators = self.latest_indicators()
+        price = self._column(indicators, 'current_price')
+        ema_20 = self._column(indicators, 'ema_20')
+        ema_50 = self._column(indicators, 'ema_50')
+        adx = self._column(indicators, 'adx')
+        rsi = self._column(indicators, 'rsi')
+        atr = self._column(indicators, 'atr')
+
+        scored = trend_regime_confidence(price, ema_20, ema_50, adx, rsi, atr, self._volume_surge(), self.plan_params)
+        trend, regime, confidence = scored['trend'], scored['regime'], scored['confidence']
+
+        pivots, cprs = self._levels()
+        results = []
+        for i, symbol in enumerate(self.symbols):
+            t = str(trend[i])
+            r = str(regime[i])
+            if r == 'Unknown':
+                market_regime = {'regime': r, 'description': 'Insufficient data'}
+            else:
+                description = {
+                    'Strong Trend': f"Clean {t} movement",
+                    'Volatile Trend': f"Choppy {t} movement",
+                    'Range-Bound': "Sideways / Consolidation",
+                    'Weak Trend': f"Drifting {t}",
+                }[r]
+                market_regime = {'regime': r, 'description': description}
+            # Whole scores stay ints, as calculate_confidence_score returns them
+            score = float(confidence[i])
+            score = int(score) if score.is_integer() else score
+            results.append({
+                'symbol': symbol,
+                'indicators': indicators[i],
+                'trend': t,
+                'market_regime': market_regime,
+                'trade_bias': {
+                    'bias': t,
+                    'confidence': score,
+                    'strength': 'Strong' if score > 60 else 'Weak',
+                },
+                'pivots': pivots[i],
+                'cpr': cprs[i],
+            })
+        return results
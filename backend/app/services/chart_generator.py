@@ -2,85 +2,187 @@ import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-from matplotlib.patches import Rectangle
+from matplotlib.collections import LineCollection, PolyCollection
 import pandas as pd
 import os
 import talib
 import numpy as np
+from .artifact_cache import artifact_key
 
 class ChartGenerator:
-    def __init__(self):
+    # Candle body / histogram bar width in days
+    BAR_WIDTH = 0.6
+    # Bump when the chart layout changes so cached PNGs are not reused
+    CACHE_VERSION = 1
+    PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+    FRAME_COLUMNS = ['ema_20', 'ema_50', 'bb_upper', 'bb_lower', 'rsi',
+                     'talib_macd', 'talib_macd_signal', 'talib_macd_histogram']
+
+    def __init__(self, artifact_cache=None):
+        """artifact_cache: ArtifactCache to reuse charts rendered from identical inputs"""
         self.output_dir = os.path.join(os.getcwd(), 'charts')
         os.makedirs(self.output_dir, exist_ok=True)
+        self.artifact_cache = artifact_cache
+        self._figure = None
+        self._axes = None
+        self._layout = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _get_figure(self):
+        """The generator's figure template: built on first use, axes cleared for each later chart"""
+        if self._figure is None:
+            self._figure, self._axes = plt.subplots(3, 1, figsize=(12, 12), gridspec_kw={'height_ratios': [3, 1, 1]})
+            pars = self._figure.subplotpars
+            self._layout = {k: getattr(pars, k) for k in ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')}
+        else:
+            for ax in self._axes:
+                ax.clear()
+            # tight_layout() starts from the current spacing; reset it so every chart lays out alike
+            self._figure.subplots_adjust(**self._layout)
+        return self._figure, self._axes
+
+    def close(self):
+        """Release the figure; pyplot keeps it alive until it is closed"""
+        if self._figure is not None:
+            plt.close(self._figure)
+            self._figure = None
+            self._axes = None
     
-    def generate_chart(self, symbol, data, indicators=None, support_resistance=None):
+    @staticmethod
+    def _boxes(x, bottom, top, width):
+        """(n, 4, 2) rectangle vertices for a PolyCollection"""
+        left = x - width / 2
+        right = x + width / 2
+        return np.stack([
+            np.column_stack([left, bottom]),
+            np.column_stack([left, top]),
+            np.column_stack([right, top]),
+            np.column_stack([right, bottom]),
+        ], axis=1)
+
+    def preview_path(self, symbol):
+        return os.path.join(self.output_dir, f"{symbol}_chart_preview.png")
+
+    def _save(self, fig, filepath, dpi):
+        # Write to a temp file first so concurrent readers never see a partial PNG
+        directory, filename = os.path.split(filepath)
+        tmp_path = os.path.join(directory, f".{filename}.{os.getpid()}.tmp.png")
+        fig.savefig(tmp_path, dpi=dpi, bbox_inches='tight', pil_kwargs={'compress_level': 1})
+        os.replace(tmp_path, filepath)
+
+    def _cache_key(self, symbol, data, frame, with_bands, dpi):
+        return artifact_key('chart', self.CACHE_VERSION, symbol, data[self.PRICE_COLUMNS],
+                            frame[self.FRAME_COLUMNS], with_bands, dpi)
+
+    def _from_cache(self, cache_key, filepath, symbol, preview_dpi):
+        """Link previously rendered files into place; False if anything is missing"""
+        if self.artifact_cache.materialize(cache_key, filepath) is None:
+            return False
+        if preview_dpi:
+            return self.artifact_cache.materialize(artifact_key(cache_key, preview_dpi), self.preview_path(symbol)) is not None
+        return True
+
+    def _to_cache(self, cache_key, filepath, symbol, data, dpi, preview_dpi):
+        inputs = {'bars': len(data), 'first': str(data.index[0]), 'last': str(data.index[-1]), 'dpi': dpi}
+        self.artifact_cache.store(cache_key, filepath, 'chart', symbol, inputs)
+        if preview_dpi:
+            self.artifact_cache.store(artifact_key(cache_key, preview_dpi), self.preview_path(symbol),
+                                      'chart_preview', symbol, {**inputs, 'dpi': preview_dpi})
+
+    def generate_chart(self, symbol, data, indicators=None, support_resistance=None, frame=None,
+                       dpi=150, preview_dpi=None):
         """
         Create candlestick chart with indicators
         data: DataFrame with OHLCV
         indicators: dict with pre-calculated indicators (optional)
         support_resistance: dict with support/resistance levels (optional)
+        frame: TechnicalAnalyzer.indicator_frame() for the same data (optional, skips TA-Lib)
+        dpi: resolution of the report chart
+        preview_dpi: also write a low-resolution copy to preview_path(symbol)
+                     (for thumbnails; the report paths do not request one)
+
+        The figure is reused by later charts from this generator; call
+        close() (or use the generator as a context manager) when done.
         """
         # Ensure data is sorted
         data = data.sort_index()
+        if frame is None:
+            frame = self._indicator_frame(data)
+        else:
+            frame = frame.reindex(data.index)
         
-        # Calculate indicators if not provided
+        # Fall back to the frame's bands if no indicators were provided
         if not indicators:
-            indicators = {}
-            indicators['bb_upper'], indicators['bb_middle'], indicators['bb_lower'] = talib.BBANDS(data['Close'], timeperiod=20)
+            indicators = {'bb_upper': frame['bb_upper'].iloc[-1], 'bb_lower': frame['bb_lower'].iloc[-1]}
+        with_bands = 'bb_upper' in indicators and 'bb_lower' in indicators
+
+        filepath = os.path.join(self.output_dir, f"{symbol}_chart.png")
+        cache_key = None
+        if self.artifact_cache is not None:
+            cache_key = self._cache_key(symbol, data, frame, with_bands, dpi)
+            if self._from_cache(cache_key, filepath, symbol, preview_dpi):
+                return filepath
+        
+        fig, axes = self._get_figure()
+        try:
+            self._draw(fig, axes, symbol, data, frame, with_bands)
+            self._save(fig, filepath, dpi)
+            if preview_dpi:
+                self._save(fig, self.preview_path(symbol), preview_dpi)
+        except Exception:
+            # Do not hand a half-drawn figure to the next chart
+            self.close()
+            raise
+        if cache_key is not None:
+            self._to_cache(cache_key, filepath, symbol, data, dpi, preview_dpi)
         
-        # Setup plot
-        fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 12), 
-                                             gridspec_kw={'height_ratios': [3, 1, 1]})
+        return filepath
+
+    def _draw(self, fig, axes, symbol, data, frame, with_bands):
+        ax1, ax2, ax3 = axes
         
         # 1. Candlestick Chart (Price Action)
         # -----------------------------------
         
         # Prepare data for plotting
         dates = mdates.date2num(data.index)
-        opens = data['Open'].values
-        highs = data['High'].values
-        lows = data['Low'].values
-        closes = data['Close'].values
+        opens = data['Open'].values.astype(float)
+        highs = data['High'].values.astype(float)
+        lows = data['Low'].values.astype(float)
+        closes = data['Close'].values.astype(float)
+        width = self.BAR_WIDTH
+        candle_colors = np.where(closes >= opens, 'green', 'red')
         
-        # Draw candlesticks
-        width = 0.6
-        for i in range(len(dates)):
-            date = dates[i]
-            open_p = opens[i]
-            close_p = closes[i]
-            high_p = highs[i]
-            low_p = lows[i]
-            
-            color = 'green' if close_p >= open_p else 'red'
-            
-            # High-Low line
-            ax1.plot([date, date], [low_p, high_p], color=color, linewidth=1)
-            
-            # Open-Close rectangle
-            rect_height = abs(close_p - open_p)
-            rect_bottom = min(open_p, close_p)
-            # If open == close (doji), make it visible
-            if rect_height == 0:
-                rect_height = 0.01 * close_p 
-            
-            rect = Rectangle((date - width/2, rect_bottom), width, rect_height,
-                             facecolor=color, edgecolor=color)
-            ax1.add_patch(rect)
+        # Wicks: one LineCollection for all High-Low lines
+        wicks = np.stack([np.column_stack([dates, lows]), np.column_stack([dates, highs])], axis=1)
+        ax1.add_collection(LineCollection(wicks, colors=candle_colors, linewidths=1))
+        
+        # Bodies: one PolyCollection for all Open-Close rectangles
+        body_bottom = np.minimum(opens, closes)
+        body_height = np.abs(closes - opens)
+        # If open == close (doji), make it visible
+        body_height = np.where(body_height == 0, 0.01 * closes, body_height)
+        bodies = self._boxes(dates, body_bottom, body_bottom + body_height, width)
+        ax1.add_collection(PolyCollection(bodies, facecolors=candle_colors, edgecolors=candle_colors))
+        ax1.autoscale_view()
 
         # Plot Overlays (EMAs, BB)
-        # Calculate EMAs locally to ensure alignment if not in indicators
-        ema_20 = talib.EMA(data['Close'], timeperiod=20)
-        ema_50 = talib.EMA(data['Close'], timeperiod=50)
+        ema_20 = frame['ema_20'].values
+        ema_50 = frame['ema_50'].values
         
         ax1.plot(dates, ema_20, label='EMA 20', color='blue', linewidth=1.5, alpha=0.8)
         ax1.plot(dates, ema_50, label='EMA 50', color='orange', linewidth=1.5, alpha=0.8)
         
         # Bollinger Bands
-        if 'bb_upper' in indicators and 'bb_lower' in indicators:
-            # Need to align with current data slice if indicators are pre-calculated
-            # But here we assume data passed is the same length as indicators or we recalculate
-            # Safer to recalculate for the chart to match the visual x-axis exactly
-            bb_upper, _, bb_lower = talib.BBANDS(data['Close'], timeperiod=20)
+        if with_bands:
+            # Use the full-history series so the bands line up with the x-axis exactly
+            bb_upper = frame['bb_upper'].values
+            bb_lower = frame['bb_lower'].values
             ax1.plot(dates, bb_upper, color='gray', linestyle='--', alpha=0.5, label='BB Upper')
             ax1.plot(dates, bb_lower, color='gray', linestyle='--', alpha=0.5, label='BB Lower')
             ax1.fill_between(dates, bb_upper, bb_lower, color='gray', alpha=0.1)
@@ -94,7 +196,7 @@ class ChartGenerator:
         
         # 2. RSI Subplot
         # --------------
-        rsi = talib.RSI(data['Close'], timeperiod=14)
+        rsi = frame['rsi'].values
         ax2.plot(dates, rsi, color='purple', linewidth=1.5)
         ax2.axhline(70, color='red', linestyle='--', alpha=0.5)
         ax2.axhline(30, color='green', linestyle='--', alpha=0.5)
@@ -107,14 +209,18 @@ class ChartGenerator:
         
         # 3. MACD Subplot
         # ---------------
-        macd, signal, hist = talib.MACD(data['Close'], 12, 26, 9)
+        macd = frame['talib_macd'].values
+        signal = frame['talib_macd_signal'].values
+        hist = frame['talib_macd_histogram'].values
         ax3.plot(dates, macd, label='MACD', color='blue', linewidth=1.5)
         ax3.plot(dates, signal, label='Signal', color='orange', linewidth=1.5)
         
-        # Color histogram bars
+        # Color histogram bars (one PolyCollection instead of a patch per bar)
         hist_safe = np.nan_to_num(hist, nan=0.0, posinf=0.0, neginf=0.0)
-        hist_colors = ['green' if h >= 0 else 'red' for h in hist_safe]
-        ax3.bar(dates, hist_safe, color=hist_colors, alpha=0.5, width=width)
+        hist_colors = np.where(hist_safe >= 0, 'green', 'red')
+        hist_bars = self._boxes(dates, np.minimum(hist_safe, 0.0), np.maximum(hist_safe, 0.0), width)
+        ax3.add_collection(PolyCollection(hist_bars, facecolors=hist_colors, edgecolors='none', alpha=0.5))
+        ax3.autoscale_view()
         
         ax3.axhline(0, color='black', linewidth=0.5)
         ax3.set_ylabel('MACD', fontsize=12)
@@ -125,12 +231,20 @@ class ChartGenerator:
         ax3.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
         
         # Formatting
-        plt.tight_layout()
-        
-        # Save
-        filename = f"{symbol}_chart.png"
-        filepath = os.path.join(self.output_dir, filename)
-        plt.savefig(filepath, dpi=150, bbox_inches='tight')
-        plt.close()
-        
-        return filepath
+        fig.tight_layout()
+
+    def _indicator_frame(self, data):
+        """Fallback when the caller has no analyzer frame for this data"""
+        close = data['Close'].values.astype(float)
+        bb_upper, _, bb_lower = talib.BBANDS(close, timeperiod=20)
+        macd, signal, hist = talib.MACD(close, 12, 26, 9)
+        return pd.DataFrame({
+            'ema_20': talib.EMA(close, timeperiod=20),
+            'ema_50': talib.EMA(close, timeperiod=50),
+            'bb_upper': bb_upper,
+            'bb_lower': bb_lower,
+            'rsi': talib.RSI(close, timeperiod=14),
+            'talib_macd': macd,
+            'talib_macd_signal': signal,
+            'talib_macd_histogram': hist,
+        }, index=data.index)
@@ -1,5 +1,9 @@
-import yfinance as yf
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
+from ..config import env_flag
+from .bar_cache import BarCache
+from .data_sources import get_data_source
 
 class MarketDataFetcher:
     
@@ -18,13 +22,29 @@ class MarketDataFetcher:
         'HANG SENG': '^HSI'
     }
     
-    def fetch_data(self, symbol, period='3mo'):
+    def __init__(self, cache=None, source=None):
         """
-        Fetch market data from Yahoo Finance
+        source: DataSource (or provider name) to read bars from; defaults to
+        Config.DATA_SOURCE (env DATA_SOURCE, 'yfinance' unless set).
+        cache: BarCache to serve bars from, or False to always download. By default
+        a shared on-disk cache is used for network providers unless BAR_CACHE=0
+        (or pyarrow is not installed).
+        """
+        if source is None or isinstance(source, str):
+            source = get_data_source(source)
+        self.source = source
+        if cache is None and source.cacheable and env_flag('BAR_CACHE', default=True) and BarCache.available():
+            cache = BarCache(namespace=None if source.name == 'yfinance' else source.name)
+        self.cache = cache
+
+    def fetch_data(self, symbol, period='3mo', interval='1d'):
+        """
+        Fetch market data from the configured source (through the local bar cache)
         
         Args:
             symbol: Stock symbol (e.g., 'BANKNIFTY', '^NSEBANK', 'RELIANCE.NS')
             period: Data period ('1d', '5d', '1mo', '3mo', '6mo', '1y', '2y', '5y')
+            interval: Bar size ('1d', '1h', '5m', ...)
         
         Returns:
             pandas DataFrame with OHLCV data
@@ -33,8 +53,10 @@ class MarketDataFetcher:
         ticker_symbol = self.INDIAN_SYMBOLS.get(symbol.upper(), symbol)
         
         try:
-            ticker = yf.Ticker(ticker_symbol)
-            data = ticker.history(period=period)
+            if self.cache:
+                data = self.cache.get(ticker_symbol, period, interval, self.source)
+            else:
+                data = self.source.fetch(ticker_symbol, period=period, interval=interval)
             
             if data.empty:
                 raise ValueError(f"No data found for symbol: {symbol}")
@@ -49,35 +71,67 @@ class MarketDataFetcher:
         data = self.fetch_data(symbol, period='1d')
         return data['Close'].iloc[-1]
 
-    def get_market_summary(self):
+    def get_market_summary(self, max_workers=8, timeout=10.0):
         """
         Fetch summary of global and domestic indices.
         Returns a dictionary with symbol, price, and percent change.
         """
-        summary = {}
+        summary, _ = self.get_market_summary_timed(max_workers=max_workers, timeout=timeout)
+        return summary
+
+    def _summary_entry(self, symbol):
+        """Latest close and change vs previous close for one ticker (None if no data)"""
+        # Fetch 5d to ensure we have previous close even after weekends/holidays
+        hist = self.source.fetch(symbol, period="5d", interval="1d")
+        if hist.empty:
+            return None
+        current_close = hist['Close'].iloc[-1]
+        prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_close
+        change = current_close - prev_close
+        change_pct = (change / prev_close) * 100
+        return {
+            "current": current_close,
+            "change": change,
+            "change_pct": change_pct
+        }
+
+    def get_market_summary_timed(self, max_workers=8, timeout=10.0):
+        """
+        get_market_summary() with the tickers fetched concurrently.
+
+        Each ticker gets `timeout` seconds; a slow or failing feed is reported
+        as None without holding back the others. Returns (summary, timings)
+        where timings maps each name to {'symbol', 'seconds', 'status'} and
+        status is 'ok', 'empty', 'error' or 'timeout'.
+        """
         all_symbols = {**self.INDIAN_SYMBOLS, **self.GLOBAL_SYMBOLS}
-        
-        for name, symbol in all_symbols.items():
+        unique_symbols = list(dict.fromkeys(all_symbols.values()))
+        results = {}
+
+        def fetch(symbol):
+            started = time.perf_counter()
             try:
-                # Fetch 5d to ensure we have previous close even after weekends/holidays
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period="5d")
-                
-                if not hist.empty:
-                    current_close = hist['Close'].iloc[-1]
-                    prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_close
-                    change = current_close - prev_close
-                    change_pct = (change / prev_close) * 100
-                    
-                    summary[name] = {
-                        "current": current_close,
-                        "change": change,
-                        "change_pct": change_pct
-                    }
-                else:
-                    summary[name] = None
+                entry = self._summary_entry(symbol)
+                results[symbol] = (entry, 'ok' if entry else 'empty', time.perf_counter() - started)
             except Exception as e:
-                print(f"Error fetching summary for {name}: {e}")
-                summary[name] = None
-                
-        return summary
+                print(f"Error fetching summary for {symbol}: {e}")
+                results[symbol] = (None, 'error', time.perf_counter() - started)
+
+        started = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique_symbols))))
+        futures = [executor.submit(fetch, symbol) for symbol in unique_symbols]
+        wait(futures, timeout=timeout)
+        # Don't block on feeds that missed the deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+        waited = time.perf_counter() - started
+
+        summary = {}
+        timings = {}
+        for name, symbol in all_symbols.items():
+            entry, status, seconds = results.get(symbol, (None, 'timeout', waited))
+            if status == 'timeout':
+                print(f"Timed out fetching summary for {name} after {timeout}s")
+            summary[name] = entry
+            timings[name] = {'symbol': symbol, 'seconds': round(seconds, 3), 'status': status}
+
+        return summary, timings
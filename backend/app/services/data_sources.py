@@ -0,0 +1,197 @@
+import os
+import zlib
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from ..config import Config
+from .bar_cache import DEFAULT_CACHE_DIR, cache_file_stem, period_days, slice_period
+from .tv_fetcher import TradingViewFetcher
+
+IST = 'Asia/Kolkata'
+
+# Minutes per bar for the yfinance interval strings used in this project
+INTERVAL_MINUTES = {'1m': 1, '5m': 5, '15m': 15, '30m': 30, '1h': 60, '60m': 60}
+
+class DataSource:
+    """
+    Interface every market data provider implements.
+
+    fetch(symbol, period=None, start=None, interval='1d') returns an OHLCV
+    DataFrame (Open/High/Low/Close/Volume, DatetimeIndex) for a Yahoo-style
+    symbol, either the last `period` or every bar from `start`.
+    `cacheable` tells MarketDataFetcher whether the on-disk bar cache helps.
+    """
+
+    name = 'base'
+    cacheable = False
+
+    def fetch(self, symbol, period=None, start=None, interval='1d'):
+        raise NotImplementedError
+
+    def __call__(self, symbol, period=None, start=None, interval='1d'):
+        return self.fetch(symbol, period=period, start=start, interval=interval)
+
+class YFinanceSource(DataSource):
+    """Live Yahoo Finance data"""
+
+    name = 'yfinance'
+    cacheable = True
+
+    def __init__(self, timeout=10):
+        self.timeout = timeout
+
+    def fetch(self, symbol, period=None, start=None, interval='1d'):
+        ticker = yf.Ticker(symbol)
+        if start is not None:
+            return ticker.history(start=start, interval=interval, timeout=self.timeout)
+        return ticker.history(period=period, interval=interval, timeout=self.timeout)
+
+class TradingViewSource(DataSource):
+    """TradingView through tvDatafeed (optional dependency)"""
+
+    name = 'tradingview'
+    cacheable = True
+
+    # Yahoo symbols used across the app -> TradingView symbols
+    SYMBOLS = {
+        '^NSEI': 'NSE:NIFTY',
+        '^NSEBANK': 'NSE:BANKNIFTY',
+        '^BSESN': 'BSE:SENSEX',
+        '^INDIAVIX': 'NSE:INDIAVIX',
+        '^GSPC': 'SP:SPX',
+        '^IXIC': 'NASDAQ:IXIC',
+        '^N225': 'TVC:NI225',
+        '^HSI': 'TVC:HSI',
+    }
+
+    def __init__(self, username=None, password=None):
+        self.fetcher = TradingViewFetcher(username=username, password=password)
+
+    def fetch(self, symbol, period=None, start=None, interval='1d'):
+        tv_symbol = self.SYMBOLS.get(symbol, symbol)
+        if start is not None:
+            start = _naive(start)
+            days = max(1, (pd.Timestamp.now() - start).days + 1)
+        else:
+            days = period_days(period or '1mo')
+        n_bars = _bars_for_days(days, interval)
+        data = self.fetcher.fetch_data(symbol=tv_symbol, interval=interval, n_bars=n_bars)
+        if start is not None:
+            return data[data.index >= start]
+        return slice_period(data, period) if period else data
+
+class ReplaySource(DataSource):
+    """
+    Bars replayed from local files named like the bar cache
+    (`<symbol>_<interval>.parquet` or `.csv`), so a recorded cache directory
+    can be replayed as-is. `as_of` hides every bar after that timestamp.
+    """
+
+    name = 'replay'
+
+    def __init__(self, directory=None, as_of=None):
+        self.directory = directory or DEFAULT_CACHE_DIR
+        self.as_of = pd.Timestamp(as_of) if as_of else None
+
+    def _load(self, symbol, interval):
+        stem = os.path.join(self.directory, cache_file_stem(symbol, interval))
+        if os.path.exists(f"{stem}.parquet"):
+            data = pd.read_parquet(f"{stem}.parquet")
+        elif os.path.exists(f"{stem}.csv"):
+            data = pd.read_csv(f"{stem}.csv", index_col=0)
+            data.index = pd.to_datetime(data.index)
+        else:
+            raise ValueError(f"No replay file for {symbol} ({interval}) in {self.directory}")
+        if self.as_of is not None:
+            as_of = self.as_of
+            if data.index.tz is not None and as_of.tz is None:
+                as_of = as_of.tz_localize(data.index.tz)
+            data = data[data.index <= as_of]
+        return data.sort_index()
+
+    def fetch(self, symbol, period=None, start=None, interval='1d'):
+        data = self._load(symbol, interval)
+        if start is not None:
+            return data[data.index >= start]
+        return slice_period(data, period or 'max')
+
+# Rough price levels so synthetic indices look like the real ones
+SYNTHETIC_BASE_PRICES = {
+    '^NSEI': 22000.0,
+    '^NSEBANK': 48000.0,
+    '^BSESN': 73000.0,
+    '^INDIAVIX': 14.0,
+    '^GSPC': 5000.0,
+    '^IXIC': 16000.0,
+    '^N225': 38000.0,
+    '^HSI': 17000.0,
+}
+
+class SyntheticSource(DataSource):
+    """
+    Deterministic random-walk bars, reproducible from (seed, symbol, interval).
+    Daily history starts in 2010, intraday covers the last 60 sessions
+    (like Yahoo), both ending at `end`. A shorter period is always a slice of
+    the same series, so repeated runs see identical bars.
+    """
+
+    name = 'synthetic'
+
+    def __init__(self, seed=42, end='2024-12-31'):
+        self.seed = seed
+        self.end = end
+
+    def fetch(self, symbol, period=None, start=None, interval='1d'):
+        data = _synthetic_bars(symbol, interval, self.seed, self.end)
+        if start is not None:
+            return data[data.index >= start].copy()
+        return slice_period(data, period or 'max').copy()
+
+def _naive(timestamp):
+    timestamp = pd.Timestamp(timestamp)
+    return timestamp.tz_convert(IST).tz_localize(None) if timestamp.tz is not None else timestamp
+
+def _bars_for_days(days, interval):
+    if interval in INTERVAL_MINUTES:
+        return int(days * 375 / INTERVAL_MINUTES[interval]) + 1
+    return int(days) + 1
+
+@lru_cache(maxsize=64)
+def _synthetic_bars(symbol, interval, seed, end):
+    rng = np.random.default_rng([seed, zlib.crc32(f"{symbol}|{interval}".encode())])
+    end_day = pd.Timestamp(end)
+    if interval in INTERVAL_MINUTES:
+        sessions = pd.bdate_range(end=end_day, periods=60)
+        step = INTERVAL_MINUTES[interval]
+        offsets = pd.to_timedelta(np.arange(0, 375, step) + 9 * 60 + 15, unit='m')
+        index = pd.DatetimeIndex([day + offset for day in sessions for offset in offsets])
+        volatility = 0.012 / np.sqrt(375 / step)
+    else:
+        index = pd.bdate_range(start='2010-01-01', end=end_day)
+        volatility = 0.012
+    index = index.tz_localize(IST)
+
+    n = len(index)
+    base = SYNTHETIC_BASE_PRICES.get(symbol, 1000.0)
+    close = base * np.exp(np.cumsum(rng.normal(0.0002 if interval not in INTERVAL_MINUTES else 0.0, volatility, n)))
+    open_ = np.concatenate(([base], close[:-1])) * (1 + rng.normal(0, volatility / 4, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, volatility / 2, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, volatility / 2, n)))
+    volume = rng.integers(100000, 1000000, n).astype(float)
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}, index=index)
+
+def get_data_source(name=None):
+    """Provider selected by name, or by Config.DATA_SOURCE (env DATA_SOURCE)"""
+    name = (name or Config.DATA_SOURCE).lower()
+    if name == 'yfinance':
+        return YFinanceSource()
+    if name == 'tradingview':
+        return TradingViewSource(os.environ.get('TV_USERNAME'), os.environ.get('TV_PASSWORD'))
+    if name == 'replay':
+        return ReplaySource(Config.REPLAY_DIR, Config.REPLAY_AS_OF)
+    if name == 'synthetic':
+        return SyntheticSource(Config.SYNTHETIC_SEED, Config.SYNTHETIC_END)
+    raise ValueError(f"Unknown data source: {name}")
@@ -0,0 +1,62 @@
+import os
+import time
+
+class FileLock:
+    """
+    Cross-process lock backed by a lock file created with O_EXCL.
+
+    Works on every platform without extra dependencies. A lock file older than
+    `stale_after` seconds is assumed to belong to a crashed process and is removed.
+
+        with FileLock("/path/to/data.parquet.lock"):
+            ...
+    """
+
+    def __init__(self, path, timeout=30.0, poll_interval=0.05, stale_after=300.0):
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self._held = False
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                self._remove_if_stale()
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for lock {self.path}")
+                time.sleep(self.poll_interval)
+                continue
+            with os.fdopen(fd, 'w') as f:
+                f.write(str(os.getpid()))
+            self._held = True
+            return self
+
+    def release(self):
+        if not self._held:
+            return
+        self._held = False
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _remove_if_stale(self):
+        try:
+            age = time.time() - os.path.getmtime(self.path)
+        except OSError:
+            return
+        if age > self.stale_after:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
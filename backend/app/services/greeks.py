@@ -0,0 +1,175 @@
+import math
+from datetime import date, datetime, time
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+try:
+    from scipy.special import ndtr as _ndtr
+except ImportError:
+    # scipy comes with scikit-learn; the erf fallback is exact but runs per element
+    _ndtr = None
+    _erf = np.frompyfunc(math.erf, 1, 1)
+
+DAYS_PER_YEAR = 365.0
+# Index options settle at the 15:30 IST close of the expiry day
+EXPIRY_CLOSE = time(15, 30)
+IST = ZoneInfo('Asia/Kolkata')
+# Floors on time (years) and volatility keep expiring contracts finite
+MIN_TIME = 1e-6
+MIN_VOL = 1e-6
+
+GREEKS = ('price', 'delta', 'gamma', 'theta', 'vega')
+OPTION_TYPES = ('CE', 'PE')
+
+_SQRT_2PI = math.sqrt(2 * math.pi)
+
+def norm_cdf(x):
+    if _ndtr is not None:
+        return _ndtr(x)
+    x = np.asarray(x, dtype=float)
+    return 0.5 * (1.0 + _erf(x / math.sqrt(2)).astype(float))
+
+def norm_pdf(x):
+    return np.exp(-0.5 * x * x) / _SQRT_2PI
+
+def call_mask(option_types):
+    """True for calls ('CE', 'CALL', 'C'), False for puts"""
+    return np.isin(np.char.upper(np.asarray(option_types, dtype=str)), ('CE', 'CALL', 'C'))
+
+def bsm(spot, strike, t, vol, rate=0.0, carry=None, is_call=True):
+    """
+    Generalized Black-Scholes prices and greeks; every argument broadcasts.
+
+    carry is the cost of carry b (rate - dividend yield, default = rate:
+    Black-Scholes on spot). carry=0 with the futures price as spot is
+    Black-76. t is in years, vol and rate are decimals. Returns a dict of
+    arrays: price, delta, gamma, theta (per calendar day) and vega (per
+    volatility point).
+    """
+    s = np.asarray(spot, dtype=float)
+    k = np.asarray(strike, dtype=float)
+    t = np.maximum(np.asarray(t, dtype=float), MIN_TIME)
+    vol = np.maximum(np.asarray(vol, dtype=float), MIN_VOL)
+    r = np.asarray(rate, dtype=float)
+    b = r if carry is None else np.asarray(carry, dtype=float)
+    w = np.where(is_call, 1.0, -1.0)
+
+    sqrt_t = np.sqrt(t)
+    vol_t = vol * sqrt_t
+    d1 = (np.log(s / k) + (b + 0.5 * vol * vol) * t) / vol_t
+    d2 = d1 - vol_t
+    carry_df = np.exp((b - r) * t)
+    df = np.exp(-r * t)
+    n_d1 = norm_pdf(d1)
+    cdf_d1 = norm_cdf(w * d1)
+    cdf_d2 = norm_cdf(w * d2)
+    s_carry = s * carry_df
+
+    return {
+        'price': w * (s_carry * cdf_d1 - k * df * cdf_d2),
+        'delta': w * carry_df * cdf_d1,
+        'gamma': carry_df * n_d1 / (s * vol_t),
+        'theta': (-s_carry * n_d1 * vol / (2 * sqrt_t)
+                  - w * (b - r) * s_carry * cdf_d1 - w * r * k * df * cdf_d2) / DAYS_PER_YEAR,
+        'vega': s_carry * n_d1 * sqrt_t / 100.0,
+    }
+
+def black76(forward, strike, t, vol, rate=0.0, is_call=True):
+    """Black-76 on a futures/forward price (bsm with zero cost of carry)"""
+    return bsm(forward, strike, t, vol, rate=rate, carry=0.0, is_call=is_call)
+
+def years_to_expiry(expiries, as_of=None):
+    """
+    Years from as_of (default: now, IST) to the 15:30 close of each expiry
+    date. Numeric expiries are taken as years already.
+    """
+    values = np.atleast_1d(np.asarray(expiries, dtype=object))
+    if all(isinstance(v, (int, float, np.number)) for v in values):
+        return values.astype(float)
+    if as_of is None:
+        as_of = datetime.now(IST).replace(tzinfo=None)
+    closes = np.array([datetime.combine(v, EXPIRY_CLOSE) if not isinstance(v, datetime) else v
+                       for v in values], dtype='datetime64[s]')
+    seconds = (closes - np.datetime64(as_of, 's')).astype(float)
+    return seconds / (DAYS_PER_YEAR * 86400)
+
+def price_chain(spot, strikes, expiries, vol, rate=0.0, carry=None, as_of=None, model='bs'):
+    """
+    Price a whole chain in one call: every expiry x strike x (CE, PE).
+
+    expiries are dates (or years to expiry); vol is a scalar, one value per
+    strike, or an (expiries, strikes) surface. model='black76' treats spot
+    as the futures price. Returns flat, expiry-major arrays: expiry, strike,
+    option_type, t and the GREEKS.
+    """
+    strikes = np.asarray(strikes, dtype=float)
+    expiry_values = np.atleast_1d(np.asarray(expiries, dtype=object))
+    t = years_to_expiry(expiry_values, as_of)
+    vol = np.asarray(vol, dtype=float)
+    if vol.ndim == 1:
+        vol = vol[None, :, None]
+    elif vol.ndim == 2:
+        vol = vol[:, :, None]
+    if model == 'black76':
+        carry = 0.0
+    elif model != 'bs':
+        raise ValueError(f"Unknown pricing model: {model}")
+
+    is_call = np.array([True, False])
+    greeks = bsm(spot, strikes[None, :, None], t[:, None, None], vol, rate, carry, is_call[None, None, :])
+    shape = (len(t), len(strikes), 2)
+    chain = {
+        'expiry': np.broadcast_to(expiry_values[:, None, None], shape).ravel(),
+        'strike': np.broadcast_to(strikes[None, :, None], shape).ravel(),
+        'option_type': np.broadcast_to(np.array(OPTION_TYPES)[None, None, :], shape).ravel(),
+        't': np.broadcast_to(t[:, None, None], shape).ravel(),
+    }
+    for name in GREEKS:
+        chain[name] = np.broadcast_to(greeks[name], shape).ravel()
+    return chain
+
+def option_data_rows(underlying, chain, timestamp=None, open_interest=None):
+    """options_data rows (dicts) for a chain from price_chain()"""
+    if timestamp is None:
+        timestamp = datetime.now(IST).replace(tzinfo=None)
+    expiries = chain['expiry']
+    if not all(isinstance(v, date) for v in expiries):
+        raise ValueError("options_data rows need expiry dates, not years to expiry")
+    n = len(chain['strike'])
+    oi = [None] * n if open_interest is None else np.asarray(open_interest).tolist()
+    columns = zip(
+        [v.date() if isinstance(v, datetime) else v for v in expiries],
+        np.round(chain['strike'], 2).tolist(),
+        np.where(call_mask(chain['option_type']), 'CALL', 'PUT').tolist(),
+        np.round(chain['price'], 2).tolist(),
+        oi,
+        np.round(chain['delta'], 4).tolist(),
+        np.round(chain['gamma'], 8).tolist(),
+        np.round(chain['theta'], 4).tolist(),
+        np.round(chain['vega'], 4).tolist(),
+    )
+    return [
+        {'underlying_symbol': underlying, 'expiry_date': expiry, 'strike_price': strike, 'option_type': kind,
+         'ltp': ltp, 'open_interest': oi_value, 'delta': delta, 'gamma': gamma, 'theta': theta, 'vega': vega,
+         'timestamp': timestamp}
+        for expiry, strike, kind, ltp, oi_value, delta, gamma, theta, vega in columns
+    ]
+
+def write_option_data(underlying, chain, timestamp=None, open_interest=None, session=None):
+    """
+    Bulk-insert a priced chain into options_data with one executemany;
+    needs an app context unless a session is given. Returns rows written.
+    """
+    from sqlalchemy import insert
+
+    from .. import db
+    from ..models import OptionData
+
+    rows = option_data_rows(underlying, chain, timestamp, open_interest)
+    if not rows:
+        return 0
+    session = session or db.session
+    session.execute(insert(OptionData), rows)
+    session.commit()
+    return len(rows)
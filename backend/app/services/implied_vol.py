@@ -0,0 +1,186 @@
+import numpy as np
+
+from .greeks import bsm, call_mask, years_to_expiry
+
+# Solver bracket (annualized volatility)
+MIN_IV = 1e-4
+MAX_IV = 5.0
+
+def _bounds(spot, strike, t, rate, carry, is_call):
+    """No-arbitrage (lower, upper) premium bounds"""
+    forward_pv = spot * np.exp((carry - rate) * t)
+    strike_pv = strike * np.exp(-rate * t)
+    lower = np.where(is_call, np.maximum(forward_pv - strike_pv, 0.0), np.maximum(strike_pv - forward_pv, 0.0))
+    upper = np.where(is_call, forward_pv, strike_pv)
+    return lower, upper
+
+def implied_vol(price, spot, strike, t, rate=0.0, carry=None, is_call=True, tol=1e-6, max_iter=50):
+    """
+    Implied volatilities of a batch of premiums; every argument broadcasts.
+
+    Newton steps on the whole batch, with a bisection step wherever Newton
+    would leave the bracket that is kept per contract (tiny vega far from
+    the money). Converged contracts drop out of the active set. Premiums
+    outside the no-arbitrage bounds or the [MIN_IV, MAX_IV] range are
+    masked. Returns {'iv', 'converged', 'iterations'} arrays; iv is NaN
+    where the solve was masked or did not converge within tol (premium
+    points).
+    """
+    price, spot, strike, t, rate, is_call = np.broadcast_arrays(
+        np.asarray(price, dtype=float), np.asarray(spot, dtype=float), np.asarray(strike, dtype=float),
+        np.asarray(t, dtype=float), np.asarray(rate, dtype=float), np.asarray(is_call, dtype=bool))
+    carry = rate if carry is None else np.broadcast_to(np.asarray(carry, dtype=float), price.shape)
+    shape = price.shape
+    price, spot, strike, t, rate, carry, is_call = (a.ravel() for a in (price, spot, strike, t, rate, carry, is_call))
+    n = price.size
+
+    iv = np.full(n, np.nan)
+    converged = np.zeros(n, dtype=bool)
+    iterations = np.zeros(n, dtype=int)
+
+    lower, upper = _bounds(spot, strike, t, rate, carry, is_call)
+    valid = np.isfinite(price) & (t > 0) & (spot > 0) & (strike > 0) & (price > lower) & (price < upper)
+    active = np.flatnonzero(valid)
+    if active.size:
+        # The bracket ends must straddle the premium
+        args = (spot[active], strike[active], t[active])
+        low_price = bsm(*args, MIN_IV, rate[active], carry[active], is_call[active])['price']
+        high_price = bsm(*args, MAX_IV, rate[active], carry[active], is_call[active])['price']
+        active = active[(low_price <= price[active]) & (price[active] <= high_price)]
+
+    lo = np.full(n, MIN_IV)
+    hi = np.full(n, MAX_IV)
+    # Brenner-Subrahmanyam start, exact for at-the-money-forward options
+    vol = np.clip(price * np.sqrt(2 * np.pi / np.maximum(t, 1e-12)) / (spot * np.exp((carry - rate) * t)), 0.05, 1.0)
+
+    for _ in range(max_iter):
+        if not active.size:
+            break
+        a = active
+        g = bsm(spot[a], strike[a], t[a], vol[a], rate[a], carry[a], is_call[a])
+        diff = g['price'] - price[a]
+        iterations[a] += 1
+        done = np.abs(diff) <= tol
+        converged[a[done]] = True
+        iv[a[done]] = vol[a[done]]
+
+        # Shrink the bracket: price rises with vol
+        too_high = diff > 0
+        hi[a] = np.where(too_high, vol[a], hi[a])
+        lo[a] = np.where(too_high, lo[a], vol[a])
+        vega = g['vega'] * 100.0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = vol[a] - diff / vega
+        inside = np.isfinite(newton) & (newton > lo[a]) & (newton < hi[a])
+        vol[a] = np.where(inside, newton, 0.5 * (lo[a] + hi[a]))
+
+        # A collapsed bracket is as close as the solve gets
+        stuck = ~done & (hi[a] - lo[a] < 1e-12)
+        converged[a[stuck]] = True
+        iv[a[stuck]] = vol[a[stuck]]
+        active = a[~done & ~stuck]
+
+    return {'iv': iv.reshape(shape), 'converged': converged.reshape(shape), 'iterations': iterations.reshape(shape)}
+
+class VolSmile:
+    """
+    Implied volatility of one expiry against log-moneyness ln(K/F).
+    Linear interpolation between quoted strikes, flat beyond them.
+    """
+
+    def __init__(self, strikes, ivs, forward, t):
+        strikes = np.asarray(strikes, dtype=float)
+        ivs = np.asarray(ivs, dtype=float)
+        keep = np.isfinite(ivs) & np.isfinite(strikes)
+        # Strikes quoted twice (CE and PE) are averaged
+        unique, inverse = np.unique(strikes[keep], return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(unique))
+        self.strikes = unique
+        self.ivs = np.bincount(inverse, weights=ivs[keep], minlength=len(unique)) / np.maximum(counts, 1)
+        self.forward = float(forward)
+        self.t = float(t)
+        self._x = np.log(self.strikes / self.forward)
+
+    def __len__(self):
+        return len(self.strikes)
+
+    def iv(self, strike):
+        """Interpolated IV at one strike or an array of strikes (NaN for an empty smile)"""
+        x = np.log(np.asarray(strike, dtype=float) / self.forward)
+        if not len(self._x):
+            return np.full(np.shape(x), np.nan) if np.ndim(x) else np.nan
+        return np.interp(x, self._x, self.ivs)
+
+    @property
+    def atm_iv(self):
+        return float(self.iv(self.forward))
+
+class VolSurface:
+    """
+    One VolSmile per expiry. Between expiries, total variance (iv^2 * t)
+    at the same strike is interpolated linearly in time; outside them the
+    nearest smile is used.
+    """
+
+    def __init__(self, smiles):
+        self.smiles = dict(sorted(smiles.items(), key=lambda item: item[1].t))
+        self.expiries = list(self.smiles)
+        self._times = np.array([smile.t for smile in self.smiles.values()])
+
+    def __getitem__(self, expiry):
+        return self.smiles[expiry]
+
+    def iv(self, strike, t):
+        """IV at a strike for time to expiry t (years)"""
+        if not self.smiles:
+            return np.nan
+        smiles = list(self.smiles.values())
+        if t <= self._times[0]:
+            return smiles[0].iv(strike)
+        if t >= self._times[-1]:
+            return smiles[-1].iv(strike)
+        j = int(np.searchsorted(self._times, t))
+        near, far = smiles[j - 1], smiles[j]
+        weight = (t - near.t) / (far.t - near.t)
+        variance = (1 - weight) * near.iv(strike) ** 2 * near.t + weight * far.iv(strike) ** 2 * far.t
+        return np.sqrt(variance / t)
+
+    def atm_iv(self, expiry=None):
+        """At-the-money-forward IV of an expiry (default: the nearest)"""
+        if not self.smiles:
+            return np.nan
+        return self.smiles[expiry if expiry is not None else self.expiries[0]].atm_iv
+
+    @classmethod
+    def from_chain(cls, spot, strikes, expiries, option_types, prices, rate=0.0, carry=None, as_of=None,
+                   model='bs', tol=1e-6):
+        """
+        Solve a whole chain snapshot (flat arrays, one row per contract) in
+        one batch and build a smile per expiry from the out-of-the-money
+        side: puts below the forward, calls at and above it.
+        """
+        strikes = np.asarray(strikes, dtype=float)
+        expiries = np.asarray(expiries, dtype=object)
+        is_call = call_mask(option_types)
+        if model == 'black76':
+            carry = 0.0
+        elif model != 'bs':
+            raise ValueError(f"Unknown pricing model: {model}")
+        unique_expiries = list(dict.fromkeys(expiries.tolist()))
+        unique_t = years_to_expiry(unique_expiries, as_of)
+        t = unique_t[[unique_expiries.index(e) for e in expiries.tolist()]] if len(expiries) else np.empty(0)
+        solved = implied_vol(prices, spot, strikes, t, rate, carry, is_call, tol=tol)
+        forward_carry = rate if carry is None else carry
+        smiles = {}
+        for expiry, t_exp in zip(unique_expiries, unique_t):
+            if t_exp <= 0:
+                continue
+            forward = spot * np.exp(forward_carry * t_exp)
+            rows = expiries == expiry
+            otm = np.where(is_call, strikes >= forward, strikes < forward)
+            # Fall back to every quote when one side of the chain is missing
+            chosen = rows & otm & np.isfinite(solved['iv'])
+            if not chosen.any():
+                chosen = rows
+            smiles[expiry] = VolSmile(strikes[chosen], solved['iv'][chosen], forward, t_exp)
+        return cls(smiles)
@@ -0,0 +1,406 @@
+import json
+import math
+import os
+
+from .technical_analysis import INDICATOR_PRECISION
+
+# TA-Lib treats anything this close to zero as zero (TA_IS_ZERO)
+_EPSILON = 0.00000001
+
+def _is_zero(value):
+    return -_EPSILON < value < _EPSILON
+
+def _round_or_none(value, precision):
+    if value is None or math.isnan(value) or math.isinf(value):
+        return None
+    return round(float(value), precision)
+
+def _ewm_alpha(span):
+    """Same alpha pandas derives from span"""
+    com = (span - 1) / 2.0
+    return 1.0 / (1.0 + com)
+
+def _ewm_step(prev, value, alpha):
+    """pandas ewm(adjust=False) update, written the way pandas evaluates it"""
+    if prev is None:
+        return value
+    old_wt = 1.0 - alpha
+    return (old_wt * prev + alpha * value) / (old_wt + alpha)
+
+class IncrementalIndicators:
+    """
+    Streaming indicator engine: each new bar (or a correction of the last bar)
+    is applied in constant time.
+
+    Values match the batch path of TechnicalAnalyzer for the same bar sequence:
+    EMA, RSI, ATR, ADX and Bollinger Bands follow TA-Lib (SMA/Wilder seeding),
+    the MACD variants follow the pandas EWM used by calculate_all_indicators.
+    The whole state is plain JSON, so a monitor can save it and resume later
+    without re-downloading a warm-up window.
+    """
+
+    STATE_VERSION = 1
+
+    def __init__(self, ema_periods=(20, 50, 200), rsi_period=14, atr_period=14, adx_period=14,
+                 bb_period=20, bb_dev=2.0):
+        self.config = {
+            'ema_periods': list(ema_periods),
+            'rsi_period': rsi_period,
+            'atr_period': atr_period,
+            'adx_period': adx_period,
+            'bb_period': bb_period,
+            'bb_dev': bb_dev,
+        }
+        self.state = self._initial_state()
+        self._prev_state = None
+
+    def _initial_state(self):
+        return {
+            'count': 0,
+            'last_bar': None,
+            'prev_close': None,
+            'prev_high': None,
+            'prev_low': None,
+            'ema': {str(p): {'sum': 0.0, 'value': None} for p in self.config['ema_periods']},
+            'rsi': {'gain': 0.0, 'loss': 0.0, 'value': None},
+            'atr': {'sum': 0.0, 'value': None},
+            'adx': {'plus_dm': 0.0, 'minus_dm': 0.0, 'tr': 0.0, 'sum_dx': 0.0, 'value': None},
+            'macd': {'ema12': None, 'ema26': None, 'signal': None,
+                     'log_ema12': None, 'log_ema26': None, 'log_signal': None, 'pct_signal': None},
+            'bb_window': [],
+        }
+
+    # ------------------------------------------------------------------
+    # Bar updates
+    # ------------------------------------------------------------------
+    def update(self, bar):
+        """
+        Apply one new bar and return the latest snapshot.
+        bar: dict with open/high/low/close (any case) and an optional timestamp
+        """
+        self.advance(bar)
+        return self.snapshot()
+
+    def advance(self, bar):
+        """Apply one new bar without building a snapshot (bar-by-bar replays)"""
+        bar = self._normalize_bar(bar)
+        self._prev_state = self._copy_state(self.state)
+        self._apply(bar)
+
+    def replace_last(self, bar):
+        """Correct the most recent bar (e.g. a still-forming 5m candle)"""
+        if self._prev_state is None:
+            if self.state['count'] == 0:
+                return self.update(bar)
+            raise ValueError("Previous state unavailable; only the bar applied since the last restore can be replaced")
+        bar = self._normalize_bar(bar)
+        self.state = self._copy_state(self._prev_state)
+        self._apply(bar)
+        return self.snapshot()
+
+    def update_from_dataframe(self, data):
+        """
+        Feed the bars of an OHLCV DataFrame that are newer than the last bar seen.
+        A row with the same timestamp as the last bar is treated as a correction.
+        Returns the number of bars applied.
+        """
+        last_ts = self.last_timestamp
+        applied = 0
+        for ts, row in zip(data.index, data[['Open', 'High', 'Low', 'Close']].itertuples(index=False)):
+            ts_str = ts.isoformat() if hasattr(ts, 'isoformat') else str(ts)
+            bar = {'timestamp': ts_str, 'open': row[0], 'high': row[1], 'low': row[2], 'close': row[3]}
+            if last_ts is not None and ts_str < last_ts:
+                continue
+            if last_ts is not None and ts_str == last_ts:
+                if self._prev_state is not None:
+                    self.replace_last(bar)
+                    applied += 1
+                continue
+            self.update(bar)
+            last_ts = ts_str
+            applied += 1
+        return applied
+
+    @classmethod
+    def from_dataframe(cls, data, **kwargs):
+        """Warm up a new engine from historical bars"""
+        engine = cls(**kwargs)
+        engine.update_from_dataframe(data)
+        return engine
+
+    @property
+    def last_timestamp(self):
+        last_bar = self.state['last_bar']
+        return last_bar.get('timestamp') if last_bar else None
+
+    @property
+    def count(self):
+        return self.state['count']
+
+    def _normalize_bar(self, bar):
+        lowered = {k.lower(): v for k, v in bar.items()}
+        normalized = {
+            'open': float(lowered['open']),
+            'high': float(lowered['high']),
+            'low': float(lowered['low']),
+            'close': float(lowered['close']),
+        }
+        timestamp = lowered.get('timestamp')
+        if timestamp is not None:
+            normalized['timestamp'] = timestamp.isoformat() if hasattr(timestamp, 'isoformat') else str(timestamp)
+        return normalized
+
+    def _copy_state(self, state):
+        copied = dict(state)
+        copied['ema'] = {k: dict(v) for k, v in state['ema'].items()}
+        for key in ('rsi', 'atr', 'adx', 'macd'):
+            copied[key] = dict(state[key])
+        copied['bb_window'] = list(state['bb_window'])
+        copied['last_bar'] = dict(state['last_bar']) if state['last_bar'] else None
+        return copied
+
+    def _apply(self, bar):
+        st = self.state
+        idx = st['count']
+        close = bar['close']
+        high = bar['high']
+        low = bar['low']
+        prev_close = st['prev_close']
+
+        self._update_emas(idx, close)
+        self._update_rsi(idx, close, prev_close)
+        self._update_atr(idx, high, low, prev_close)
+        self._update_adx(idx, high, low, prev_close)
+        self._update_macd(close)
+        self._update_bbands(close)
+
+        st['prev_close'] = close
+        st['prev_high'] = high
+        st['prev_low'] = low
+        st['last_bar'] = bar
+        st['count'] = idx + 1
+
+    def _update_emas(self, idx, close):
+        for period_str, ema in self.state['ema'].items():
+            period = int(period_str)
+            if idx < period:
+                ema['sum'] += close
+                if idx == period - 1:
+                    ema['value'] = ema['sum'] / period
+            else:
+                k = 2.0 / (period + 1)
+                ema['value'] = ((close - ema['value']) * k) + ema['value']
+
+    def _update_rsi(self, idx, close, prev_close):
+        if idx == 0:
+            return
+        n = self.config['rsi_period']
+        rsi = self.state['rsi']
+        diff = close - prev_close
+        if idx <= n:
+            if diff < 0:
+                rsi['loss'] -= diff
+            else:
+                rsi['gain'] += diff
+            if idx == n:
+                rsi['loss'] /= n
+                rsi['gain'] /= n
+            else:
+                return
+        else:
+            rsi['loss'] *= (n - 1)
+            rsi['gain'] *= (n - 1)
+            if diff < 0:
+                rsi['loss'] -= diff
+            else:
+                rsi['gain'] += diff
+            rsi['loss'] /= n
+            rsi['gain'] /= n
+        total = rsi['gain'] + rsi['loss']
+        rsi['value'] = 100.0 * (rsi['gain'] / total) if not _is_zero(total) else 0.0
+
+    @staticmethod
+    def _true_range(high, low, prev_close):
+        greatest = high - low
+        val2 = abs(prev_close - high)
+        if val2 > greatest:
+            greatest = val2
+        val3 = abs(prev_close - low)
+        if val3 > greatest:
+            greatest = val3
+        return greatest
+
+    def _update_atr(self, idx, high, low, prev_close):
+        if idx == 0:
+            return
+        n = self.config['atr_period']
+        atr = self.state['atr']
+        tr = self._true_range(high, low, prev_close)
+        if idx <= n:
+            atr['sum'] += tr
+            if idx == n:
+                atr['value'] = atr['sum'] / n
+        else:
+            value = atr['value'] * (n - 1)
+            value += tr
+            atr['value'] = value / n
+
+    def _update_adx(self, idx, high, low, prev_close):
+        if idx == 0:
+            return
+        n = self.config['adx_period']
+        adx = self.state['adx']
+        diff_p = high - self.state['prev_high']
+        diff_m = self.state['prev_low'] - low
+        tr = self._true_range(high, low, prev_close)
+
+        if idx < n:
+            if diff_m > 0 and diff_p < diff_m:
+                adx['minus_dm'] += diff_m
+            elif diff_p > 0 and diff_p > diff_m:
+                adx['plus_dm'] += diff_p
+            adx['tr'] += tr
+            return
+
+        adx['minus_dm'] -= adx['minus_dm'] / n
+        adx['plus_dm'] -= adx['plus_dm'] / n
+        if diff_m > 0 and diff_p < diff_m:
+            adx['minus_dm'] += diff_m
+        elif diff_p > 0 and diff_p > diff_m:
+            adx['plus_dm'] += diff_p
+        adx['tr'] = adx['tr'] - (adx['tr'] / n) + tr
+
+        dx = None
+        if not _is_zero(adx['tr']):
+            minus_di = 100.0 * (adx['minus_dm'] / adx['tr'])
+            plus_di = 100.0 * (adx['plus_dm'] / adx['tr'])
+            di_sum = minus_di + plus_di
+            if not _is_zero(di_sum):
+                dx = 100.0 * (abs(minus_di - plus_di) / di_sum)
+
+        if idx < 2 * n:
+            if dx is not None:
+                adx['sum_dx'] += dx
+            if idx == 2 * n - 1:
+                adx['value'] = adx['sum_dx'] / n
+        elif dx is not None:
+            adx['value'] = ((adx['value'] * (n - 1)) + dx) / n
+
+    def _update_macd(self, close):
+        macd = self.state['macd']
+        a12, a26, a9 = _ewm_alpha(12), _ewm_alpha(26), _ewm_alpha(9)
+        macd['ema12'] = _ewm_step(macd['ema12'], close, a12)
+        macd['ema26'] = _ewm_step(macd['ema26'], close, a26)
+        line = macd['ema12'] - macd['ema26']
+        macd['signal'] = _ewm_step(macd['signal'], line, a9)
+
+        log_close = math.log(close) if close > 0 else float('nan')
+        macd['log_ema12'] = _ewm_step(macd['log_ema12'], log_close, a12)
+        macd['log_ema26'] = _ewm_step(macd['log_ema26'], log_close, a26)
+        macd['log_signal'] = _ewm_step(macd['log_signal'], macd['log_ema12'] - macd['log_ema26'], a9)
+
+        pct = line / macd['ema26'] * 100 if macd['ema26'] else float('nan')
+        macd['pct_signal'] = _ewm_step(macd['pct_signal'], pct, a9)
+
+    def _update_bbands(self, close):
+        window = self.state['bb_window']
+        window.append(close)
+        if len(window) > self.config['bb_period']:
+            window.pop(0)
+
+    # ------------------------------------------------------------------
+    # Outputs
+    # ------------------------------------------------------------------
+    def values(self):
+        """Unrounded latest values (None until an indicator is warmed up)"""
+        st = self.state
+        bar = st['last_bar'] or {}
+        out = {
+            'current_price': bar.get('close'),
+            'high': bar.get('high'),
+            'low': bar.get('low'),
+            'open': bar.get('open'),
+            'rsi': st['rsi']['value'],
+        }
+
+        macd = st['macd']
+        if macd['ema12'] is not None:
+            line = macd['ema12'] - macd['ema26']
+            log_line = macd['log_ema12'] - macd['log_ema26']
+            pct_line = line / macd['ema26'] * 100 if macd['ema26'] else float('nan')
+            out.update({
+                'macd': line,
+                'macd_signal': macd['signal'],
+                'macd_histogram': line - macd['signal'],
+                'macd_log': log_line,
+                'macd_log_signal': macd['log_signal'],
+                'macd_log_histogram': log_line - macd['log_signal'],
+                'macd_pct': pct_line,
+                'macd_pct_signal': macd['pct_signal'],
+                'macd_pct_histogram': pct_line - macd['pct_signal'],
+            })
+
+        window = st['bb_window']
+        period = self.config['bb_period']
+        if len(window) == period:
+            mean = sum(window) / period
+            variance = sum(x * x for x in window) / period - mean * mean
+            std = math.sqrt(variance) if variance > 0 else 0.0
+            dev = self.config['bb_dev']
+            out.update({'bb_upper': mean + dev * std, 'bb_middle': mean, 'bb_lower': mean - dev * std})
+
+        for period_str, ema in st['ema'].items():
+            out[f'ema_{period_str}'] = ema['value']
+        out['atr'] = st['atr']['value']
+        out['adx'] = st['adx']['value']
+        return out
+
+    def snapshot(self):
+        """Latest values rounded like TechnicalAnalyzer.calculate_all_indicators()"""
+        raw = self.values()
+        snapshot = {}
+        for key, precision in INDICATOR_PRECISION.items():
+            if key in ('stoch_k', 'stoch_d'):
+                continue
+            snapshot[key] = _round_or_none(raw.get(key), precision)
+        return snapshot
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def to_state(self):
+        return {
+            'version': self.STATE_VERSION,
+            'config': self.config,
+            'state': self._copy_state(self.state),
+            'prev_state': self._copy_state(self._prev_state) if self._prev_state else None,
+        }
+
+    @classmethod
+    def from_state(cls, payload):
+        if payload.get('version') != cls.STATE_VERSION:
+            raise ValueError(f"Unsupported indicator state version: {payload.get('version')}")
+        config = payload['config']
+        engine = cls(
+            ema_periods=tuple(config['ema_periods']),
+            rsi_period=config['rsi_period'],
+            atr_period=config['atr_period'],
+            adx_period=config['adx_period'],
+            bb_period=config['bb_period'],
+            bb_dev=config['bb_dev'],
+        )
+        engine.state = payload['state']
+        engine._prev_state = payload.get('prev_state')
+        return engine
+
+    def save(self, path):
+        """Write the engine state as JSON (atomically)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_state(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_state(json.load(f))
@@ -0,0 +1,186 @@
+import hashlib
+import importlib
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config import Config
+
+# Job name -> "module:function" taking (params, progress=None); resolved lazily
+# so the web process does not import the report stack until a job runs
+JOB_TASKS = {
+    'report': 'app.services.report_pipeline:run_report_job',
+}
+
+def resolve_task(name):
+    module_name, func_name = JOB_TASKS[name].split(':')
+    return getattr(importlib.import_module(module_name), func_name)
+
+def job_key(task, params):
+    """Identical requests share one key and are coalesced into one job"""
+    return hashlib.sha256(json.dumps([task, params], sort_keys=True, default=str).encode()).hexdigest()
+
+class LocalJobQueue:
+    """
+    In-process job queue on a thread pool, for machines without Redis.
+
+    Jobs are plain dicts: id, task, status (queued/running/done/failed),
+    stage, progress (0..1), result, error. A request matching a job that is
+    still queued or running gets that job's id instead of a new job.
+    Finished jobs are forgotten after keep_finished seconds.
+    """
+
+    backend = 'local'
+
+    def __init__(self, max_workers=2, keep_finished=3600):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._lock = threading.Lock()
+        self._jobs = {}    # id -> job
+        self._active = {}  # job key -> id of the queued/running job
+        self.keep_finished = keep_finished
+
+    def submit(self, task, params):
+        """Queue task(params); returns (job_id, coalesced)"""
+        if task not in JOB_TASKS:
+            raise ValueError(f"Unknown job task: {task}")
+        key = job_key(task, params)
+        with self._lock:
+            self._expire()
+            if key in self._active:
+                return self._active[key], True
+            job_id = uuid.uuid4().hex
+            now = time.time()
+            self._jobs[job_id] = {
+                'id': job_id, 'task': task, 'status': 'queued', 'stage': 'queued', 'progress': 0.0,
+                'result': None, 'error': None, 'created': now, 'updated': now,
+            }
+            self._active[key] = job_id
+        self._executor.submit(self._run, job_id, key, task, params)
+        return job_id, False
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields, updated=time.time())
+
+    def _run(self, job_id, key, task, params):
+        self._update(job_id, status='running', stage='starting')
+        try:
+            result = resolve_task(task)(params, progress=lambda stage, fraction: self._update(
+                job_id, stage=stage, progress=fraction))
+            self._update(job_id, status='done', stage='done', progress=1.0, result=result)
+        except Exception as e:
+            print(f"Job {job_id} ({task}) failed: {e}")
+            self._update(job_id, status='failed', error=str(e))
+        finally:
+            with self._lock:
+                self._active.pop(key, None)
+
+    def _expire(self):
+        cutoff = time.time() - self.keep_finished
+        for job_id, job in list(self._jobs.items()):
+            if job['status'] in ('done', 'failed') and job['updated'] < cutoff:
+                del self._jobs[job_id]
+
+    def get(self, job_id):
+        """Snapshot of a job, or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def wait(self, job_id, timeout=None, poll_interval=0.05):
+        """Block until the job finishes (tests and scripts); returns the job"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job['status'] in ('done', 'failed'):
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                return job
+            time.sleep(poll_interval)
+
+def make_celery_app(broker_url=None, backend_url=None):
+    """
+    Celery app running JOB_TASKS on workers. Start one with
+    `celery -A app.services.job_queue:celery_app worker` from backend/.
+    """
+    from celery import Celery
+
+    broker_url = broker_url or Config.CELERY_BROKER_URL
+    backend_url = backend_url or Config.CELERY_RESULT_BACKEND or broker_url
+    app = Celery('reports', broker=broker_url, backend=backend_url)
+    app.conf.task_track_started = True
+    app.conf.result_expires = 3600
+
+    @app.task(bind=True, name='reports.run_job')
+    def run_job(self, task, params, coalesce_key=None):
+        def progress(stage, fraction):
+            self.update_state(state='PROGRESS', meta={'stage': stage, 'progress': fraction})
+        try:
+            return resolve_task(task)(params, progress=progress)
+        finally:
+            if coalesce_key:
+                _redis_client(backend_url).delete(coalesce_key)
+
+    return app
+
+def _redis_client(url):
+    import redis
+    return redis.Redis.from_url(url)
+
+class CeleryJobQueue:
+    """
+    Same interface as LocalJobQueue, backed by Celery workers. Coalescing
+    uses a Redis key per request that the worker clears when the job ends.
+    """
+
+    backend = 'celery'
+    STATES = {'PENDING': 'queued', 'RECEIVED': 'queued', 'STARTED': 'running', 'PROGRESS': 'running',
+              'RETRY': 'queued', 'SUCCESS': 'done', 'FAILURE': 'failed', 'REVOKED': 'failed'}
+
+    def __init__(self, app, coalesce_ttl=3600):
+        self.app = app
+        self.coalesce_ttl = coalesce_ttl
+        self._redis = _redis_client(app.conf.result_backend)
+
+    def submit(self, task, params):
+        if task not in JOB_TASKS:
+            raise ValueError(f"Unknown job task: {task}")
+        coalesce_key = f"report-job:{job_key(task, params)}"
+        job_id = uuid.uuid4().hex
+        if not self._redis.set(coalesce_key, job_id, nx=True, ex=self.coalesce_ttl):
+            existing = self._redis.get(coalesce_key)
+            if existing:
+                return existing.decode(), True
+        self.app.send_task('reports.run_job', args=(task, params, coalesce_key), task_id=job_id)
+        return job_id, False
+
+    def get(self, job_id):
+        result = self.app.AsyncResult(job_id)
+        status = self.STATES.get(result.state, 'queued')
+        job = {'id': job_id, 'status': status, 'stage': status, 'progress': 0.0, 'result': None, 'error': None}
+        if result.state == 'PROGRESS' and isinstance(result.info, dict):
+            job.update(stage=result.info.get('stage', 'running'), progress=result.info.get('progress', 0.0))
+        elif status == 'done':
+            job.update(progress=1.0, result=result.result)
+        elif status == 'failed':
+            job['error'] = str(result.result)
+        return job
+
+# Workers import this module to find the task
+celery_app = make_celery_app() if Config.CELERY_BROKER_URL else None
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def get_job_queue():
+    """Celery when CELERY_BROKER_URL is set, otherwise the in-process queue"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            if celery_app is not None:
+                _queue = CeleryJobQueue(celery_app)
+            else:
+                _queue = LocalJobQueue(max_workers=Config.JOB_WORKERS)
+        return _queue
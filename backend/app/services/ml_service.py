@@ -1,42 +1,79 @@
 import os
+import json
 import pandas as pd
 import numpy as np
 import lightgbm as lgb
+from sklearn.metrics import roc_auc_score
 from app.services.technical_analysis import TechnicalAnalyzer
 from app.services.data_fetcher import MarketDataFetcher
+from app.services.file_lock import FileLock
+from app.services.model_registry import get_model_registry
+from app.services.retrain_scheduler import get_retrain_scheduler
 import joblib
 from datetime import datetime, timedelta
 
+# Feature columns of the direction model, in training order
+LGBM_FEATURES = ['rsi', 'macd', 'macd_signal', 'ema_20', 'ema_50', 'adx', 'volatility', 'returns']
+# Scale-free features checked for drift (price-level features trend by design)
+DRIFT_FEATURES = ['rsi', 'adx', 'volatility', 'returns']
+# Staleness reason that rules out predicting: the saved model expects other inputs
+SCHEMA_CHANGED = "feature schema changed"
+
 class LightGBMService:
-    def __init__(self, model_dir="models"):
+    # A model is stale after this many days, or when recent features drift
+    # further than DRIFT_Z_THRESHOLD training standard deviations
+    MAX_MODEL_AGE_DAYS = 7
+    DRIFT_Z_THRESHOLD = 3.0
+    DRIFT_WINDOW = 20
+
+    def __init__(self, model_dir="models", registry=None, scheduler=None):
         self.model_dir = model_dir
         if not os.path.exists(self.model_dir):
             os.makedirs(self.model_dir)
         self.fetcher = MarketDataFetcher()
+        self.registry = registry or get_model_registry()
+        self.scheduler = scheduler or get_retrain_scheduler()
+
+    def _model_path(self, symbol):
+        return os.path.join(self.model_dir, f"lgb_{symbol}.pkl")
+
+    def _metadata_path(self, symbol):
+        return os.path.join(self.model_dir, f"lgb_{symbol}.json")
 
-    def _prepare_features(self, df):
-        """Prepare features for LightGBM using TechnicalAnalyzer indicators"""
+    def load_metadata(self, symbol):
+        """Training metadata saved next to the model (None for older models)"""
+        try:
+            with open(self._metadata_path(symbol), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def warm_up(self):
+        """Preload every symbol's model into the shared registry"""
+        return self.registry.warm_up_dir(self.model_dir, 'lgb_*.pkl')
+
+    def _prepare_features(self, df, frame=None):
+        """
+        Prepare features for LightGBM using TechnicalAnalyzer indicators.
+        frame: TechnicalAnalyzer.indicator_frame() for df (optional, computed if missing)
+        """
         df = df.copy()
+        if frame is None:
+            frame = TechnicalAnalyzer(df).indicator_frame()
         
         # Basic Price Features
         df['returns'] = df['Close'].pct_change()
         df['volatility'] = df['returns'].rolling(window=20).std()
         
         # Technical Indicators
-        import talib
-        close = df['Close'].values
-        high = df['High'].values
-        low = df['Low'].values
-        
-        df['rsi'] = talib.RSI(close, timeperiod=14)
-        macd, macdsignal, macdhist = talib.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9)
-        df['macd'] = macd
-        df['macd_signal'] = macdsignal
+        df['rsi'] = frame['rsi']
+        df['macd'] = frame['talib_macd']
+        df['macd_signal'] = frame['talib_macd_signal']
         
-        df['ema_20'] = talib.EMA(close, timeperiod=20)
-        df['ema_50'] = talib.EMA(close, timeperiod=50)
+        df['ema_20'] = frame['ema_20']
+        df['ema_50'] = frame['ema_50']
         
-        df['adx'] = talib.ADX(high, low, close, timeperiod=14)
+        df['adx'] = frame['adx']
         
         # Target: 1 if next day close is higher, else 0
         df['target'] = (df['Close'].shift(-1) > df['Close']).astype(int)
@@ -44,11 +81,16 @@ class LightGBMService:
         # Drop rows with NaN (due to indicators and shift)
         df = df.dropna()
         
-        features = ['rsi', 'macd', 'macd_signal', 'ema_20', 'ema_50', 'adx', 'volatility', 'returns']
-        return df[features], df['target']
+        return df[LGBM_FEATURES], df['target']
 
     def train_model(self, symbol, period='2y'):
-        """Train a LightGBM model for a specific symbol"""
+        """Train a LightGBM model for a specific symbol and save it with its metadata"""
+        model_path = self._model_path(symbol)
+        # One trainer per model across processes (report job vs. retrain CLI)
+        with FileLock(f"{model_path}.lock", timeout=600):
+            return self._train_model(symbol, period, model_path)
+
+    def _train_model(self, symbol, period, model_path):
         print(f"Training LightGBM model for {symbol}...")
         df = self.fetcher.fetch_data(symbol, period=period)
         if df is None or df.empty:
@@ -83,96 +125,213 @@ class LightGBMService:
             callbacks=[lgb.early_stopping(stopping_rounds=10)]
         )
         
-        model_path = os.path.join(self.model_dir, f"lgb_{symbol}.pkl")
-        joblib.dump(model, model_path)
+        auc = None
+        if len(X_test) and y_test.nunique() == 2:
+            auc = round(float(roc_auc_score(y_test, model.predict(X_test.values))), 4)
+
+        metadata = {
+            'symbol': symbol,
+            'trained_at': datetime.now().isoformat(timespec='seconds'),
+            'period': period,
+            'window_start': str(X.index[0]),
+            'window_end': str(X.index[-1]),
+            'train_rows': len(X_train),
+            'test_rows': len(X_test),
+            'auc': auc,
+            'best_iteration': model.best_iteration,
+            'features': LGBM_FEATURES,
+            'feature_stats': {
+                column: {'mean': float(X_train[column].mean()), 'std': float(X_train[column].std())}
+                for column in LGBM_FEATURES
+            },
+        }
+
+        tmp_path = f"{model_path}.tmp"
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, model_path)
+        meta_path = self._metadata_path(symbol)
+        with open(f"{meta_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2)
+        os.replace(f"{meta_path}.tmp", meta_path)
+        self.registry.invalidate(model_path)
+        print(f"Saved {symbol} model (AUC {auc}, {len(X_train)} training rows)")
         return True
 
-    def predict(self, symbol, current_df):
-        """Predict the probability of a price increase for the next period"""
-        model_path = os.path.join(self.model_dir, f"lgb_{symbol}.pkl")
+    def model_status(self, symbol, X=None):
+        """
+        Staleness check: {'state': 'missing' | 'fresh' | 'stale', 'reasons': [...], 'metadata': ...}
+        X: current feature rows (from _prepare_features) used for the drift check
+        """
+        model_path = self._model_path(symbol)
         if not os.path.exists(model_path):
-            success = self.train_model(symbol)
-            if not success: return None
-                
-        model = joblib.load(model_path)
-        X, _ = self._prepare_features(current_df)
-        if X.empty: return None
-            
-        latest_features = X.iloc[-1:].values
-        prediction_prob = model.predict(latest_features)[0]
-        return float(prediction_prob)
+            return {'state': 'missing', 'reasons': ['no trained model'], 'metadata': None}
+
+        metadata = self.load_metadata(symbol)
+        reasons = []
+        if metadata:
+            trained_at = datetime.fromisoformat(metadata['trained_at'])
+            features = metadata.get('features')
+        else:
+            # Models saved before metadata existed: fall back to the file itself
+            trained_at = datetime.fromtimestamp(os.path.getmtime(model_path))
+            model = self.registry.get(model_path)
+            features = model.feature_name() if model is not None else None
+
+        age_days = (datetime.now() - trained_at).total_seconds() / 86400
+        if age_days > self.MAX_MODEL_AGE_DAYS:
+            reasons.append(f"trained {age_days:.0f} days ago")
+        if features != LGBM_FEATURES:
+            reasons.append(SCHEMA_CHANGED)
+
+        stats = (metadata or {}).get('feature_stats')
+        if stats and X is not None and not X.empty:
+            recent = X.tail(self.DRIFT_WINDOW).mean()
+            for column in DRIFT_FEATURES:
+                std = stats.get(column, {}).get('std') or 0.0
+                if std > 0:
+                    z = abs(recent[column] - stats[column]['mean']) / std
+                    if z > self.DRIFT_Z_THRESHOLD:
+                        reasons.append(f"{column} drifted (z={z:.1f})")
+
+        return {'state': 'stale' if reasons else 'fresh', 'reasons': reasons, 'metadata': metadata}
+
+    def schedule_retrain(self, symbol, reason=''):
+        """Queue a background retrain (no-op if one is already pending)"""
+        return self.scheduler.request(self._model_path(symbol), lambda: self.train_model(symbol), reason)
+
+    def predict_with_status(self, symbol, current_df, frame=None):
+        """
+        Prediction that never trains inline. Returns
+        {'probability', 'status': 'ok' | 'stale' | 'unavailable', 'reasons', 'trained_at', 'auc'}.
+        Missing or stale models are queued for a background retrain; a model
+        trained on other features is 'unavailable' until that retrain lands.
+        """
+        X, _ = self._prepare_features(current_df, frame)
+        status = self.model_status(symbol, X)
+        metadata = status['metadata'] or {}
+        result = {
+            'probability': None,
+            'status': 'ok',
+            'reasons': status['reasons'],
+            'trained_at': metadata.get('trained_at'),
+            'auc': metadata.get('auc'),
+        }
+
+        if status['state'] != 'fresh':
+            self.schedule_retrain(symbol, '; '.join(status['reasons']))
+        if status['state'] == 'missing' or SCHEMA_CHANGED in status['reasons']:
+            result['status'] = 'unavailable'
+            return result
+
+        model = self.registry.get(self._model_path(symbol))
+        if model is None or X.empty:
+            result['status'] = 'unavailable'
+            return result
+        if model.num_feature() != X.shape[1]:
+            # Metadata says the schema matches but the booster disagrees
+            result['reasons'] = result['reasons'] + [SCHEMA_CHANGED]
+            self.schedule_retrain(symbol, SCHEMA_CHANGED)
+            result['status'] = 'unavailable'
+            return result
+
+        result['probability'] = float(model.predict(X.iloc[-1:].values)[0])
+        result['status'] = 'stale' if status['state'] == 'stale' else 'ok'
+        return result
+
+    def predict(self, symbol, current_df, frame=None):
+        """Predict the probability of a price increase for the next period (None if no model yet)"""
+        return self.predict_with_status(symbol, current_df, frame)['probability']
 
     def get_feature_importance(self, symbol):
         """Return feature importance for a symbol's model"""
-        model_path = os.path.join(self.model_dir, f"lgb_{symbol}.pkl")
-        if not os.path.exists(model_path):
+        model = self.registry.get(self._model_path(symbol))
+        if model is None:
             return None
-        model = joblib.load(model_path)
         importance = model.feature_importance(importance_type='gain')
-        features = ['rsi', 'macd', 'macd_signal', 'ema_20', 'ema_50', 'adx', 'volatility', 'returns']
-        return dict(zip(features, [round(float(v), 2) for v in importance]))
+        return dict(zip(LGBM_FEATURES, [round(float(v), 2) for v in importance]))
 
 class OptionDecayService:
     """Service to predict option premium decay (BSE-style options)"""
-    def __init__(self, model_dir="models/options"):
+    def __init__(self, model_dir="models/options", registry=None):
         self.model_dir = model_dir
         if not os.path.exists(self.model_dir):
             os.makedirs(self.model_dir)
+        self.registry = registry or get_model_registry()
+
+    def warm_up(self):
+        """Preload the decay classifiers into the shared registry"""
+        return self.registry.warm_up_dir(self.model_dir, 'decay_class_*.pkl')
 
     def prepare_option_features(self, option_df, underlying_df):
         """
         Prepare features for option decay prediction.
         option_df: DataFrame with ['Close', 'Open_Interest', 'Volume', 'Strike', 'Expiry', 'Type']
         underlying_df: DataFrame with underlying price data
+        Option bars are matched to the underlying on exact timestamps.
         """
-        df = option_df.copy()
-        
-        # Ensure dates are datetime
+        return self.prepare_chain_features(option_df, underlying_df, tolerance=pd.Timedelta(0))
+
+    def prepare_chain_features(self, chain_df, underlying_df, tolerance=None):
+        """
+        Vectorized feature builder for a whole option chain in long format.
+
+        chain_df: one row per (timestamp, contract) with ['Close', 'Open_Interest',
+        'Volume', 'Strike', 'Expiry', 'Type'] and the timestamp as index or a
+        'Timestamp' column; any number of strikes/expiries/types (CALL/CE or PUT/PE).
+        Each bar takes the last underlying close at or before its timestamp
+        (as-of join, at most `tolerance` old). Decay targets are computed per
+        contract (Expiry, Strike, Type).
+
+        Returns (X, y_class, y_reg) like prepare_option_features, indexed by
+        the original chain row labels.
+        """
+        df = chain_df.copy()
+        if 'Timestamp' in df.columns:
+            df['Timestamp'] = pd.to_datetime(df['Timestamp'])
+        else:
+            if not isinstance(df.index, pd.DatetimeIndex):
+                df.index = pd.to_datetime(df.index)
+            df['Timestamp'] = df.index
         df['Expiry'] = pd.to_datetime(df['Expiry'])
-        
-        # 1. Time-to-expiry (TTE)
-        # Use index as timestamp if it's datetime, otherwise ensure it's a column
-        if not isinstance(df.index, pd.DatetimeIndex):
-            df.index = pd.to_datetime(df.index)
-        
-        df['tte'] = (df['Expiry'] - df.index).dt.total_seconds() / (24 * 3600)
-        
-        # 2. Moneyness (M = S/K for Calls, K/S for Puts)
-        # We need to join with underlying price at the same timestamp
-        # underlying_df index should also be DatetimeIndex
-        df = df.join(underlying_df['Close'].rename('underlying_price'), how='inner')
-        
-        def calculate_moneyness(row):
-            s = row['underlying_price']
-            k = row['Strike']
-            if row['Type'].upper() == 'CALL':
-                return s / k
-            else:
-                return k / s
-        
-        df['moneyness'] = df.apply(calculate_moneyness, axis=1)
-        
-        # 3. Premium Decay Rate (Target)
-        # Target: (Premium_t - Premium_t+1) / Premium_t
-        df['decay_rate'] = (df['Close'] - df['Close'].shift(-1)) / df['Close']
-        
-        # 4. Binary Target: Expires Worthless
-        # (Simplified: if price at expiry would be 0 based on current underlying path)
-        # For a CALL: if S_expiry <= K, it expires worthless.
-        # Since we don't have S_expiry in training, we use a proxy:
-        # if decay_rate is very high (> 5% per bar) and tte is low (< 2 days), it's likely dying.
+        df = df.reset_index(drop=True)
+        df['_row'] = np.arange(len(df))
+
+        # Underlying close and its rolling volatility, aligned as-of each option bar
+        underlying = pd.DataFrame({
+            'underlying_price': underlying_df['Close'].to_numpy(dtype=float),
+            'underlying_vol': underlying_df['Close'].pct_change().rolling(window=20).std().to_numpy(),
+        }, index=pd.to_datetime(underlying_df.index)).sort_index()
+        underlying.index.name = 'Timestamp'
+        df = pd.merge_asof(
+            df.sort_values('Timestamp', kind='stable'),
+            underlying.reset_index(),
+            on='Timestamp',
+            direction='backward',
+            tolerance=tolerance,
+        )
+
+        # 1. Time-to-expiry (days)
+        df['tte'] = (df['Expiry'] - df['Timestamp']).dt.total_seconds() / (24 * 3600)
+
+        # 2. Moneyness (S/K for calls, K/S for puts)
+        is_call = df['Type'].astype(str).str.upper().isin(['CALL', 'CE', 'C']).to_numpy()
+        spot = df['underlying_price'].to_numpy()
+        strike = df['Strike'].to_numpy(dtype=float)
+        df['moneyness'] = np.where(is_call, spot / strike, strike / spot)
+
+        # 3. Premium decay rate per contract: (Premium_t - Premium_t+1) / Premium_t
+        next_close = df.groupby(['Expiry', 'Strike', 'Type'], sort=False)['Close'].shift(-1)
+        df['decay_rate'] = (df['Close'] - next_close) / df['Close']
+
+        # 4. Binary target: dying option (fast decay close to expiry)
         df['is_dying'] = ((df['decay_rate'] > 0.05) & (df['tte'] < 2.0)).astype(int)
-        
-        # 5. Volume/OI Ratio
+
+        # 5. Volume/OI ratio
         df['vol_oi_ratio'] = df['Volume'] / (df['Open_Interest'] + 1)
-        
-        # 6. Underlying Volatility
-        df['underlying_vol'] = underlying_df['Close'].pct_change().rolling(window=20).std()
-        
-        # Drop rows with NaN
-        df = df.dropna()
-        
+
         features = ['tte', 'moneyness', 'vol_oi_ratio', 'underlying_vol', 'Close']
+        df = df.dropna(subset=features + ['decay_rate']).sort_values('_row', kind='stable')
+        df.index = chain_df.index[df['_row'].to_numpy()]
         return df[features], df['is_dying'], df['decay_rate']
 
     def train_decay_model(self, symbol, option_data, underlying_data):
@@ -202,8 +361,12 @@ class OptionDecayService:
         model_reg = lgb.train(params_reg, dtrain_reg, num_boost_round=100)
         
         # Save models
-        joblib.dump(model_class, os.path.join(self.model_dir, f"decay_class_{symbol}.pkl"))
-        joblib.dump(model_reg, os.path.join(self.model_dir, f"decay_reg_{symbol}.pkl"))
+        class_path = os.path.join(self.model_dir, f"decay_class_{symbol}.pkl")
+        reg_path = os.path.join(self.model_dir, f"decay_reg_{symbol}.pkl")
+        joblib.dump(model_class, class_path)
+        joblib.dump(model_reg, reg_path)
+        self.registry.invalidate(class_path)
+        self.registry.invalidate(reg_path)
         
         return True
 
@@ -213,11 +376,9 @@ class OptionDecayService:
         current_option_row: List or array of features [tte, moneyness, vol_oi_ratio, underlying_vol, Close]
         """
         # Load models
-        class_path = os.path.join(self.model_dir, f"decay_class_{symbol}.pkl")
-        if not os.path.exists(class_path):
+        model_class = self.registry.get(os.path.join(self.model_dir, f"decay_class_{symbol}.pkl"))
+        if model_class is None:
             return None
-            
-        model_class = joblib.load(class_path)
         
         # Ensure input is 2D
         features = np.array(current_option_row).reshape(1, -1)
@@ -226,10 +387,9 @@ class OptionDecayService:
 
     def get_decay_importance(self, symbol):
         """Return feature importance for option decay model"""
-        model_path = os.path.join(self.model_dir, f"decay_class_{symbol}.pkl")
-        if not os.path.exists(model_path):
+        model = self.registry.get(os.path.join(self.model_dir, f"decay_class_{symbol}.pkl"))
+        if model is None:
             return None
-        model = joblib.load(model_path)
         importance = model.feature_importance(importance_type='gain')
         features = ['tte', 'moneyness', 'vol_oi_ratio', 'underlying_vol', 'Close']
         return dict(zip(features, [round(float(v), 2) for v in importance]))
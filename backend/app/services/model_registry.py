@@ -0,0 +1,83 @@
+import glob
+import os
+import threading
+from collections import OrderedDict
+
+import joblib
+
+class ModelRegistry:
+    """
+    In-process LRU of unpickled models keyed by path.
+
+    Each entry remembers the file's (mtime, size) when it was loaded; a later
+    get() that sees a different stamp reloads the file, so retrained models
+    are picked up without restarting long-running processes.
+    """
+
+    def __init__(self, max_size=16):
+        self.max_size = max_size
+        self._models = OrderedDict()  # abspath -> (stamp, model)
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'loads': 0, 'reloads': 0, 'evictions': 0}
+
+    @staticmethod
+    def _stamp(path):
+        info = os.stat(path)
+        return info.st_mtime_ns, info.st_size
+
+    def get(self, path):
+        """Loaded model at path, or None if the file does not exist"""
+        path = os.path.abspath(path)
+        try:
+            stamp = self._stamp(path)
+        except FileNotFoundError:
+            self.invalidate(path)
+            return None
+
+        with self._lock:
+            entry = self._models.get(path)
+            if entry is not None and entry[0] == stamp:
+                self._models.move_to_end(path)
+                self.stats['hits'] += 1
+                return entry[1]
+
+            model = joblib.load(path)
+            self.stats['reloads' if entry is not None else 'loads'] += 1
+            self._models[path] = (stamp, model)
+            self._models.move_to_end(path)
+            while len(self._models) > self.max_size:
+                self._models.popitem(last=False)
+                self.stats['evictions'] += 1
+            return model
+
+    def invalidate(self, path=None):
+        """Drop one cached model (or all of them)"""
+        with self._lock:
+            if path is None:
+                self._models.clear()
+            else:
+                self._models.pop(os.path.abspath(path), None)
+
+    def warm_up(self, paths):
+        """Preload models; returns the number of files loaded"""
+        loaded = 0
+        for path in paths:
+            try:
+                if self.get(path) is not None:
+                    loaded += 1
+            except Exception as e:
+                print(f"Could not preload model {path}: {e}")
+        return loaded
+
+    def warm_up_dir(self, model_dir, pattern='*.pkl'):
+        return self.warm_up(sorted(glob.glob(os.path.join(model_dir, pattern))))
+
+    def get_stats(self):
+        with self._lock:
+            return {**self.stats, 'size': len(self._models)}
+
+# Shared by every service in the process
+_registry = ModelRegistry()
+
+def get_model_registry():
+    return _registry
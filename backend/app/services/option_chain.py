@@ -0,0 +1,129 @@
+import re
+
+import numpy as np
+
+# UNDERLYING [expiry] STRIKE CE|PE: SENSEX26JAN82000CE (monthly), NIFTY2610822000CE (weekly YYMDD)
+SYMBOL_PATTERN = re.compile(r'^(?P<underlying>[A-Z&]+?)(?P<expiry>\d{2}[A-Z]{3}|\d{2}[1-9OND]\d{2})?'
+                            r'(?P<strike>\d+(?:\.\d+)?)(?P<type>CE|PE)$')
+
+# Signal -> contract type it may trade (other signals are not restricted)
+SIGNAL_TYPES = {'BUY_CALL': 'CE', 'BUY_PUT': 'PE'}
+
+def parse_symbol(symbol):
+    """(underlying, expiry code, strike, 'CE'/'PE') of a contract symbol, or None"""
+    # Separators some feeds put in ("SENSEX 26JAN 82000 CE") are dropped
+    match = SYMBOL_PATTERN.match(re.sub(r'[^A-Z0-9.&]', '', str(symbol).upper()))
+    if not match:
+        return None
+    return match.group('underlying'), match.group('expiry') or '', float(match.group('strike')), match.group('type')
+
+class OptionChain:
+    """
+    Array-backed option chain.
+
+    Symbols are parsed once into expiry, strike and type columns. Lookups
+    by symbol or by (expiry, strike, type) are dict hits; premiums are kept
+    in a stable sort order, so a premium band is a binary search and
+    filter queries only test the contracts inside it. Contracts are the
+    feed's dicts (symbol, premium, spread_pct, oi_change_pct and an
+    optional expiry, which overrides the one in the symbol).
+    """
+
+    def __init__(self, contracts=()):
+        contracts = list(contracts)
+        n = len(contracts)
+        self.symbol = np.array([str(c.get('symbol', '')) for c in contracts], dtype=object)
+        self.premium = np.array([float(c.get('premium', 0.0)) for c in contracts], dtype=float)
+        self.spread_pct = np.array([float(c.get('spread_pct', 1.0)) for c in contracts], dtype=float)
+        self.oi_change_pct = np.array([float(c.get('oi_change_pct', 0.0)) for c in contracts], dtype=float)
+        self.expiry = np.full(n, '', dtype=object)
+        self.strike = np.full(n, np.nan)
+        self.option_type = np.full(n, 'UNKNOWN', dtype=object)
+        for i, (contract, symbol) in enumerate(zip(contracts, self.symbol)):
+            parsed = parse_symbol(symbol)
+            if parsed:
+                _, code, self.strike[i], self.option_type[i] = parsed
+                self.expiry[i] = code
+            if contract.get('expiry'):
+                self.expiry[i] = str(contract['expiry'])
+
+        # First occurrence wins, as in a scan of the list
+        self._by_symbol = {}
+        self._by_key = {}
+        for i in range(n - 1, -1, -1):
+            self._by_symbol[self.symbol[i]] = i
+            if self.option_type[i] != 'UNKNOWN':
+                self._by_key[(self.expiry[i], self.strike[i], self.option_type[i])] = i
+        self._order = np.argsort(self.premium, kind='stable')
+        self._sorted_premium = self.premium[self._order]
+
+    def __len__(self):
+        return len(self.symbol)
+
+    @property
+    def expiries(self):
+        return sorted(set(self.expiry.tolist()))
+
+    def _contract(self, i):
+        return {'symbol': self.symbol[i], 'premium': float(self.premium[i]), 'type': self.option_type[i]}
+
+    def row(self, symbol):
+        """Row of a symbol, or None"""
+        return self._by_symbol.get(symbol)
+
+    def get(self, symbol):
+        i = self.row(symbol)
+        return None if i is None else self._contract(i)
+
+    def premium_of(self, symbol):
+        i = self.row(symbol)
+        return None if i is None else float(self.premium[i])
+
+    def lookup(self, strike, option_type, expiry=None):
+        """Contract at (expiry, strike, type); expiry may be left out on a single-expiry chain"""
+        if expiry is None:
+            expiries = self.expiries
+            if len(expiries) > 1:
+                raise ValueError(f"Chain has {len(expiries)} expiries; pass one of {expiries}")
+            expiry = expiries[0] if expiries else ''
+        i = self._by_key.get((expiry, float(strike), option_type))
+        return None if i is None else self._contract(i)
+
+    def premium_band(self, premium_min=-np.inf, premium_max=np.inf):
+        """Rows with premium_min <= premium <= premium_max, cheapest first"""
+        lo = np.searchsorted(self._sorted_premium, premium_min, side='left')
+        hi = np.searchsorted(self._sorted_premium, premium_max, side='right')
+        return self._order[lo:hi]
+
+    def moneyness(self, spot, rows=None):
+        """(spot - strike) / spot for calls, (strike - spot) / spot for puts: > 0 in the money"""
+        rows = slice(None) if rows is None else rows
+        types = self.option_type[rows]
+        sign = np.where(types == 'CE', 1.0, np.where(types == 'PE', -1.0, np.nan))
+        return sign * (spot - self.strike[rows]) / spot
+
+    def query(self, premium_min=-np.inf, premium_max=np.inf, max_spread_pct=np.inf, min_oi_change_pct=-np.inf,
+              option_type=None, expiry=None, spot=None, moneyness=None):
+        """
+        Rows passing every given filter, cheapest first. moneyness is a
+        (low, high) range of moneyness(spot), e.g. (-0.01, 0.0) for strikes
+        up to 1% out of the money.
+        """
+        rows = self.premium_band(premium_min, premium_max)
+        mask = (self.spread_pct[rows] <= max_spread_pct) & (self.oi_change_pct[rows] >= min_oi_change_pct)
+        if option_type is not None:
+            mask &= self.option_type[rows] == option_type
+        if expiry is not None:
+            mask &= self.expiry[rows] == expiry
+        if moneyness is not None:
+            if spot is None:
+                raise ValueError("moneyness filter needs the spot price")
+            m = self.moneyness(spot, rows)
+            mask &= (m >= moneyness[0]) & (m <= moneyness[1])
+        return rows[mask]
+
+    def select(self, signal_action, premium_min, premium_max, max_spread_pct, oi_change_pct, **filters):
+        """Cheapest contract that passes the filters for the signal, or None"""
+        rows = self.query(premium_min, premium_max, max_spread_pct, oi_change_pct,
+                          option_type=SIGNAL_TYPES.get(signal_action), **filters)
+        return self._contract(rows[0]) if len(rows) else None
@@ -0,0 +1,224 @@
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .signal_outcomes import level_hits
+from .technical_analysis import DEFAULT_PLAN_PARAMS, TechnicalAnalyzer, plan_from_inputs
+
+# Thresholds swept by grid search (weights stay at their defaults)
+SWEEP_GRID = {
+    'trend_confidence': [55, 60, 65, 70, 75],
+    'adx_strong': [22, 25, 28, 30],
+    'adx_weak': [15, 18, 20],
+    'atr_pct_volatile': [1.5, 2.0, 2.5],
+    'rsi_gate': [45, 50, 55],
+    'sl_tighten_ratio': [1.0, 1.5, 2.0],
+}
+
+# Random search also varies the confidence weights; (low, high) tuples are sampled uniformly
+SWEEP_SPACE = {
+    **SWEEP_GRID,
+    'trend_confidence': (50, 80),
+    'atr_pct_volatile': (1.0, 3.0),
+    'sl_tighten_ratio': (1.0, 2.5),
+    'weight_trend': [20, 25, 30, 35, 40],
+    'weight_adx': [15, 20, 25, 30, 35],
+    'weight_rsi': [15, 20, 25, 30, 35],
+    'weight_volume': [10, 15, 20, 25, 30],
+}
+
+# OHLCV rows of the shared block, plus bar times (epoch seconds)
+SHARED_ROWS = ('Open', 'High', 'Low', 'Close', 'Volume', 'time')
+
+def _valid(params):
+    return params.get('adx_weak', DEFAULT_PLAN_PARAMS['adx_weak']) <= params.get('adx_strong', DEFAULT_PLAN_PARAMS['adx_strong'])
+
+def grid_configs(grid=None):
+    """Every combination of the grid values"""
+    grid = grid or SWEEP_GRID
+    keys = list(grid)
+    configs = (dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys)))
+    return [config for config in configs if _valid(config)]
+
+def random_configs(n, space=None, seed=0):
+    """n configurations drawn from space (lists: choice, (low, high): uniform)"""
+    space = space or SWEEP_SPACE
+    rng = random.Random(seed)
+    configs = []
+    while len(configs) < n:
+        config = {}
+        for key, values in space.items():
+            if isinstance(values, tuple):
+                config[key] = round(rng.uniform(*values), 2)
+            else:
+                config[key] = rng.choice(values)
+        if _valid(config):
+            configs.append(config)
+    return configs
+
+class SymbolHistory:
+    """Plan inputs and forward bar windows of one symbol; independent of the plan params"""
+
+    def __init__(self, frame, times, horizon):
+        self.inputs = TechnicalAnalyzer(frame).plan_inputs()
+        self.times = times
+        n = len(frame)
+        high = frame['High'].to_numpy(dtype=float)
+        low = frame['Low'].to_numpy(dtype=float)
+        close = frame['Close'].to_numpy(dtype=float)
+        idx = np.arange(n)[:, None] + np.arange(1, horizon + 1)
+        in_range = idx < n
+        idx = np.minimum(idx, n - 1)
+        self.highs = np.where(in_range, high[idx], np.nan)
+        self.lows = np.where(in_range, low[idx], np.nan)
+        self.exit_close = np.where(np.arange(n) + horizon < n, close[np.minimum(np.arange(n) + horizon, n - 1)], np.nan)
+
+    def trade_returns(self, params):
+        """(times, % returns) of every LONG/SHORT plan with a full forward window"""
+        plan = plan_from_inputs(self.inputs, params)
+        long_ = plan['decision'] == 'LONG'
+        stop, target = plan['stop_loss'], plan['target_1']
+        rows = np.flatnonzero((long_ | (plan['decision'] == 'SHORT')) & ~np.isnan(self.exit_close)
+                              & ~np.isnan(stop) & ~np.isnan(target))
+        if not len(rows):
+            return self.times[:0], np.empty(0), np.empty(0, dtype=object)
+        price = self.inputs['price'][rows]
+        stop, target = stop[rows], target[rows]
+        is_long = long_[rows]
+        direction = np.where(is_long, 1.0, -1.0)
+        _, stop_day, target_first = level_hits(is_long, self.highs[rows], self.lows[rows], target, stop)
+        # Neither level hit: exit at the horizon close
+        exit_price = np.select([target_first, np.isfinite(stop_day)], [target, stop], default=self.exit_close[rows])
+        outcome = np.select([target_first, np.isfinite(stop_day)], ['target', 'stop'], default='expired')
+        return self.times[rows], direction * (exit_price - price) / price * 100, outcome
+
+def evaluate_config(histories, params):
+    """Hit rate, expectancy (% per trade) and max drawdown (% points) of one config across symbols"""
+    times, returns, outcomes = [], [], []
+    for history in histories:
+        t, r, o = history.trade_returns(params)
+        times.append(t)
+        returns.append(r)
+        outcomes.append(o)
+    times = np.concatenate(times)
+    returns = np.concatenate(returns)
+    outcomes = np.concatenate(outcomes)
+    result = {**params, 'trades': int(len(returns))}
+    if not len(returns):
+        return {**result, 'hit_rate': np.nan, 'expectancy': np.nan, 'total_return': 0.0,
+                'max_drawdown': 0.0, 'target_rate': np.nan, 'stop_rate': np.nan}
+    equity = np.cumsum(returns[np.argsort(times, kind='stable')])
+    drawdown = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:] - equity
+    return {
+        **result,
+        'hit_rate': round(float((returns > 0).mean()), 4),
+        'expectancy': round(float(returns.mean()), 4),
+        'total_return': round(float(returns.sum()), 2),
+        'max_drawdown': round(float(drawdown.max()), 2),
+        'target_rate': round(float((outcomes == 'target').mean()), 4),
+        'stop_rate': round(float((outcomes == 'stop').mean()), 4),
+    }
+
+def rank_results(results, min_trades=20):
+    """
+    Rank configurations by hit rate, expectancy and drawdown (sum of the
+    three ranks, lowest first); configs with fewer than min_trades go last.
+    """
+    frame = pd.DataFrame(results)
+    enough = frame['trades'] >= min_trades
+    score = (frame['hit_rate'].rank(ascending=False) + frame['expectancy'].rank(ascending=False)
+             + frame['max_drawdown'].rank(ascending=True))
+    frame['rank_score'] = score.where(enough, np.inf)
+    return frame.sort_values(['rank_score', 'expectancy'], ascending=[True, False]).reset_index(drop=True)
+
+# --- worker side: histories rebuilt once per process from shared memory ---
+_worker_histories = None
+_worker_blocks = []
+
+def _attach(name):
+    try:
+        # The parent owns (and unlinks) the block
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: pool workers report to the parent's resource tracker, which unlinks once
+        return shared_memory.SharedMemory(name=name)
+
+def _frame_from_block(array):
+    frame = pd.DataFrame({column: array[i] for i, column in enumerate(SHARED_ROWS[:-1])})
+    return frame, array[-1]
+
+def _init_worker(specs, horizon):
+    global _worker_histories
+    _worker_histories = []
+    for name, n in specs:
+        block = _attach(name)
+        _worker_blocks.append(block)
+        array = np.ndarray((len(SHARED_ROWS), n), dtype=np.float64, buffer=block.buf)
+        frame, times = _frame_from_block(array)
+        _worker_histories.append(SymbolHistory(frame, times, horizon))
+
+def _evaluate_chunk(configs):
+    return [evaluate_config(_worker_histories, params) for params in configs]
+
+class ParamSweep:
+    """
+    Evaluates plan-param configurations over daily OHLCV history.
+
+    For every bar where the plan says LONG or SHORT, the trade is followed
+    for `horizon` bars: target_1 first = win at the target, stop first (or on
+    the same bar) = loss at the stop, neither = exit at the horizon close.
+    Indicators are computed once per symbol and process; only the plan rules
+    are re-run per configuration. With workers > 1 the OHLCV arrays go into
+    one shared-memory block per symbol that every worker maps instead of
+    receiving a pickled copy.
+    """
+
+    def __init__(self, data_by_symbol, horizon=5, workers=None):
+        self.data = {symbol: frame for symbol, frame in data_by_symbol.items() if frame is not None and not frame.empty}
+        self.horizon = horizon
+        self.workers = workers or os.cpu_count() or 1
+
+    @staticmethod
+    def _to_array(frame):
+        if isinstance(frame.index, pd.DatetimeIndex):
+            times = frame.index.to_numpy(dtype='datetime64[ns]').astype(np.int64) / 1e9
+        else:
+            times = np.arange(len(frame))
+        columns = [frame[column].to_numpy(dtype=np.float64) if column in frame else np.zeros(len(frame))
+                   for column in SHARED_ROWS[:-1]]
+        return np.vstack(columns + [np.asarray(times, dtype=np.float64)])
+
+    def run(self, configs, min_trades=20):
+        """Ranked DataFrame: one row per config with its params and metrics"""
+        if not configs:
+            return pd.DataFrame()
+        if self.workers <= 1 or len(configs) < 2 * self.workers:
+            histories = [SymbolHistory(*_frame_from_block(self._to_array(frame)), self.horizon)
+                         for frame in self.data.values()]
+            return rank_results([evaluate_config(histories, params) for params in configs], min_trades)
+
+        blocks = []
+        try:
+            specs = []
+            for frame in self.data.values():
+                array = self._to_array(frame)
+                block = shared_memory.SharedMemory(create=True, size=array.nbytes)
+                blocks.append(block)
+                np.ndarray(array.shape, dtype=np.float64, buffer=block.buf)[:] = array
+                specs.append((block.name, array.shape[1]))
+            # Small chunks keep all workers busy until the end
+            chunk_size = max(1, len(configs) // (self.workers * 8))
+            chunks = [configs[i:i + chunk_size] for i in range(0, len(configs), chunk_size)]
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(specs, self.horizon)) as pool:
+                results = [row for chunk in pool.map(_evaluate_chunk, chunks) for row in chunk]
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+        return rank_results(results, min_trades)
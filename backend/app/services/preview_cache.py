@@ -0,0 +1,237 @@
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from ..config import env_flag
+
+DEFAULT_PREVIEW_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'preview_cache')
+
+# Rasterisation zoom per preview size (1.0 = 72 dpi)
+PREVIEW_ZOOM = {
+    'full': 2.0,
+    'thumb': 0.3,
+}
+
+def _fitz():
+    """PyMuPDF, imported on first render (optional dependency)"""
+    try:
+        import fitz
+    except ImportError:
+        return None
+    return fitz
+
+def previews_available():
+    return _fitz() is not None
+
+# MuPDF is not thread-safe: in-process use (page counts, prerender) is serialised
+_fitz_lock = threading.Lock()
+
+def _render_png(pdf_path, page, zoom):
+    """Rasterise one 1-based page to PNG bytes (runs in a render worker process)"""
+    fitz = _fitz()
+    with fitz.open(pdf_path) as doc:
+        return doc.load_page(page - 1).get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False).tobytes("png")
+
+class PreviewCache:
+    """
+    PNG renders of report pages, keyed by (PDF content hash, page, size).
+
+    Lookups go memory LRU -> disk -> render. Misses are rendered on a small
+    process pool (MuPDF is not thread-safe); concurrent requests for the same
+    page share one render.
+    The disk cache is trimmed to max_disk_bytes, oldest files first.
+    prerender() fills the cache for every page right after a PDF is built.
+    """
+
+    def __init__(self, cache_dir=None, max_memory_items=64, max_disk_bytes=200 * 1024 * 1024, workers=2):
+        self.cache_dir = cache_dir or os.environ.get('PREVIEW_CACHE_DIR', DEFAULT_PREVIEW_DIR)
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # (digest, page, size) -> png bytes
+        self._inflight = {}           # (digest, page, size) -> Future
+        self._digests = {}            # (path, mtime_ns, size) -> digest
+        self._page_counts = {}        # digest -> pages
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'renders': 0}
+
+    def digest(self, pdf_path):
+        """Content hash of a PDF, memoised by (path, mtime, size)"""
+        info = os.stat(pdf_path)
+        stamp = (os.path.abspath(pdf_path), info.st_mtime_ns, info.st_size)
+        with self._lock:
+            if stamp in self._digests:
+                return self._digests[stamp]
+        digest = hashlib.sha256()
+        with open(pdf_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        with self._lock:
+            self._digests[stamp] = digest.hexdigest()[:32]
+            return self._digests[stamp]
+
+    def page_count(self, pdf_path):
+        digest = self.digest(pdf_path)
+        with self._lock:
+            if digest in self._page_counts:
+                return self._page_counts[digest]
+        with _fitz_lock, _fitz().open(pdf_path) as doc:
+            count = len(doc)
+        with self._lock:
+            self._page_counts[digest] = count
+        return count
+
+    def _disk_path(self, key):
+        digest, page, size = key
+        return os.path.join(self.cache_dir, f"{digest}_p{page}_{size}.png")
+
+    def _remember(self, key, png):
+        with self._lock:
+            self._memory[key] = png
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    def get(self, pdf_path, page, size='full'):
+        """
+        PNG bytes and ETag for a 1-based page. Raises FileNotFoundError,
+        ValueError (bad page/size) or RuntimeError (PyMuPDF missing).
+        """
+        if size not in PREVIEW_ZOOM:
+            raise ValueError(f"Unknown preview size: {size}")
+        key = (self.digest(pdf_path), page, size)
+        etag = f"{key[0]}-{page}-{size}"
+
+        with self._lock:
+            png = self._memory.get(key)
+            if png is not None:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return png, etag
+
+        disk_path = self._disk_path(key)
+        if os.path.exists(disk_path):
+            with open(disk_path, 'rb') as f:
+                png = f.read()
+            os.utime(disk_path)  # keeps recently served pages out of the trim
+            self._remember(key, png)
+            with self._lock:
+                self.stats['disk_hits'] += 1
+            return png, etag
+
+        if _fitz() is None:
+            raise RuntimeError("PyMuPDF is not installed")
+        if page < 1 or page > self.page_count(pdf_path):
+            raise ValueError('Invalid page index')
+
+        pool = self._pool()
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = pool.submit(_render_png, pdf_path, page, PREVIEW_ZOOM[size])
+        try:
+            png = future.result()
+        finally:
+            if leader:
+                with self._lock:
+                    self._inflight.pop(key, None)
+        if leader:
+            self._store(key, png)
+            self._trim_disk()
+        return png, etag
+
+    def _pool(self):
+        # spawn: the API process runs threads, which fork would copy mid-flight
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def _store(self, key, png):
+        self._write(key, png)
+        self._remember(key, png)
+        with self._lock:
+            self.stats['renders'] += 1
+
+    def _write(self, key, png):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(png)
+        os.replace(tmp_path, path)
+
+    def prerender(self, pdf_path, sizes=('full', 'thumb')):
+        """Render every page of a freshly built PDF; returns the number of PNGs written"""
+        fitz = _fitz()
+        if fitz is None:
+            return 0
+        digest = self.digest(pdf_path)
+        written = 0
+        with _fitz_lock, fitz.open(pdf_path) as doc:
+            with self._lock:
+                self._page_counts[digest] = len(doc)
+            for page in range(1, len(doc) + 1):
+                for size in sizes:
+                    key = (digest, page, size)
+                    if os.path.exists(self._disk_path(key)):
+                        continue
+                    zoom = PREVIEW_ZOOM[size]
+                    pixmap = doc.load_page(page - 1).get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                    # Disk only: the process building reports is rarely the one serving them
+                    self._write(key, pixmap.tobytes("png"))
+                    written += 1
+        self._trim_disk()
+        return written
+
+    def _trim_disk(self):
+        try:
+            entries = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith('.png')]
+        except FileNotFoundError:
+            return
+        files = []
+        for path in entries:
+            try:
+                info = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((info.st_mtime, info.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+
+    def get_stats(self):
+        with self._lock:
+            return {**self.stats, 'memory_items': len(self._memory)}
+
+_preview_cache = None
+_preview_lock = threading.Lock()
+
+def get_preview_cache():
+    global _preview_cache
+    with _preview_lock:
+        if _preview_cache is None:
+            _preview_cache = PreviewCache()
+        return _preview_cache
+
+def prerender_previews(pdf_path):
+    """Called after a PDF is built; PDF_PREVIEWS=0 or a missing PyMuPDF skips it"""
+    if not env_flag('PDF_PREVIEWS', default=True) or not previews_available():
+        return 0
+    try:
+        return get_preview_cache().prerender(pdf_path)
+    except Exception as e:
+        print(f"Could not pre-render previews for {os.path.basename(pdf_path)}: {e}")
+        return 0
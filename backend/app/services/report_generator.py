@@ -9,9 +9,16 @@ import os
 from datetime import datetime
 from app.services.signal_tracker import SignalTracker
 from app.services.ai_provider import OpenAIProvider
+from app.services.artifact_cache import artifact_key, file_digest
+from app.services.preview_cache import prerender_previews
 
 class ReportGenerator:
-    def __init__(self):
+    # Bump when the PDF layout changes so cached reports are not reused
+    CACHE_VERSION = 1
+
+    def __init__(self, artifact_cache=None):
+        """artifact_cache: ArtifactCache to reuse PDFs built from an identical payload"""
+        self.artifact_cache = artifact_cache
         self.primary_color = colors.Color(0.1, 0.2, 0.4) # Dark Navy
         self.secondary_color = colors.Color(0.2, 0.6, 0.8) # Light Blue
         self.accent_color = colors.Color(0.9, 0.3, 0.1) # Orange Red
@@ -103,7 +110,24 @@ class ReportGenerator:
             filename = f"report_{symbol}_{timestamp}.pdf"
         filepath = os.path.join(reports_dir, filename)
         
-        doc = SimpleDocTemplate(filepath, pagesize=A4, rightMargin=50, leftMargin=50, topMargin=50, bottomMargin=50)
+        cache_key = None
+        if self.artifact_cache is not None:
+            cache_key = self._cache_key(report_data, is_weekly)
+            if self.artifact_cache.materialize(cache_key, filepath) is not None:
+                kind = 'weekly_report' if is_weekly else 'report'
+                self.artifact_cache.record_latest(cache_key, kind, symbol)
+                plan = report_data.get('action_plan', {})
+                signal_tracker.log_signal(symbol, plan.get('decision', 'N/A'),
+                                          report_data.get('indicators', {}).get('current_price', 'N/A'),
+                                          report_data.get('date'), stop_loss=plan.get('stop_loss'),
+                                          target=plan.get('target_1'))
+                print(f"Reused cached report for {symbol}")
+                prerender_previews(filepath)
+                return filepath
+        
+        # Build next to the target and rename, so a hard-linked cached copy is never overwritten
+        build_path = f"{filepath}.{os.getpid()}.tmp"
+        doc = SimpleDocTemplate(build_path, pagesize=A4, rightMargin=50, leftMargin=50, topMargin=50, bottomMargin=50)
         
         # Define Frame and Template
         frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='normal')
@@ -267,8 +291,11 @@ class ReportGenerator:
 
         # --- AI COMMENTARY ---
         try:
-            ai = OpenAIProvider()
-            ai_text = ai.explain_report(report_data)
+            # Prefer commentary fetched ahead of rendering (see generate_reports.prepare_report)
+            if 'ai_commentary' in report_data:
+                ai_text = report_data['ai_commentary']
+            else:
+                ai_text = OpenAIProvider().explain_report(report_data)
             if ai_text:
                 story.append(Paragraph("AI Analyst Commentary", self.styles['SectionHeader']))
                 story.append(Paragraph(ai_text, self.styles['Normal']))
@@ -293,7 +320,21 @@ class ReportGenerator:
         story.append(Paragraph("Disclaimer: This report is for educational purposes only. Trading involves risk.", self.styles['DashLabel']))
         
         # Log
-        signal_tracker.log_signal(symbol, decision, indicators.get('current_price', 'N/A'), report_data.get('date'))
+        signal_tracker.log_signal(symbol, decision, indicators.get('current_price', 'N/A'), report_data.get('date'),
+                                  stop_loss=ap.get('stop_loss'), target=ap.get('target_1'))
         
         doc.build(story)
+        os.replace(build_path, filepath)
+        if cache_key is not None:
+            inputs = {'date': report_data.get('date'), 'decision': decision, 'is_weekly': is_weekly}
+            self.artifact_cache.store(cache_key, filepath, 'weekly_report' if is_weekly else 'report', symbol, inputs)
+        # Page PNGs for /reports/preview, so the first view is already cached
+        prerender_previews(filepath)
         return filepath
+
+    def _cache_key(self, report_data, is_weekly):
+        """Hash of everything the PDF shows: the payload plus the chart image bytes"""
+        payload = {k: v for k, v in report_data.items() if k != 'chart_path'}
+        chart_path = report_data.get('chart_path')
+        chart = file_digest(chart_path) if chart_path and os.path.exists(chart_path) else None
+        return artifact_key('report', self.CACHE_VERSION, is_weekly, payload, chart)
@@ -0,0 +1,91 @@
+import os
+from datetime import datetime
+
+from .artifact_cache import default_artifact_cache
+from .chart_generator import ChartGenerator
+from .data_fetcher import MarketDataFetcher
+from .report_generator import ReportGenerator
+from .technical_analysis import TechnicalAnalyzer
+
+# (stage, progress) reported while a report job runs
+STAGES = [
+    ('fetching', 0.1),
+    ('analyzing', 0.3),
+    ('charting', 0.5),
+    ('rendering', 0.7),
+    ('done', 1.0),
+]
+
+def _no_progress(stage, progress):
+    pass
+
+def build_report(symbol='BANKNIFTY', period='3mo', report_date=None, progress=None):
+    """
+    Fetch, analyse, chart and render one on-demand report.
+
+    progress(stage, fraction) is called as each stage starts. Returns a
+    JSON-serialisable dict with the PDF/chart paths and the report data.
+    """
+    progress = progress or _no_progress
+    stages = dict(STAGES)
+    if report_date:
+        report_datetime = datetime.strptime(report_date, '%Y-%m-%d')
+    else:
+        report_datetime = datetime.now()
+
+    progress('fetching', stages['fetching'])
+    market_data = MarketDataFetcher().fetch_data(symbol, period)
+
+    progress('analyzing', stages['analyzing'])
+    analyzer = TechnicalAnalyzer(market_data)
+    indicators = analyzer.calculate_all_indicators()
+    indicator_frame = analyzer.indicator_frame()
+    support_resistance = analyzer.get_support_resistance()
+    timeframe = {
+        'data_period': '3 months daily data' if period == '3mo' else period,
+        'analysis_type': 'Swing/Positional (1-5 days)',
+        'chart_interval': '1 Day'
+    }
+
+    progress('charting', stages['charting'])
+    artifact_cache = default_artifact_cache()
+    with ChartGenerator(artifact_cache) as chart_generator:
+        chart_path = chart_generator.generate_chart(
+            symbol, market_data, indicators, support_resistance, frame=indicator_frame)
+
+    report_data = {
+        'symbol': symbol,
+        'date': report_datetime.strftime('%Y-%m-%d %H:%M:%S'),
+        'indicators': indicators,
+        'trend': analyzer.get_trend(),
+        'signals': analyzer.get_signal(),
+        'support_resistance': support_resistance,
+        'patterns': analyzer.get_candlestick_patterns(),
+        'chart_path': chart_path,
+        'trade_bias': analyzer.get_trade_bias(),
+        'risk_context': analyzer.get_risk_context(),
+        'timeframe': timeframe,
+        'market_regime': analyzer.get_market_regime(),
+        'position_sizing': analyzer.get_position_sizing(),
+        'overall_signal': analyzer.get_overall_signal(),
+        'action_plan': analyzer.generate_actionable_plan()
+    }
+
+    progress('rendering', stages['rendering'])
+    pdf_path = ReportGenerator(artifact_cache).generate_pdf(report_data)
+
+    return {
+        'report_path': pdf_path,
+        'report_filename': os.path.basename(pdf_path),
+        'chart_path': chart_path,
+        'data': report_data,
+    }
+
+def run_report_job(params, progress=None):
+    """Job queue entry point: params is the POST /reports/generate body"""
+    return build_report(
+        symbol=params.get('symbol', 'BANKNIFTY'),
+        period=params.get('period', '3mo'),
+        report_date=params.get('report_date'),
+        progress=progress,
+    )
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timezone
+
+# Seconds a market data response stays fresh, by bar interval: intraday bars
+# change every few minutes, daily bars only once the session closes
+INTERVAL_TTL = {
+    '1m': 30,
+    '5m': 60,
+    '15m': 120,
+    '30m': 300,
+    '1h': 300,
+    '60m': 300,
+    '1d': 900,
+    '1wk': 3600,
+    '1mo': 3600,
+}
+
+def ttl_for_interval(interval):
+    return INTERVAL_TTL.get(interval, INTERVAL_TTL['1d'])
+
+class ResponseCache:
+    """
+    In-memory TTL cache for JSON API payloads with request coalescing.
+
+    get(key, compute, ttl) returns an entry dict: body, etag, last_modified,
+    expires. While one caller computes a key, concurrent callers for the same
+    key wait for that result instead of computing it again (singleflight).
+    last_modified only moves when the payload actually changes, so clients
+    revalidating with If-None-Match / If-Modified-Since get 304s across
+    refreshes. Errors are not cached.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> entry
+        self._inflight = {}            # key -> Future
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'errors': 0}
+
+    @staticmethod
+    def _etag(body):
+        return hashlib.sha1(json.dumps(body, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, key, compute, ttl):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['expires'] > now:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats['coalesced'] += 1
+                leader = False
+            else:
+                future = self._inflight[key] = Future()
+                self.stats['misses'] += 1
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            body = compute()
+            etag = self._etag(body)
+            now = time.time()
+            last_modified = now
+            if entry is not None and entry['etag'] == etag:
+                last_modified = entry['last_modified']
+            entry = {'body': body, 'etag': etag, 'last_modified': last_modified, 'expires': now + ttl}
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            future.set_result(entry)
+            return entry
+        except Exception as e:
+            with self._lock:
+                self.stats['errors'] += 1
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def get_stats(self):
+        with self._lock:
+            served = self.stats['hits'] + self.stats['misses'] + self.stats['coalesced']
+            return {
+                **self.stats,
+                'entries': len(self._entries),
+                # Requests answered without a fetch of their own
+                'hit_rate': round((self.stats['hits'] + self.stats['coalesced']) / served, 4) if served else 0.0,
+            }
+
+def http_date(timestamp):
+    return datetime.fromtimestamp(int(timestamp), tz=timezone.utc)
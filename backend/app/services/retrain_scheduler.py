@@ -0,0 +1,70 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+class RetrainScheduler:
+    """
+    Runs model training jobs on a background worker so predictions never wait
+    for a download + fit. Requests for a model that is already queued or
+    training are coalesced.
+    """
+
+    def __init__(self, max_workers=1):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='retrain')
+        self._lock = threading.Lock()
+        self._pending = {}  # key -> Future
+        self.history = []   # finished jobs: {'key', 'reason', 'ok', 'seconds', 'error'}
+
+    def request(self, key, train, reason=''):
+        """
+        Queue train() for key unless it is already pending.
+        Returns True if a new job was queued.
+        """
+        with self._lock:
+            if key in self._pending:
+                return False
+            print(f"Scheduling retrain of {key}: {reason}")
+            self._pending[key] = self._executor.submit(self._run, key, train, reason)
+            return True
+
+    def _run(self, key, train, reason):
+        started = time.perf_counter()
+        ok, error = False, None
+        try:
+            ok = bool(train())
+        except Exception as e:
+            error = str(e)
+            print(f"Retrain of {key} failed: {e}")
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+                self.history.append({
+                    'key': key,
+                    'reason': reason,
+                    'ok': ok,
+                    'seconds': round(time.perf_counter() - started, 2),
+                    'error': error,
+                })
+        return ok
+
+    def pending(self):
+        with self._lock:
+            return list(self._pending)
+
+    def wait(self, timeout=None):
+        """Block until the queued jobs finish (scripts call this before exiting)"""
+        with self._lock:
+            futures = list(self._pending.values())
+        done, not_done = wait(futures, timeout=timeout)
+        return not not_done
+
+# Shared by every LightGBMService in the process
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_retrain_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RetrainScheduler()
+        return _scheduler
@@ -129,6 +129,13 @@ class MarketSentimentEngine:
             else:
                 factors.append(f"PCR Neutral ({inputs.pcr_total:.2f})")
 
+        # ATM implied volatility (premiums, not direction)
+        if inputs.atm_iv_change_pct is not None:
+            if inputs.atm_iv_change_pct > 10.0:
+                risks.append(f"ATM IV jumped (+{inputs.atm_iv_change_pct:.1f}%) - option premiums expensive")
+            elif inputs.atm_iv_change_pct < -10.0:
+                factors.append(f"ATM IV easing ({inputs.atm_iv_change_pct:.1f}%)")
+
         # --- Synthesis ---
         # Weighted Final Score: Global (40%) + Domestic (30%) + Options (30%)
         # But handle missing data weights
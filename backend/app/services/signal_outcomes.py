@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+
+# Forward horizons (trading days) evaluated for every signal
+HORIZONS = (1, 3, 5)
+
+DIRECTION = {'LONG': 1, 'SHORT': -1}
+
+def _daily_bars(prices):
+    """Daily OHLC with a tz-naive, normalised, unique DatetimeIndex"""
+    bars = prices[['High', 'Low', 'Close']].astype(float)
+    index = bars.index
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    bars.index = index.normalize()
+    return bars[~bars.index.duplicated(keep='last')].sort_index()
+
+def first_hit(hits):
+    """1-based index of the first True per row, inf where there is none"""
+    any_hit = hits.any(axis=1)
+    return np.where(any_hit, hits.argmax(axis=1) + 1, np.inf)
+
+def level_hits(is_long, highs, lows, target, stop):
+    """
+    (target_day, stop_day, target_first) for (signals, days) windows of
+    highs and lows: the 1-based day each level is first reached (inf if
+    never). A stop on the same day as the target counts as a stop (the
+    order within a bar is unknown), so target_first needs a strictly
+    earlier target.
+    """
+    with np.errstate(invalid='ignore'):
+        long_ = np.asarray(is_long, dtype=bool)[:, None]
+        target_hits = np.where(long_, highs >= target[:, None], lows <= target[:, None])
+        stop_hits = np.where(long_, lows <= stop[:, None], highs >= stop[:, None])
+    target_day = first_hit(target_hits)
+    stop_day = first_hit(stop_hits)
+    return target_day, stop_day, target_day < stop_day
+
+def evaluate_symbol(signals, prices, horizons=HORIZONS):
+    """
+    Outcomes for one symbol's signals against its daily bars.
+
+    Each signal is matched to the last bar on or before its date (as-of
+    merge); forward returns, directional hits and target/stop hits over the
+    longest horizon are computed for all signals at once. `matured` is True
+    once every horizon has a bar.
+    """
+    bars = _daily_bars(prices)
+    out = signals.copy()
+    if bars.empty:
+        out['matured'] = False
+        return out
+
+    left = pd.DataFrame({'signal_ts': pd.to_datetime(out['date']).values, 'row': np.arange(len(out))})
+    left = left.sort_values('signal_ts')
+    right = pd.DataFrame({'bar_date': bars.index, 'bar_pos': np.arange(len(bars))})
+    merged = pd.merge_asof(left, right, left_on='signal_ts', right_on='bar_date', direction='backward')
+    merged = merged.sort_values('row')
+
+    n = len(bars)
+    close = bars['Close'].to_numpy()
+    high = bars['High'].to_numpy()
+    low = bars['Low'].to_numpy()
+    pos = merged['bar_pos'].to_numpy(dtype=float)
+    known = ~np.isnan(pos)
+    pos = np.where(known, pos, 0).astype(int)
+
+    entry = pd.to_numeric(out['entry_price'], errors='coerce').to_numpy(dtype=float)
+    entry = np.where(np.isnan(entry) & known, close[pos], entry)
+    direction = out['decision'].map(DIRECTION).fillna(0).to_numpy()
+    directional = direction != 0
+
+    out['entry_bar'] = np.where(known, merged['bar_date'].dt.strftime('%Y-%m-%d').to_numpy(), None)
+    for h in horizons:
+        idx = pos + h
+        available = known & (idx < n)
+        forward = np.where(available, close[np.minimum(idx, n - 1)], np.nan)
+        ret = forward / entry - 1
+        out[f'return_{h}d'] = np.round(ret * 100, 4)
+        out[f'hit_{h}d'] = np.where(directional & available, direction * ret > 0, None)
+
+    # Target / stop over the longest horizon: (signals, days) windows of highs and lows
+    window = max(horizons)
+    idx = pos[:, None] + np.arange(1, window + 1)
+    in_range = known[:, None] & (idx < n)
+    idx = np.minimum(idx, n - 1)
+    highs = np.where(in_range, high[idx], np.nan)
+    lows = np.where(in_range, low[idx], np.nan)
+
+    target = pd.to_numeric(out.get('target', pd.Series(np.nan, index=out.index)), errors='coerce').to_numpy(dtype=float)
+    stop = pd.to_numeric(out.get('stop_loss', pd.Series(np.nan, index=out.index)), errors='coerce').to_numpy(dtype=float)
+    target_day, stop_day, target_first = level_hits(direction == 1, highs, lows, target, stop)
+
+    matured = known & (pos + window < n)
+    has_levels = directional & ~np.isnan(target) & ~np.isnan(stop)
+    outcome = np.select(
+        [target_first, np.isfinite(stop_day), matured],
+        ['target', 'stop', 'expired'],
+        default='open',
+    ).astype(object)
+    out['outcome'] = np.where(has_levels, outcome, None)
+    out['days_to_outcome'] = np.where(has_levels, np.minimum(target_day, stop_day), np.inf)
+    out['days_to_outcome'] = out['days_to_outcome'].where(np.isfinite(out['days_to_outcome']))
+    out['matured'] = matured
+    return out
+
+def evaluate_signals(signals, price_history, horizons=HORIZONS):
+    """
+    Outcomes for every signal. price_history maps symbol -> daily OHLC
+    DataFrame; signals for symbols without prices come back unmatured.
+    """
+    if signals.empty:
+        return signals.assign(matured=pd.Series(dtype=bool))
+    frames = []
+    for symbol, group in signals.groupby('symbol', sort=False):
+        prices = price_history.get(symbol)
+        if prices is None:
+            frames.append(group.assign(matured=False))
+        else:
+            frames.append(evaluate_symbol(group, prices, horizons))
+    return pd.concat(frames).loc[signals.index]
+
+def summarize_outcomes(outcomes, horizons=HORIZONS):
+    """Directional hit rates, mean directional returns and target/stop rates of matured signals"""
+    if outcomes.empty or 'matured' not in outcomes:
+        return {'signals': 0}
+    matured = outcomes[outcomes['matured'].astype(bool)]
+    trades = matured[matured['decision'].isin(list(DIRECTION))]
+    summary = {'signals': int(len(outcomes)), 'matured': int(len(matured)), 'trades': int(len(trades))}
+    if trades.empty:
+        return summary
+    direction = trades['decision'].map(DIRECTION).to_numpy()
+    for h in horizons:
+        summary[f'hit_rate_{h}d'] = round(float(trades[f'hit_{h}d'].astype(float).mean()), 4)
+        summary[f'avg_return_{h}d'] = round(float(np.nanmean(direction * trades[f'return_{h}d'].astype(float))), 4)
+    with_levels = trades[trades['outcome'].notna()]
+    if not with_levels.empty:
+        counts = with_levels['outcome'].value_counts(normalize=True)
+        summary['target_rate'] = round(float(counts.get('target', 0.0)), 4)
+        summary['stop_rate'] = round(float(counts.get('stop', 0.0)), 4)
+    summary['by_decision'] = {
+        decision: {
+            'count': int(len(group)),
+            **{f'hit_rate_{h}d': round(float(group[f'hit_{h}d'].astype(float).mean()), 4) for h in horizons},
+        }
+        for decision, group in trades.groupby('decision')
+    }
+    return summary
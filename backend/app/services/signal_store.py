@@ -0,0 +1,218 @@
+import importlib.util
+import json
+import os
+import re
+
+from .file_lock import FileLock
+
+COLUMNS = ['symbol', 'date', 'decision', 'entry_price', 'stop_loss', 'target', 'logged_at', 'signal_id']
+PRICE_COLUMNS = ['entry_price', 'stop_loss', 'target']
+
+def signal_id(record):
+    return f"{record.get('symbol')}|{record.get('date')}|{record.get('logged_at')}"
+
+def _partition_stem(symbol):
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', str(symbol))
+
+class SignalStore:
+    """
+    Signal log: a JSONL write-ahead log compacted into parquet partitions.
+
+    append() adds one line to signals_log.json under a file lock, so
+    concurrent report workers never interleave writes. compact() moves the
+    log into store/<symbol>/<YYYY-MM>.parquet (sorted by date, deduplicated
+    by signal id) and empties it; it runs once the log passes
+    compact_bytes. store/index.json keeps rows, date range and decisions per
+    partition, so query() only opens partitions that can match and reads
+    them with parquet filters. Without pyarrow everything stays in the log.
+    """
+
+    def __init__(self, signals_dir=None, compact_bytes=None):
+        self.signals_dir = signals_dir or os.path.join(os.getcwd(), 'signals')
+        os.makedirs(self.signals_dir, exist_ok=True)
+        self.wal_file = os.path.join(self.signals_dir, "signals_log.json")
+        self.store_dir = os.path.join(self.signals_dir, "store")
+        self.index_file = os.path.join(self.store_dir, "index.json")
+        self.lock_path = f"{self.wal_file}.lock"
+        if compact_bytes is None:
+            compact_bytes = int(os.environ.get('SIGNAL_WAL_MAX_BYTES', 256 * 1024))
+        self.compact_bytes = compact_bytes
+
+    @property
+    def columnar(self):
+        # pyarrow (parquet engine) is looked up, not imported: cleanup runs stay light
+        return importlib.util.find_spec('pyarrow') is not None
+
+    def append(self, record):
+        record = {**record, 'signal_id': signal_id(record)}
+        with FileLock(self.lock_path):
+            with open(self.wal_file, 'a') as f:
+                f.write(json.dumps(record, default=str) + '\n')
+        self.compact_if_needed()
+
+    def wal_size(self):
+        try:
+            return os.path.getsize(self.wal_file)
+        except FileNotFoundError:
+            return 0
+
+    def compact_if_needed(self):
+        if self.columnar and self.wal_size() >= self.compact_bytes:
+            return self.compact()
+        return 0
+
+    def _read_wal(self):
+        records = []
+        if not os.path.exists(self.wal_file):
+            return records
+        with open(self.wal_file) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Skipping malformed line in {os.path.basename(self.wal_file)}")
+                    continue
+                record.setdefault('signal_id', signal_id(record))
+                records.append(record)
+        return records
+
+    @staticmethod
+    def _frame(records):
+        import pandas as pd
+        frame = pd.DataFrame(records, columns=COLUMNS)
+        frame['date'] = pd.to_datetime(frame['date'], errors='coerce', format='mixed')
+        for column in PRICE_COLUMNS:
+            frame[column] = pd.to_numeric(frame[column], errors='coerce')
+        for column in ('symbol', 'decision', 'logged_at', 'signal_id'):
+            frame[column] = frame[column].astype(object).where(frame[column].notna(), None)
+        return frame[frame['date'].notna()]
+
+    def _load_index(self):
+        try:
+            with open(self.index_file) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {'partitions': {}}
+
+    def _write_json(self, path, payload):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def _partition_path(self, name):
+        return os.path.join(self.store_dir, f"{name}.parquet")
+
+    def compact(self):
+        """Fold the write-ahead log into the parquet partitions; returns rows moved"""
+        if not self.columnar:
+            return 0
+        import pandas as pd
+
+        with FileLock(self.lock_path, timeout=120.0):
+            frame = self._frame(self._read_wal())
+            if frame.empty:
+                open(self.wal_file, 'w').close()
+                return 0
+            index = self._load_index()
+            months = frame['date'].dt.strftime('%Y-%m')
+            for (symbol, month), rows in frame.groupby([frame['symbol'], months]):
+                name = f"{_partition_stem(symbol)}/{month}"
+                path = self._partition_path(name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if os.path.exists(path):
+                    rows = pd.concat([pd.read_parquet(path), rows], ignore_index=True)
+                # A crash between writing partitions and emptying the log replays it; ids keep that idempotent
+                rows = rows.drop_duplicates('signal_id').sort_values(['date', 'logged_at'], kind='stable')
+                rows = rows.reset_index(drop=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                rows.to_parquet(tmp_path, index=False)
+                os.replace(tmp_path, path)
+                index['partitions'][name] = {
+                    'symbol': symbol,
+                    'month': month,
+                    'rows': int(len(rows)),
+                    'start': rows['date'].iloc[0].isoformat(),
+                    'end': rows['date'].iloc[-1].isoformat(),
+                    'decisions': sorted(rows['decision'].dropna().unique().tolist()),
+                }
+            self._write_json(self.index_file, index)
+            open(self.wal_file, 'w').close()
+        print(f"Compacted {len(frame)} signals into {frame.groupby([frame['symbol'], months]).ngroups} partition(s)")
+        return int(len(frame))
+
+    def _matching_partitions(self, symbols, start, end, decisions):
+        import pandas as pd
+        matches = []
+        for name, meta in sorted(self._load_index()['partitions'].items()):
+            if symbols is not None and meta['symbol'] not in symbols:
+                continue
+            if start is not None and pd.Timestamp(meta['end']) < start:
+                continue
+            if end is not None and pd.Timestamp(meta['start']) > end:
+                continue
+            if decisions is not None and not decisions.intersection(meta['decisions']):
+                continue
+            matches.append(name)
+        return matches
+
+    def query(self, symbol=None, start=None, end=None, decision=None, columns=None):
+        """
+        Signals matching every given filter, sorted by date. symbol and
+        decision accept one value or a list; start/end are inclusive.
+        """
+        import pandas as pd
+
+        symbols = None if symbol is None else set([symbol] if isinstance(symbol, str) else symbol)
+        decisions = None if decision is None else set([decision] if isinstance(decision, str) else decision)
+        start = None if start is None else pd.Timestamp(start)
+        end = None if end is None else pd.Timestamp(end)
+
+        filters = []
+        if symbols is not None:
+            filters.append(('symbol', 'in', sorted(symbols)))
+        if decisions is not None:
+            filters.append(('decision', 'in', sorted(decisions)))
+        if start is not None:
+            filters.append(('date', '>=', start))
+        if end is not None:
+            filters.append(('date', '<=', end))
+
+        frames = []
+        if self.columnar:
+            for name in self._matching_partitions(symbols, start, end, decisions):
+                frames.append(pd.read_parquet(self._partition_path(name), filters=filters or None))
+
+        # Rows not compacted yet
+        with FileLock(self.lock_path):
+            pending = self._frame(self._read_wal())
+        if not pending.empty:
+            mask = pd.Series(True, index=pending.index)
+            if symbols is not None:
+                mask &= pending['symbol'].isin(symbols)
+            if decisions is not None:
+                mask &= pending['decision'].isin(decisions)
+            if start is not None:
+                mask &= pending['date'] >= start
+            if end is not None:
+                mask &= pending['date'] <= end
+            frames.append(pending[mask])
+
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            result = self._frame([])
+        else:
+            result = pd.concat(frames, ignore_index=True).drop_duplicates('signal_id')
+            result = result.sort_values(['date', 'logged_at'], kind='stable').reset_index(drop=True)
+        return result[columns] if columns else result
+
+    def get_stats(self):
+        partitions = self._load_index()['partitions']
+        return {
+            'partitions': len(partitions),
+            'compacted_rows': sum(meta['rows'] for meta in partitions.values()),
+            'wal_bytes': self.wal_size(),
+        }
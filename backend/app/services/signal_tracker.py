@@ -1,30 +1,123 @@
 import json
 from datetime import datetime
 import os
+from app.services.file_lock import FileLock
+from app.services.signal_store import SignalStore
+
+# Lookback periods the fetcher accepts, with their length in calendar days
+HISTORY_PERIODS = [('1mo', 30), ('3mo', 90), ('6mo', 180), ('1y', 365), ('2y', 730), ('5y', 1825)]
+
+def _json_value(value):
+    # numpy scalars (bools, floats) from the outcome frame
+    return value.item() if hasattr(value, 'item') else str(value)
 
 class SignalTracker:
-    def __init__(self):
+    def __init__(self, signals_dir=None):
         # Ensure the directory for signals_log.json exists
-        self.signals_dir = os.path.join(os.getcwd(), 'signals')
+        self.signals_dir = signals_dir or os.path.join(os.getcwd(), 'signals')
         os.makedirs(self.signals_dir, exist_ok=True)
-        self.signals_file = os.path.join(self.signals_dir, "signals_log.json")
+        self.store = SignalStore(self.signals_dir)
+        self.signals_file = self.store.wal_file
+        # Matured outcomes, one JSON line per signal; never re-evaluated
+        self.outcomes_file = os.path.join(self.signals_dir, "signal_outcomes.json")
     
-    def log_signal(self, symbol, decision, price, date):
+    def log_signal(self, symbol, decision, price, date, stop_loss=None, target=None):
         """Log today's signal for future accuracy check"""
         signal = {
             'symbol': symbol,
             'date': date,
             'decision': decision,
             'entry_price': price,
+            'stop_loss': stop_loss,
+            'target': target,
             'logged_at': datetime.now().isoformat()
         }
         
-        # Append to log file
-        with open(self.signals_file, 'a') as f:
-            f.write(json.dumps(signal) + '\n')
-    
-    def check_outcome(self, signal_date):
-        """Check if signal was correct after 1-3 days"""
-        # Compare entry price vs price 1-3 days later
-        # Mark as profitable/loss
-        pass
+        self.store.append(signal)
+    
+    @staticmethod
+    def _read_lines(path):
+        records = []
+        if not os.path.exists(path):
+            return records
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    print(f"Skipping malformed line in {os.path.basename(path)}")
+        return records
+    
+    def load_signals(self, **filters):
+        """Signals as a DataFrame; filters (symbol, start, end, decision) go to SignalStore.query"""
+        return self.store.query(**filters)
+    
+    def load_outcomes(self):
+        import pandas as pd
+        outcomes = pd.DataFrame(self._read_lines(self.outcomes_file))
+        if outcomes.empty:
+            return outcomes
+        # Two overlapping runs may both have stored a signal
+        return outcomes.drop_duplicates('signal_id').reset_index(drop=True)
+    
+    def _history_period(self, earliest):
+        days = (datetime.now() - earliest.to_pydatetime()).days + 15  # headroom for the forward bars
+        for period, period_days in HISTORY_PERIODS:
+            if period_days >= days:
+                return period
+        return 'max'
+    
+    def _price_history(self, signals, fetcher):
+        """Daily bars per symbol (bar cache backed), one fetch per symbol"""
+        history = {}
+        for symbol, group in signals.groupby('symbol'):
+            data = fetcher.fetch_data(symbol, period=self._history_period(group['date'].min()), interval='1d')
+            if data is not None and not data.empty:
+                history[symbol] = data
+        return history
+    
+    def check_outcome(self, signal_date=None, fetcher=None):
+        """
+        Evaluate signal outcomes: forward 1/3/5-day returns, directional hits
+        and whether target or stop was reached first.
+        
+        Only signals without a stored outcome are evaluated; those that have
+        matured are appended to signal_outcomes.json. Returns the outcomes of
+        all signals (or those dated signal_date) as a DataFrame.
+        """
+        import pandas as pd
+        from app.services.signal_outcomes import evaluate_signals
+        
+        signals = self.load_signals()
+        stored = self.load_outcomes()
+        done = set(stored['signal_id']) if not stored.empty else set()
+        pending = signals[~signals['signal_id'].isin(done)]
+        
+        evaluated = pending.iloc[0:0]
+        if not pending.empty:
+            if fetcher is None:
+                from app.services.data_fetcher import MarketDataFetcher
+                fetcher = MarketDataFetcher()
+            evaluated = evaluate_signals(pending, self._price_history(pending, fetcher))
+            matured = evaluated[evaluated['matured']]
+            if not matured.empty:
+                self._append_outcomes(matured)
+            print(f"Evaluated {len(pending)} pending signals, {len(matured)} newly matured")
+        
+        if not stored.empty:
+            stored['date'] = pd.to_datetime(stored['date'])
+        outcomes = pd.concat([stored, evaluated], ignore_index=True) if not stored.empty else evaluated.reset_index(drop=True)
+        if signal_date is not None and not outcomes.empty:
+            outcomes = outcomes[outcomes['date'].dt.normalize() == pd.Timestamp(signal_date).normalize()]
+        return outcomes
+    
+    def _append_outcomes(self, outcomes):
+        records = outcomes.assign(date=outcomes['date'].dt.strftime('%Y-%m-%d %H:%M:%S'))
+        records = records.astype(object).where(records.notna(), None).to_dict('records')
+        with FileLock(f"{self.outcomes_file}.lock"):
+            with open(self.outcomes_file, 'a') as f:
+                for record in records:
+                    f.write(json.dumps(record, default=_json_value) + '\n')
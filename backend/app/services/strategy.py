@@ -3,10 +3,18 @@ import pandas as pd
 from .technical_analysis import TechnicalAnalyzer
 
 class TradingStrategy:
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, data: pd.DataFrame, indicators: dict = None):
+        """
+        indicators: precomputed calculate_all_indicators()-style dict (e.g. from
+        IncrementalIndicators.snapshot()); skips building a TechnicalAnalyzer.
+        """
         self.data = data
-        self.ta = TechnicalAnalyzer(data)
-        self.indicators = self.ta.calculate_all_indicators()
+        if indicators is None:
+            self.ta = TechnicalAnalyzer(data)
+            self.indicators = self.ta.calculate_all_indicators()
+        else:
+            self.ta = None
+            self.indicators = indicators
 
     def get_signal(self):
         """
@@ -17,7 +25,7 @@ class TradingStrategy:
                 "confidence": "HIGH" | "MEDIUM" | "LOW"
             }
         """
-        if self.data.empty:
+        if self.data is not None and self.data.empty:
             return {"action": "WAIT", "reason": "No data", "confidence": "LOW"}
 
         # Extract latest indicators
@@ -2,19 +2,137 @@ import talib
 import numpy as np
 import pandas as pd
 
+# Keys of calculate_all_indicators(), in order, with their rounding precision
+INDICATOR_PRECISION = {
+    'current_price': 2, 'high': 2, 'low': 2, 'open': 2,
+    'rsi': 2,
+    'macd': 2, 'macd_signal': 2, 'macd_histogram': 2,
+    'macd_log': 6, 'macd_log_signal': 6, 'macd_log_histogram': 6,
+    'macd_pct': 4, 'macd_pct_signal': 4, 'macd_pct_histogram': 4,
+    'bb_upper': 2, 'bb_middle': 2, 'bb_lower': 2,
+    'ema_20': 2, 'ema_50': 2, 'ema_200': 2,
+    'atr': 2, 'adx': 2,
+    'stoch_k': 2, 'stoch_d': 2,
+}
+
+# Thresholds and confidence weights of the actionable plan (see scripts/param_sweep.py)
+DEFAULT_PLAN_PARAMS = {
+    'trend_confidence': 65,   # min confidence for LONG/SHORT in a trending regime
+    'range_confidence': 50,   # min confidence for RANGE TRADE
+    'adx_strong': 25,         # ADX above: trending regime, full ADX points
+    'adx_weak': 20,           # ADX below: range-bound regime, minimal ADX points
+    'atr_pct_volatile': 2.0,  # ATR % of price at or above: volatile trend
+    'rsi_gate': 50,           # LONG needs RSI >= gate, SHORT RSI <= gate
+    'sl_tighten_ratio': 1.5,  # stop wider than target 1 is pulled to target distance / ratio
+    'weight_trend': 30,
+    'weight_adx': 25,
+    'weight_rsi': 25,
+    'weight_volume': 20,
+}
+
+# Share of each confidence weight given for partial credit
+TREND_NEUTRAL_CREDIT = 1 / 3
+ADX_MODERATE_CREDIT = 0.6
+WEAK_CREDIT = 0.2
+PARTIAL_CREDIT = 0.4
+VOLUME_NORMAL_CREDIT = 0.5
+
+def _points(weight, credit=1.0):
+    """Confidence points for a factor; whole numbers stay ints"""
+    value = round(weight * credit, 2)
+    return int(value) if float(value).is_integer() else value
+
 class TechnicalAnalyzer:
-    def __init__(self, data):
+    def __init__(self, data, plan_params=None):
         """
         data: pandas DataFrame with columns: Open, High, Low, Close, Volume
+        plan_params: overrides of DEFAULT_PLAN_PARAMS
         """
+        self.plan_params = {**DEFAULT_PLAN_PARAMS, **(plan_params or {})}
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        self.set_data(data)
+
+    def set_data(self, data):
+        """Swap in new OHLCV data and drop every memoized indicator"""
         self.data = data
         self.close = data['Close'].values
         self.high = data['High'].values
         self.low = data['Low'].values
         self.open = data['Open'].values
         self.volume = data['Volume'].values if 'Volume' in data.columns else None
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        """Forget memoized indicators (call after mutating self.data in place)"""
+        self._cache = {}
+
+    def get_cache_stats(self):
+        """Indicator cache hits/misses since this analyzer was created"""
+        return dict(self.cache_stats)
+
+    def _cached(self, key, compute):
+        """Compute an indicator once per data set and share it across accessors"""
+        if key in self._cache:
+            self.cache_stats['hits'] += 1
+            return self._cache[key]
+        self.cache_stats['misses'] += 1
+        value = compute()
+        self._cache[key] = value
+        return value
+
+    def _rsi(self):
+        return self._cached('rsi', lambda: talib.RSI(self.close, timeperiod=14))
+
+    def _ema(self, period):
+        return self._cached(f'ema_{period}', lambda: talib.EMA(self.close, timeperiod=period))
+
+    def _atr(self):
+        return self._cached('atr', lambda: talib.ATR(self.high, self.low, self.close, timeperiod=14))
+
+    def _adx(self):
+        return self._cached('adx', lambda: talib.ADX(self.high, self.low, self.close, timeperiod=14))
+
+    def _bbands(self):
+        return self._cached('bbands', lambda: talib.BBANDS(self.close, timeperiod=20, nbdevup=2, nbdevdn=2))
+
+    def _stoch(self):
+        return self._cached('stoch', lambda: talib.STOCH(
+            self.high, self.low, self.close,
+            fastk_period=14, slowk_period=3, slowd_period=3
+        ))
+
+    def _talib_macd(self):
+        """TA-Lib MACD (SMA-seeded), used by the signal text"""
+        return self._cached('talib_macd', lambda: talib.MACD(self.close, 12, 26, 9))
+
+    def _macd_variants(self):
+        """Absolute, log-price and percent MACD built on pandas EWM (TradingView style)"""
+        def compute():
+            close_series = pd.Series(self.close)
+            ema12 = close_series.ewm(span=12, adjust=False).mean()
+            ema26 = close_series.ewm(span=26, adjust=False).mean()
+            macd_line = ema12 - ema26
+            signal_line = macd_line.ewm(span=9, adjust=False).mean()
+            log_close = pd.Series(np.log(self.close))
+            macd_log = log_close.ewm(span=12, adjust=False).mean() - log_close.ewm(span=26, adjust=False).mean()
+            signal_log = macd_log.ewm(span=9, adjust=False).mean()
+            macd_pct = (ema12 - ema26) / ema26 * 100
+            signal_pct = macd_pct.ewm(span=9, adjust=False).mean()
+            return {
+                'macd': macd_line,
+                'macd_signal': signal_line,
+                'macd_histogram': macd_line - signal_line,
+                'macd_log': macd_log,
+                'macd_log_signal': signal_log,
+                'macd_log_histogram': macd_log - signal_log,
+                'macd_pct': macd_pct,
+                'macd_pct_signal': signal_pct,
+                'macd_pct_histogram': macd_pct - signal_pct,
+            }
+        return self._cached('macd_variants', compute)
     
-    def _safe_float(self, value, precision=2):
+    @staticmethod
+    def _safe_float(value, precision=2):
         """Safely convert numpy/talib values to float, handling NaN"""
         if isinstance(value, (float, np.floating)) and (np.isnan(value) or np.isinf(value)):
             return None
@@ -23,83 +141,55 @@ class TechnicalAnalyzer:
         except (ValueError, TypeError):
             return None
 
+    def indicator_frame(self):
+        """
+        Every indicator over the full history as one DataFrame aligned to self.data.index.
+        Columns are the calculate_all_indicators() keys (unrounded) plus the TA-Lib
+        MACD ('talib_macd', 'talib_macd_signal', 'talib_macd_histogram') used by
+        the chart and the ML features.
+        """
+        return self._cached('frame', self._build_indicator_frame).copy()
+
+    def _build_indicator_frame(self):
+        macd = self._macd_variants()
+        bb_upper, bb_middle, bb_lower = self._bbands()
+        talib_macd, talib_signal, talib_hist = self._talib_macd()
+        slowk, slowd = self._stoch()
+        columns = {
+            'current_price': self.close,
+            'high': self.high,
+            'low': self.low,
+            'open': self.open,
+            'rsi': self._rsi(),
+        }
+        for key, series in macd.items():
+            columns[key] = series.values
+        columns.update({
+            'bb_upper': bb_upper,
+            'bb_middle': bb_middle,
+            'bb_lower': bb_lower,
+            'ema_20': self._ema(20),
+            'ema_50': self._ema(50),
+            'ema_200': self._ema(200),
+            'atr': self._atr(),
+            'adx': self._adx(),
+            'stoch_k': slowk,
+            'stoch_d': slowd,
+            'talib_macd': talib_macd,
+            'talib_macd_signal': talib_signal,
+            'talib_macd_histogram': talib_hist,
+        })
+        frame = pd.DataFrame(columns, index=self.data.index)
+        return frame.astype(float)
+
     def calculate_all_indicators(self):
-        """Calculate all major technical indicators"""
-        indicators = {}
-        
-        # Current Price Info
-        indicators['current_price'] = self._safe_float(self.close[-1])
-        indicators['high'] = self._safe_float(self.high[-1])
-        indicators['low'] = self._safe_float(self.low[-1])
-        indicators['open'] = self._safe_float(self.open[-1])
-        
-        # RSI (Relative Strength Index)
-        rsi = talib.RSI(self.close, timeperiod=14)
-        indicators['rsi'] = self._safe_float(rsi[-1])
-        
-        # MACD
-        close_series = pd.Series(self.close)
-        ema12 = close_series.ewm(span=12, adjust=False).mean()
-        ema26 = close_series.ewm(span=26, adjust=False).mean()
-        macd_line = ema12 - ema26
-        signal_line = macd_line.ewm(span=9, adjust=False).mean()
-        hist_line = macd_line - signal_line
-        indicators['macd'] = self._safe_float(macd_line.iloc[-1], 2)
-        indicators['macd_signal'] = self._safe_float(signal_line.iloc[-1], 2)
-        indicators['macd_histogram'] = self._safe_float(hist_line.iloc[-1], 2)
-        macd_log_series = pd.Series(np.log(self.close)).ewm(span=12, adjust=False).mean() - pd.Series(np.log(self.close)).ewm(span=26, adjust=False).mean()
-        signal_log_series = macd_log_series.ewm(span=9, adjust=False).mean()
-        hist_log_series = macd_log_series - signal_log_series
-        indicators['macd_log'] = self._safe_float(macd_log_series.iloc[-1], 6)
-        indicators['macd_log_signal'] = self._safe_float(signal_log_series.iloc[-1], 6)
-        indicators['macd_log_histogram'] = self._safe_float(hist_log_series.iloc[-1], 6)
-        macd_pct_series = (ema12 - ema26) / ema26 * 100
-        signal_pct_series = macd_pct_series.ewm(span=9, adjust=False).mean()
-        hist_pct_series = macd_pct_series - signal_pct_series
-        indicators['macd_pct'] = self._safe_float(macd_pct_series.iloc[-1], 4)
-        indicators['macd_pct_signal'] = self._safe_float(signal_pct_series.iloc[-1], 4)
-        indicators['macd_pct_histogram'] = self._safe_float(hist_pct_series.iloc[-1], 4)
-        
-        # Bollinger Bands
-        bb_upper, bb_middle, bb_lower = talib.BBANDS(
-            self.close, 
-            timeperiod=20, 
-            nbdevup=2, 
-            nbdevdn=2
-        )
-        indicators['bb_upper'] = self._safe_float(bb_upper[-1])
-        indicators['bb_middle'] = self._safe_float(bb_middle[-1])
-        indicators['bb_lower'] = self._safe_float(bb_lower[-1])
-        
-        # EMAs
-        ema_20 = talib.EMA(self.close, timeperiod=20)
-        ema_50 = talib.EMA(self.close, timeperiod=50)
-        ema_200 = talib.EMA(self.close, timeperiod=200)
-        indicators['ema_20'] = self._safe_float(ema_20[-1])
-        indicators['ema_50'] = self._safe_float(ema_50[-1])
-        indicators['ema_200'] = self._safe_float(ema_200[-1])
-        
-        # ATR (Average True Range)
-        atr = talib.ATR(self.high, self.low, self.close, timeperiod=14)
-        indicators['atr'] = self._safe_float(atr[-1])
-        
-        # ADX (Trend Strength)
-        adx = talib.ADX(self.high, self.low, self.close, timeperiod=14)
-        indicators['adx'] = self._safe_float(adx[-1])
-        
-        # Stochastic
-        slowk, slowd = talib.STOCH(
-            self.high, 
-            self.low, 
-            self.close,
-            fastk_period=14,
-            slowk_period=3,
-            slowd_period=3
-        )
-        indicators['stoch_k'] = self._safe_float(slowk[-1])
-        indicators['stoch_d'] = self._safe_float(slowd[-1])
-        
-        return indicators
+        """Calculate all major technical indicators (latest bar of indicator_frame)"""
+        return dict(self._cached('indicators', self._build_indicators))
+
+    def _build_indicators(self):
+        frame = self._cached('frame', self._build_indicator_frame)
+        last = frame.iloc[-1]
+        return {key: self._safe_float(last[key], precision) for key, precision in INDICATOR_PRECISION.items()}
     
     def get_trend(self):
         """Tighter trend classification using EMA alignment"""
@@ -121,9 +211,9 @@ class TechnicalAnalyzer:
     
     def get_signal(self):
         """Generate trading signals based on indicators"""
-        rsi = talib.RSI(self.close, timeperiod=14)[-1]
-        macd, macd_signal, _ = talib.MACD(self.close, 12, 26, 9)
-        adx = talib.ADX(self.high, self.low, self.close, timeperiod=14)[-1]
+        rsi = self._rsi()[-1]
+        macd, macd_signal, _ = self._talib_macd()
+        adx = self._adx()[-1]
         
         signals = []
         
@@ -194,6 +284,10 @@ class TechnicalAnalyzer:
         }
 
     def calculate_pivot_points(self):
+        pivots = self._cached('pivots', self._build_pivot_points)
+        return dict(pivots) if pivots else None
+
+    def _build_pivot_points(self):
         if len(self.close) < 2:
             return None
         idx = -2 if len(self.close) >= 2 else -1
@@ -221,6 +315,10 @@ class TechnicalAnalyzer:
 
     def calculate_cpr_levels(self):
         """Central Pivot Range (CPR) using previous day OHLC (popular in India)"""
+        cpr = self._cached('cpr', self._build_cpr_levels)
+        return dict(cpr) if cpr else None
+
+    def _build_cpr_levels(self):
         if len(self.close) < 2:
             return None
         idx = -2 if len(self.close) >= 2 else -1
@@ -242,82 +340,88 @@ class TechnicalAnalyzer:
         """
         Compute a confidence score (0-100) based on weighted factors.
         
-        Weights:
+        Weights (plan_params, defaults):
         - Trend Alignment: 30
         - Trend Strength (ADX): 25
         - Momentum (RSI): 25
         - Volume Support: 20
         """
+        p = self.plan_params
         score = 0
         details = []
         
         # 1. Trend Alignment (30 pts)
         if trend in ["Bullish", "Bearish"]:
-            score += 30
-            details.append("Trend Aligned (+30)")
+            pts = _points(p['weight_trend'])
+            details.append(f"Trend Aligned (+{pts})")
         else:
-            score += 10 # Partial credit for stability
-            details.append("Trend Neutral (+10)")
+            pts = _points(p['weight_trend'], TREND_NEUTRAL_CREDIT) # Partial credit for stability
+            details.append(f"Trend Neutral (+{pts})")
+        score += pts
             
         # 2. Trend Strength (ADX) (25 pts)
         if adx is None:
-            score += 5
-            details.append("ADX unavailable (+5)")
+            pts = _points(p['weight_adx'], WEAK_CREDIT)
+            details.append(f"ADX unavailable (+{pts})")
         else:
-            if adx > 25:
-                score += 25
-                details.append(f"Strong ADX {adx:.1f} (+25)")
-            elif adx > 20:
-                score += 15
-                details.append(f"Moderate ADX {adx:.1f} (+15)")
+            if adx > p['adx_strong']:
+                pts = _points(p['weight_adx'])
+                details.append(f"Strong ADX {adx:.1f} (+{pts})")
+            elif adx > p['adx_weak']:
+                pts = _points(p['weight_adx'], ADX_MODERATE_CREDIT)
+                details.append(f"Moderate ADX {adx:.1f} (+{pts})")
             else:
-                score += 5
-                details.append(f"Weak ADX {adx:.1f} (+5)")
+                pts = _points(p['weight_adx'], WEAK_CREDIT)
+                details.append(f"Weak ADX {adx:.1f} (+{pts})")
+        score += pts
             
         # 3. Momentum (RSI) (25 pts)
+        full, partial, weak = (_points(p['weight_rsi']), _points(p['weight_rsi'], PARTIAL_CREDIT),
+                               _points(p['weight_rsi'], WEAK_CREDIT))
         # Bullish context
         if rsi is None:
-            score += 10
-            details.append("RSI unavailable (+10)")
+            score += partial
+            details.append(f"RSI unavailable (+{partial})")
         else:
             if trend == "Bullish":
                 if 40 <= rsi <= 70: 
-                    score += 25
-                    details.append("RSI Bullish Zone (+25)")
+                    score += full
+                    details.append(f"RSI Bullish Zone (+{full})")
                 elif rsi > 70:
-                    score += 10
-                    details.append("RSI Overbought (+10)")
+                    score += partial
+                    details.append(f"RSI Overbought (+{partial})")
                 else:
-                    score += 5
-                    details.append("RSI Weak (+5)")
+                    score += weak
+                    details.append(f"RSI Weak (+{weak})")
             # Bearish context
             elif trend == "Bearish":
                 if 30 <= rsi <= 60:
-                    score += 25
-                    details.append("RSI Bearish Zone (+25)")
+                    score += full
+                    details.append(f"RSI Bearish Zone (+{full})")
                 elif rsi < 30:
-                    score += 10
-                    details.append("RSI Oversold (+10)")
+                    score += partial
+                    details.append(f"RSI Oversold (+{partial})")
                 else:
-                    score += 5
-                    details.append("RSI Weak (+5)")
+                    score += weak
+                    details.append(f"RSI Weak (+{weak})")
             # Neutral context
             else:
                 if 40 <= rsi <= 60:
-                    score += 25
-                    details.append("RSI Range Stable (+25)")
+                    score += full
+                    details.append(f"RSI Range Stable (+{full})")
                 else:
-                    score += 10
+                    score += partial
         
         # 4. Volume Support (20 pts)
         if vol_surge:
-            score += 20
-            details.append("Volume Surge (+20)")
+            pts = _points(p['weight_volume'])
+            details.append(f"Volume Surge (+{pts})")
         else:
-            score += 10
-            details.append("Volume Normal (+10)")
+            pts = _points(p['weight_volume'], VOLUME_NORMAL_CREDIT)
+            details.append(f"Volume Normal (+{pts})")
+        score += pts
             
-        return score, details
+        return round(score, 2), details
 
     def get_market_regime(self):
         indicators = self.calculate_all_indicators()
@@ -330,16 +434,17 @@ class TechnicalAnalyzer:
             return {'regime': 'Unknown', 'description': 'Insufficient data'}
             
         atr_pct = (atr / current_price) * 100
+        p = self.plan_params
         
         # Strict Regime Definitions
-        if adx > 25:
-            if atr_pct < 2.0:
+        if adx > p['adx_strong']:
+            if atr_pct < p['atr_pct_volatile']:
                 regime = "Strong Trend"
                 description = f"Clean {trend} movement"
             else:
                 regime = "Volatile Trend"
                 description = f"Choppy {trend} movement"
-        elif adx < 20:
+        elif adx < p['adx_weak']:
             regime = "Range-Bound"
             description = "Sideways / Consolidation"
         else:
@@ -488,6 +593,7 @@ class TechnicalAnalyzer:
             }
 
         # 2. Compute Confidence
+        p = self.plan_params
         confidence_score, confidence_details = self.calculate_confidence_score(
             trend, adx, rsi, vol_ctx['surge']
         )
@@ -501,8 +607,8 @@ class TechnicalAnalyzer:
         verdict = "Stay Flat"
         
         # Execution boundaries: Prefer CPR (TC/BC). Targets: standard pivots.
-        if self.calculate_cpr_levels():
-            cpr = self.calculate_cpr_levels()
+        cpr = self.calculate_cpr_levels()
+        if cpr:
             exec_pivot = cpr['pivot']
             exec_upper = cpr['tc']
             exec_lower = cpr['bc']
@@ -523,7 +629,7 @@ class TechnicalAnalyzer:
         if regime in ["Strong Trend", "Volatile Trend"]:
             # Trend Following
             if trend == "Bullish":
-                if confidence_score > 65:
+                if confidence_score > p['trend_confidence']:
                     decision = "LONG"
                     # Entry aligned to CPR boundaries
                     entry_condition = f"Breakout > {exec_upper:.0f} or Pullback to {exec_pivot:.0f}"
@@ -539,7 +645,7 @@ class TechnicalAnalyzer:
                     verdict = "WATCHLIST ONLY (Weak Confidence)"
                     
             elif trend == "Bearish":
-                if confidence_score > 65:
+                if confidence_score > p['trend_confidence']:
                     decision = "SHORT"
                     entry_condition = f"Breakdown < {exec_lower:.0f} or Pullback to {exec_pivot:.0f}"
                     stop_loss = round(exec_upper, 2)
@@ -555,7 +661,7 @@ class TechnicalAnalyzer:
                     
         elif regime == "Range-Bound":
             # Range Trading
-            if confidence_score > 50: # Lower threshold for range
+            if confidence_score > p['range_confidence']: # Lower threshold for range
                 decision = "RANGE TRADE"
                 entry_condition = f"Buy near {exec_lower:.0f} / Sell near {exec_upper:.0f}"
                 stop_loss = "Tight (0.5%)" 
@@ -592,24 +698,24 @@ class TechnicalAnalyzer:
         
         # 3.2 Momentum Gate: align RSI with direction near actionable zones
         if decision == "LONG" and rsi is not None:
-            if rsi < 50:
+            if rsi < p['rsi_gate']:
                 decision = "NO TRADE"
-                reason = f"RSI {rsi:.1f} < 50 → momentum not supportive for long"
+                reason = f"RSI {rsi:.1f} < {p['rsi_gate']} → momentum not supportive for long"
                 verdict = "STAY FLAT (Weak Momentum)"
                 target_1 = target_2 = stop_loss = None
                 invalidation = "N/A"
         if decision == "SHORT" and rsi is not None:
-            if rsi > 50:
+            if rsi > p['rsi_gate']:
                 decision = "NO TRADE"
-                reason = f"RSI {rsi:.1f} > 50 → momentum not supportive for short"
+                reason = f"RSI {rsi:.1f} > {p['rsi_gate']} → momentum not supportive for short"
                 verdict = "STAY FLAT (Weak Momentum)"
                 target_1 = target_2 = stop_loss = None
                 invalidation = "N/A"
 
         # 3.3 EMA slope gate: require slope alignment with direction
         if decision in ["LONG", "SHORT"]:
-            ema20_series = talib.EMA(self.close, timeperiod=20)
-            ema50_series = talib.EMA(self.close, timeperiod=50)
+            ema20_series = self._ema(20)
+            ema50_series = self._ema(50)
             ema20_slope = float(ema20_series[-1] - ema20_series[-2]) if not np.isnan(ema20_series[-1]) and not np.isnan(ema20_series[-2]) else 0.0
             ema50_slope = float(ema50_series[-1] - ema50_series[-2]) if not np.isnan(ema50_series[-1]) and not np.isnan(ema50_series[-2]) else 0.0
             if decision == "LONG" and (ema20_slope <= 0 or ema50_slope <= 0):
@@ -637,9 +743,9 @@ class TechnicalAnalyzer:
                  # Or simply downgrade to NO TRADE if no logical tight stop exists
                  # Here we will tighten SL to 1:1.5 implied
                  if decision == "LONG":
-                     stop_loss = round(current_price - (dist_target / 1.5), 2)
+                     stop_loss = round(current_price - (dist_target / p['sl_tighten_ratio']), 2)
                  else:
-                     stop_loss = round(current_price + (dist_target / 1.5), 2)
+                     stop_loss = round(current_price + (dist_target / p['sl_tighten_ratio']), 2)
                  invalidation = f"Tightened SL: {stop_loss}"
 
         rr = self._risk_reward(current_price, target_1, stop_loss) if target_1 and stop_loss else None
@@ -662,6 +768,72 @@ class TechnicalAnalyzer:
             'pivots': pivots
         }
 
+    def actionable_plan_series(self):
+        """
+        generate_actionable_plan() evaluated for every bar in one vectorized pass.
+        Row t is the plan the scalar method returns for data[:t+1]: decision,
+        regime, trend, confidence, stop_loss, target_1, target_2 and risk_reward.
+        Missing levels are NaN (including the non-numeric range-trade stop).
+        """
+        return self._cached('plan_series', self._build_plan_series).copy()
+
+    def _round_series(self, values, precision=2):
+        """_safe_float over an array (Python rounding so values match the scalar plan)"""
+        return np.array([self._safe_float(v, precision) for v in values], dtype=float)
+
+    def plan_inputs(self):
+        """
+        Per-bar inputs of the plan that do not depend on plan_params (rounded
+        indicators, trend, volume surge, execution levels), for plan_from_inputs().
+        """
+        return self._cached('plan_inputs', self._build_plan_inputs)
+
+    def _build_plan_inputs(self):
+        n = len(self.close)
+        price = self._round_series(self.close)
+        ema20_raw = self._ema(20)
+        ema50_raw = self._ema(50)
+        ema20 = self._round_series(ema20_raw)
+        ema50 = self._round_series(ema50_raw)
+
+        with np.errstate(invalid='ignore'):
+            # Volume surge (get_volume_context)
+            surge = np.zeros(n, dtype=bool)
+            if self.volume is not None and n >= 20:
+                volume = self.volume.astype(float)
+                avg_volume = np.lib.stride_tricks.sliding_window_view(volume, 20).mean(axis=1)
+                current = volume[19:]
+                surge[19:] = np.where(avg_volume > 0, current / np.where(avg_volume > 0, avg_volume, 1.0), 1.0) > 1.2
+
+            # Execution levels from the previous bar (CPR bounds, standard pivot targets)
+            prev_high = np.concatenate(([np.nan], self.high[:-1].astype(float)))
+            prev_low = np.concatenate(([np.nan], self.low[:-1].astype(float)))
+            prev_close = np.concatenate(([np.nan], self.close[:-1].astype(float)))
+            pivot = (prev_high + prev_low + prev_close) / 3
+            bc = (prev_high + prev_low) / 2.0
+
+        return {
+            'price': price,
+            'rsi': self._round_series(self._rsi()),
+            'adx': self._round_series(self._adx()),
+            'atr': self._round_series(self._atr()),
+            'ema20': ema20,
+            'ema50': ema50,
+            'ema20_slope': np.nan_to_num(np.diff(ema20_raw, prepend=np.nan), nan=0.0),
+            'ema50_slope': np.nan_to_num(np.diff(ema50_raw, prepend=np.nan), nan=0.0),
+            'surge': surge,
+            'exec_pivot': self._round_series(pivot),
+            'exec_upper': self._round_series(2 * pivot - bc),
+            'exec_lower': self._round_series(bc),
+            'r2': self._round_series(pivot + (prev_high - prev_low)),
+            's2': self._round_series(pivot - (prev_high - prev_low)),
+            'r3': self._round_series(prev_high + 2 * (pivot - prev_low)),
+            's3': self._round_series(prev_low - 2 * (prev_high - pivot)),
+        }
+
+    def _build_plan_series(self):
+        return pd.DataFrame(plan_from_inputs(self.plan_inputs(), self.plan_params), index=self.data.index)
+
     def get_position_sizing(self):
         risk_context = self.get_risk_context()
         trade_bias = self.get_trade_bias()
@@ -689,3 +861,125 @@ class TechnicalAnalyzer:
         if adx < 20:
             return f"Mixed ({trend} trend, weakening momentum)"
         return trend
+
+def _round_where(values, mask, precision=2):
+    """Python-rounded values where mask is set (as the scalar plan rounds), NaN elsewhere"""
+    out = np.full(len(values), np.nan)
+    out[mask] = [round(float(v), precision) for v in values[mask]]
+    return out
+
+def trend_regime_confidence(price, ema20, ema50, adx, rsi, atr, surge, params=None):
+    """
+    Vectorized get_trend(), get_market_regime() and calculate_confidence_score()
+    over arrays of indicator values (NaN where unavailable). Returns a dict of
+    arrays: bullish, bearish, trend, regime, confidence.
+    """
+    p = {**DEFAULT_PLAN_PARAMS, **(params or {})}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Trend (get_trend)
+        bullish = (price > ema20) & (ema20 > ema50)
+        bearish = (price < ema20) & (ema20 < ema50)
+        trend = np.where(bullish, 'Bullish', np.where(bearish, 'Bearish', 'Neutral')).astype(object)
+
+        # Regime (get_market_regime)
+        regime_known = ~(np.isnan(adx) | np.isnan(price) | np.isnan(atr))
+        atr_pct = atr / price * 100
+        regime = np.select(
+            [~regime_known, (adx > p['adx_strong']) & (atr_pct < p['atr_pct_volatile']), adx > p['adx_strong'],
+             adx < p['adx_weak']],
+            ['Unknown', 'Strong Trend', 'Volatile Trend', 'Range-Bound'],
+            default='Weak Trend'
+        ).astype(object)
+
+        # Confidence (calculate_confidence_score)
+        directional = bullish | bearish
+        w_adx, w_rsi = p['weight_adx'], p['weight_rsi']
+        adx_points = np.select(
+            [np.isnan(adx), adx > p['adx_strong'], adx > p['adx_weak']],
+            [_points(w_adx, WEAK_CREDIT), _points(w_adx), _points(w_adx, ADX_MODERATE_CREDIT)],
+            default=_points(w_adx, WEAK_CREDIT)
+        )
+        full, partial, weak = _points(w_rsi), _points(w_rsi, PARTIAL_CREDIT), _points(w_rsi, WEAK_CREDIT)
+        rsi_points = np.select(
+            [np.isnan(rsi),
+             bullish & (rsi >= 40) & (rsi <= 70), bullish & (rsi > 70), bullish,
+             bearish & (rsi >= 30) & (rsi <= 60), bearish & (rsi < 30), bearish,
+             (rsi >= 40) & (rsi <= 60)],
+            [partial, full, partial, weak, full, partial, weak, full],
+            default=partial
+        )
+        confidence = (np.where(directional, _points(p['weight_trend']), _points(p['weight_trend'], TREND_NEUTRAL_CREDIT))
+                      + adx_points + rsi_points
+                      + np.where(surge, _points(p['weight_volume']),
+                                 _points(p['weight_volume'], VOLUME_NORMAL_CREDIT)))
+        confidence = np.round(confidence, 2)
+
+    return {'bullish': bullish, 'bearish': bearish, 'trend': trend, 'regime': regime, 'confidence': confidence}
+
+def plan_from_inputs(inputs, params=None):
+    """
+    Vectorized generate_actionable_plan() over TechnicalAnalyzer.plan_inputs()
+    for one set of plan params. Returns a dict of per-bar arrays: decision,
+    regime, trend, confidence, current_price, stop_loss, target_1, target_2,
+    risk_reward.
+    """
+    p = {**DEFAULT_PLAN_PARAMS, **(params or {})}
+    price, rsi, adx, atr = inputs['price'], inputs['rsi'], inputs['adx'], inputs['atr']
+    ema20, ema50 = inputs['ema20'], inputs['ema50']
+    exec_pivot, exec_upper, exec_lower = inputs['exec_pivot'], inputs['exec_upper'], inputs['exec_lower']
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scored = trend_regime_confidence(price, ema20, ema50, adx, rsi, atr, inputs['surge'], p)
+        bullish, bearish, trend = scored['bullish'], scored['bearish'], scored['trend']
+        regime, confidence = scored['regime'], scored['confidence']
+
+        # Decision core
+        sufficient = ~(np.isnan(rsi) | np.isnan(adx) | np.isnan(ema20) | np.isnan(price))
+        trending = np.isin(regime, ['Strong Trend', 'Volatile Trend'])
+        long_ = sufficient & trending & bullish & (confidence > p['trend_confidence'])
+        short = sufficient & trending & bearish & (confidence > p['trend_confidence'])
+        range_trade = sufficient & (regime == 'Range-Bound') & (confidence > p['range_confidence'])
+
+        # Pivot, momentum and EMA slope gates
+        long_ &= (price > exec_pivot) & (rsi >= p['rsi_gate']) & (inputs['ema20_slope'] > 0) & (inputs['ema50_slope'] > 0)
+        short &= (price < exec_pivot) & (rsi <= p['rsi_gate']) & (inputs['ema20_slope'] < 0) & (inputs['ema50_slope'] < 0)
+
+        stop_loss = np.select([long_, short], [exec_lower, exec_upper], default=np.nan)
+        target_1 = np.select([long_, short, range_trade], [inputs['r2'], inputs['s2'], exec_pivot], default=np.nan)
+        target_2 = np.select(
+            [long_, short, range_trade],
+            [inputs['r3'], inputs['s3'], np.where(bullish, exec_upper, exec_lower)],
+            default=np.nan
+        )
+
+        # SL tightening when the stop is wider than target 1
+        directional_trade = (long_ | short) & (stop_loss != 0) & (target_1 != 0)
+        dist_target = np.abs(target_1 - price)
+        tighten = directional_trade & (np.abs(price - stop_loss) > dist_target)
+        ratio = p['sl_tighten_ratio']
+        tightened = np.where(long_, price - dist_target / ratio, price + dist_target / ratio)
+        stop_loss = np.where(tighten, _round_where(tightened, tighten), stop_loss)
+
+        # R:R (_risk_reward); the range-trade stop is not numeric
+        risk = np.abs(price - stop_loss)
+        reward = np.abs(target_1 - price)
+        rr_raw = np.where(risk == 0, 0.0, reward / np.where(risk == 0, 1.0, risk))
+        risk_reward = _round_where(rr_raw, directional_trade)
+
+    decision = np.select([long_, short, range_trade], ['LONG', 'SHORT', 'RANGE TRADE'], default='NO TRADE')
+    regime = np.where(sufficient, regime, 'Unknown')
+    confidence = np.where(sufficient, confidence, 0)
+    if np.all(confidence == np.floor(confidence)):
+        confidence = confidence.astype(int)
+
+    return {
+        'decision': decision.astype(object),
+        'regime': regime.astype(object),
+        'trend': trend,
+        'confidence': confidence,
+        'current_price': price,
+        'stop_loss': stop_loss,
+        'target_1': target_1,
+        'target_2': target_2,
+        'risk_reward': risk_reward,
+    }
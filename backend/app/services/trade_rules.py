@@ -0,0 +1,94 @@
+from .option_chain import OptionChain, parse_symbol
+
+# Premium-based exits for a bought option: SL at -30%, TP at +50%
+STOP_LOSS_PCT = 0.30
+TAKE_PROFIT_PCT = 0.50
+
+# Trades allowed per day when the first one is stopped out
+MAX_TRADES_PER_DAY = 2
+
+MOCK_STRIKE_STEP = 100
+MOCK_STRIKES_EACH_SIDE = 2
+
+def lot_capacity(capital: float, allocation_pct: float, premium: float, lot_size: int, buffer_per_lot: float = 50.0) -> int:
+    alloc = capital * allocation_pct
+    per_lot = premium * lot_size + buffer_per_lot
+    return max(0, int(alloc // per_lot))
+
+def mock_premium(spot_price: float, strike: float, option_type: str) -> float:
+    """Premium of the synthetic chain for one contract"""
+    dist = abs(spot_price - strike)
+    if option_type == "CE":
+        if strike <= spot_price: # ITM/ATM Call
+            premium = (spot_price - strike) + 150 - (dist * 0.1)
+        else: # OTM Call
+            premium = max(10, 150 - (dist * 0.5))
+    else:
+        if strike >= spot_price: # ITM/ATM Put
+            premium = (strike - spot_price) + 150 - (dist * 0.1)
+        else: # OTM Put
+            premium = max(10, 150 - (dist * 0.5))
+    return round(premium, 1)
+
+def mock_chain(spot_price: float, prefix: str = "SENSEX26JAN"):
+    """Synthetic option chain: ATM (nearest 100) +/- 2 strikes, calls and puts"""
+    contracts = []
+    atm_strike = round(spot_price / MOCK_STRIKE_STEP) * MOCK_STRIKE_STEP
+    for offset in range(-MOCK_STRIKES_EACH_SIDE, MOCK_STRIKES_EACH_SIDE + 1):
+        strike = atm_strike + offset * MOCK_STRIKE_STEP
+        for option_type in ("CE", "PE"):
+            contracts.append({
+                "symbol": f"{prefix}{strike}{option_type}",
+                "premium": mock_premium(spot_price, strike, option_type),
+                "oi_change_pct": 0.1,
+                "spread_pct": 0.01
+            })
+    return contracts
+
+def parse_contract(symbol: str):
+    """(strike, type) from a symbol such as SENSEX26JAN82000CE, or None"""
+    parsed = parse_symbol(symbol)
+    if not parsed:
+        return None
+    return parsed[2], parsed[3]
+
+def select_contract(contracts, signal_action, premium_min, premium_max, max_spread_pct, oi_change_pct):
+    """
+    Cheapest contract that passes the filters for the signal, or None.
+    contracts: an OptionChain, or a list of contract dicts (indexed on the fly)
+    """
+    chain = contracts if isinstance(contracts, OptionChain) else OptionChain(contracts)
+    return chain.select(signal_action, premium_min, premium_max, max_spread_pct, oi_change_pct)
+
+def expiry_adjusted_filters(max_spread_pct, oi_change_pct, is_expiry):
+    """Tighter spread and higher OI-change requirements on expiry day"""
+    eff_spread = max_spread_pct * (0.75 if is_expiry else 1.0)
+    eff_oi = oi_change_pct + (0.05 if is_expiry else 0.0)
+    return eff_spread, eff_oi
+
+def exit_levels(entry_price: float):
+    """(stop loss, take profit) premiums for a position"""
+    return entry_price * (1 - STOP_LOSS_PCT), entry_price * (1 + TAKE_PROFIT_PCT)
+
+def check_exit(entry_price: float, current_premium: float):
+    """(outcome, exit_reason) when SL or TP is hit, otherwise None"""
+    sl_price, tp_price = exit_levels(entry_price)
+    if current_premium <= sl_price:
+        return "loss", "SL Hit"
+    if current_premium >= tp_price:
+        return "profit", "TP Hit"
+    return None
+
+def entry_block_reason(day_state: dict):
+    """
+    Why no new trade may be opened today, or None if one may.
+    day_state: the per-day trade state (trades_executed, outcome, ...)
+    """
+    trades_done = int(day_state.get("trades_executed", 0))
+    if trades_done >= 1 and "outcome" not in day_state:
+        return "Position open"
+    if day_state.get("outcome") == "profit":
+        return "Daily Target Reached (Profit). No more trades."
+    if day_state.get("outcome") == "loss" and trades_done >= MAX_TRADES_PER_DAY:
+        return "Max daily losses reached. No more trades."
+    return None
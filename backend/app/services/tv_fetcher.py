@@ -16,12 +16,26 @@ class TradingViewFetcher:
             except Exception:
                 self.client = TvDatafeed()
 
+    @staticmethod
+    def _interval(interval):
+        """TradingView interval for '1D'/'1H' or a yfinance-style string ('1d', '5m', ...)"""
+        intervals = {
+            '1d': Interval.in_daily,
+            '1h': Interval.in_1_hour,
+            '60m': Interval.in_1_hour,
+            '30m': Interval.in_30_minute,
+            '15m': Interval.in_15_minute,
+            '5m': Interval.in_5_minute,
+            '1m': Interval.in_1_minute,
+        }
+        return intervals.get(interval.lower(), Interval.in_1_hour)
+
     def fetch_data(self, symbol='NSE:BANKNIFTY', interval='1D', n_bars=300):
         if TvDatafeed is None:
             raise RuntimeError("tvDatafeed not installed. Please install with `pip install tvdatafeed`.")
         if self.client is None:
             raise RuntimeError("TradingView client not initialized.")
-        tv_interval = Interval.in_1_day if interval == '1D' else Interval.in_1_hour
+        tv_interval = self._interval(interval)
         data = self.client.get_hist(symbol=symbol, interval=tv_interval, n_bars=n_bars)
         if data is None or data.empty:
             raise ValueError(f"No TradingView data for {symbol}")
@@ -8,6 +8,7 @@ import os
 import sys
 import argparse
 import json
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -16,11 +17,10 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 load_dotenv()
 
-from app.services.data_fetcher import MarketDataFetcher
-from app.services.technical_analysis import TechnicalAnalyzer
-from app.services.report_generator import ReportGenerator
-from app.services.chart_generator import ChartGenerator
-from app.services.ml_service import LightGBMService, OptionDecayService
+# Analysis, ML and rendering modules (TA-Lib, LightGBM, matplotlib, ReportLab)
+# are imported by the stages that use them, so --mode cleanup starts instantly
+from app.services.retrain_scheduler import get_retrain_scheduler
+from app.services.artifact_cache import artifact_key, default_artifact_cache
 
 def get_daily_sentiment():
     """Load the daily sentiment from the JSON file."""
@@ -33,88 +33,164 @@ def get_daily_sentiment():
         print(f"Warning: Could not load daily sentiment: {e}")
     return None
 
+def prepare_report(symbol, report_date, is_weekly=False):
+    """
+    I/O-bound stage: fetch data, run the analysis, ML prediction and AI commentary.
+    Returns everything render_report() needs (picklable, so it can cross processes).
+    """
+    from app.services.data_fetcher import MarketDataFetcher
+    from app.services.technical_analysis import TechnicalAnalyzer
+    from app.services.ml_service import LightGBMService, OptionDecayService
+
+    # Fetch market data (use 1 month for weekly reports to get more recent data)
+    data_fetcher = MarketDataFetcher()
+    data_period = '1mo' if is_weekly else '3mo'
+    market_data = data_fetcher.fetch_data(symbol, data_period)
+    
+    # Perform technical analysis
+    analyzer = TechnicalAnalyzer(market_data)
+    indicators = analyzer.calculate_all_indicators()
+    indicator_frame = analyzer.indicator_frame()
+    trend = analyzer.get_trend()
+    signals = analyzer.get_signal()
+    support_resistance = analyzer.get_support_resistance()
+    patterns = analyzer.get_candlestick_patterns()
+    trade_bias = analyzer.get_trade_bias()
+    risk_context = analyzer.get_risk_context()
+    market_regime = analyzer.get_market_regime()
+    position_sizing = analyzer.get_position_sizing()
+    overall_signal = analyzer.get_overall_signal()
+    action_plan = analyzer.generate_actionable_plan()
+    cache_stats = analyzer.get_cache_stats()
+    print(f"Indicator cache for {symbol}: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+    
+    # Machine Learning Prediction
+    lgbm_service = LightGBMService()
+    ml_result = lgbm_service.predict_with_status(symbol, market_data, indicator_frame)
+    ml_prediction = ml_result['probability']
+    if ml_result['status'] != 'ok':
+        print(f"ML model for {symbol} is {ml_result['status']}: {', '.join(ml_result['reasons'])}")
+    ml_importance = lgbm_service.get_feature_importance(symbol)
+
+    # Option Decay Insights (Experimental)
+    decay_service = OptionDecayService()
+    decay_prob = None
+    decay_importance = None
+    
+    if is_weekly:
+        timeframe = {
+            'data_period': '1 month daily data',
+            'analysis_type': 'Weekly Consolidated Report',
+            'chart_interval': '1 Day'
+        }
+    else:
+        timeframe = {
+            'data_period': '3 months daily data',
+            'analysis_type': 'Swing/Positional (1-5 days)',
+            'chart_interval': '1 Day'
+        }
+
+    # Load Daily Sentiment
+    daily_sentiment = get_daily_sentiment()
+
+    # Prepare report data
+    report_data = {
+        'symbol': symbol,
+        'date': report_date.strftime('%Y-%m-%d'),
+        'indicators': indicators,
+        'trend': trend,
+        'signals': signals,
+        'support_resistance': support_resistance,
+        'patterns': patterns,
+        'trade_bias': trade_bias,
+        'risk_context': risk_context,
+        'timeframe': timeframe,
+        'market_regime': market_regime,
+        'position_sizing': position_sizing,
+        'overall_signal': overall_signal,
+        'action_plan': action_plan,
+        'ml_prediction': ml_prediction,
+        'ml_importance': ml_importance,
+        'ml_status': ml_result['status'],
+        'option_decay_prob': decay_prob,
+        'option_decay_importance': decay_importance,
+        'daily_sentiment': daily_sentiment
+    }
+
+    # AI commentary is a network call: do it here so the render stage stays CPU-only
+    report_data['ai_commentary'] = get_ai_commentary(report_data)
+
+    return {
+        'report_data': report_data,
+        'market_data': market_data,
+        'indicator_frame': indicator_frame,
+    }
+
+def get_ai_commentary(report_data):
+    """
+    AI commentary, reused from the artifact cache when the analysis is unchanged
+    (the report date is not part of the prompt, so it is not part of the key).
+    """
+    from app.services.ai_provider import OpenAIProvider
+
+    provider = OpenAIProvider()
+    artifact_cache = default_artifact_cache()
+    if artifact_cache is None or not provider.enabled:
+        return provider.explain_report(report_data)
+    key = artifact_key('ai_commentary', {k: v for k, v in report_data.items() if k != 'date'})
+    commentary = artifact_cache.get_text(key)
+    if commentary is None:
+        commentary = provider.explain_report(report_data)
+        if commentary:
+            artifact_cache.put_text(key, commentary, 'ai_commentary', report_data['symbol'])
+    return commentary
+
+_chart_generator = None
+
+def get_chart_generator():
+    """This process's ChartGenerator, so consecutive charts reuse one figure"""
+    global _chart_generator
+    if _chart_generator is None:
+        from multiprocessing.util import Finalize
+        from app.services.chart_generator import ChartGenerator
+        _chart_generator = ChartGenerator(default_artifact_cache())
+        # Render workers exit through multiprocessing's hooks, which skip atexit
+        Finalize(None, close_chart_generator, exitpriority=0)
+    return _chart_generator
+
+def close_chart_generator():
+    global _chart_generator
+    if _chart_generator is not None:
+        _chart_generator.close()
+        _chart_generator = None
+
+def render_report(prepared, is_weekly=False, name_prefix=None):
+    """
+    CPU-bound stage: chart + PDF. Runs in a worker process in parallel mode.
+    Unchanged inputs are served from the artifact cache instead of re-rendered.
+    """
+    from app.services.report_generator import ReportGenerator
+
+    report_data = dict(prepared['report_data'])
+    symbol = report_data['symbol']
+    artifact_cache = default_artifact_cache()
+
+    # Generate Chart
+    report_data['chart_path'] = get_chart_generator().generate_chart(
+        symbol, prepared['market_data'], report_data['indicators'],
+        report_data['support_resistance'], frame=prepared['indicator_frame']
+    )
+
+    # Generate PDF
+    report_generator = ReportGenerator(artifact_cache)
+    return report_generator.generate_pdf(report_data, is_weekly, name_prefix)
+
 def generate_report_for_symbol(symbol, report_date, is_weekly=False, name_prefix=None):
     """Generate report for a single symbol."""
     print(f"Generating report for {symbol} on {report_date}...")
     
     try:
-        # Fetch market data (use 1 month for weekly reports to get more recent data)
-        data_fetcher = MarketDataFetcher()
-        data_period = '1mo' if is_weekly else '3mo'
-        market_data = data_fetcher.fetch_data(symbol, data_period)
-        
-        # Perform technical analysis
-        analyzer = TechnicalAnalyzer(market_data)
-        indicators = analyzer.calculate_all_indicators()
-        trend = analyzer.get_trend()
-        signals = analyzer.get_signal()
-        support_resistance = analyzer.get_support_resistance()
-        patterns = analyzer.get_candlestick_patterns()
-        trade_bias = analyzer.get_trade_bias()
-        risk_context = analyzer.get_risk_context()
-        market_regime = analyzer.get_market_regime()
-        position_sizing = analyzer.get_position_sizing()
-        overall_signal = analyzer.get_overall_signal()
-        action_plan = analyzer.generate_actionable_plan()
-        
-        # Machine Learning Prediction
-        lgbm_service = LightGBMService()
-        ml_prediction = lgbm_service.predict(symbol, market_data)
-        ml_importance = lgbm_service.get_feature_importance(symbol)
-
-        # Option Decay Insights (Experimental)
-        decay_service = OptionDecayService()
-        decay_prob = None
-        decay_importance = None
-        
-        if is_weekly:
-            timeframe = {
-                'data_period': '1 month daily data',
-                'analysis_type': 'Weekly Consolidated Report',
-                'chart_interval': '1 Day'
-            }
-        else:
-            timeframe = {
-                'data_period': '3 months daily data',
-                'analysis_type': 'Swing/Positional (1-5 days)',
-                'chart_interval': '1 Day'
-            }
-        
-        # Generate Chart
-        chart_generator = ChartGenerator()
-        chart_path = chart_generator.generate_chart(symbol, market_data, indicators, support_resistance)
-
-        # Load Daily Sentiment
-        daily_sentiment = get_daily_sentiment()
-
-        # Prepare report data
-        report_data = {
-            'symbol': symbol,
-            'date': report_date.strftime('%Y-%m-%d'),
-            'indicators': indicators,
-            'trend': trend,
-            'signals': signals,
-            'support_resistance': support_resistance,
-            'patterns': patterns,
-            'chart_path': chart_path,
-            'trade_bias': trade_bias,
-            'risk_context': risk_context,
-            'timeframe': timeframe,
-            'market_regime': market_regime,
-            'position_sizing': position_sizing,
-            'overall_signal': overall_signal,
-            'action_plan': action_plan,
-            'ml_prediction': ml_prediction,
-            'ml_importance': ml_importance,
-            'option_decay_prob': decay_prob,
-            'option_decay_importance': decay_importance,
-            'daily_sentiment': daily_sentiment
-        }
-        
-        # Generate PDF
-        report_generator = ReportGenerator()
-        pdf_path = report_generator.generate_pdf(report_data, is_weekly, name_prefix)
-        
+        pdf_path = render_report(prepare_report(symbol, report_date, is_weekly), is_weekly, name_prefix)
         print(f"✅ Report generated for {symbol}: {pdf_path}")
         return pdf_path
         
@@ -122,6 +198,54 @@ def generate_report_for_symbol(symbol, report_date, is_weekly=False, name_prefix
         print(f"❌ Error generating report for {symbol}: {str(e)}")
         return None
 
+def _import_render_stack():
+    """Load the rendering modules in the parent so forked render workers share them"""
+    import app.services.chart_generator  # noqa: F401
+    import app.services.report_generator  # noqa: F401
+
+def _warm_render_worker():
+    """Runs once per render process so imports overlap with the fetch stage"""
+    return os.getpid()
+
+def generate_reports_parallel(symbols, report_date, is_weekly=False, name_prefix=None, workers=2):
+    """
+    Generate several reports concurrently: the fetch/analysis/AI stage runs on
+    threads, chart + PDF rendering on a process pool. Returns PDF paths in
+    symbol order (None for failures).
+    """
+    workers = max(1, min(workers, len(symbols)))
+    results = {}
+    _import_render_stack()
+    with ProcessPoolExecutor(max_workers=workers) as render_pool, \
+            ThreadPoolExecutor(max_workers=workers) as fetch_pool:
+        # Start the render processes before any fetch thread exists, so forked
+        # children never inherit a lock held by another thread
+        wait([render_pool.submit(_warm_render_worker) for _ in range(workers)])
+
+        print(f"Generating reports for {', '.join(symbols)} with {workers} workers...")
+        prepare_futures = {fetch_pool.submit(prepare_report, symbol, report_date, is_weekly): symbol for symbol in symbols}
+        render_futures = {}
+        for future in as_completed(prepare_futures):
+            symbol = prepare_futures[future]
+            try:
+                prepared = future.result()
+            except Exception as e:
+                print(f"❌ Error generating report for {symbol}: {str(e)}")
+                results[symbol] = None
+                continue
+            render_futures[render_pool.submit(render_report, prepared, is_weekly, name_prefix)] = symbol
+
+        for future in as_completed(render_futures):
+            symbol = render_futures[future]
+            try:
+                results[symbol] = future.result()
+                print(f"✅ Report generated for {symbol}: {results[symbol]}")
+            except Exception as e:
+                print(f"❌ Error generating report for {symbol}: {str(e)}")
+                results[symbol] = None
+
+    return [results.get(symbol) for symbol in symbols]
+
 def delete_old_reports(reports_dir, keep_latest_count=0):
     if not os.path.exists(reports_dir):
         print(f"Reports directory not found: {reports_dir}")
@@ -166,11 +290,19 @@ def run_cleanup():
     deleted_repo = delete_old_reports(repo_reports_dir, keep_latest_count=keep_latest)
     deleted_backend = delete_old_reports(backend_reports_dir, keep_latest_count=keep_latest)
     print(f"Cleanup complete. Repo deleted: {deleted_repo}, Backend deleted: {deleted_backend}")
+    artifact_cache = default_artifact_cache()
+    if artifact_cache is not None:
+        pruned = artifact_cache.prune(int(os.getenv("ARTIFACT_CACHE_MAX_AGE_DAYS", "30")))
+        print(f"Pruned {pruned} unused cached artifact(s)")
+    from app.services.signal_store import SignalStore
+    SignalStore().compact_if_needed()
 
 def parse_args():
     parser = argparse.ArgumentParser()
     parser.add_argument("--mode", choices=["generate", "cleanup"], default=os.getenv("REPORT_MODE", "generate"))
     parser.add_argument("--run-tag", default=os.getenv("REPORT_TAG"))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("REPORT_WORKERS", "1")),
+                        help="symbols processed concurrently (1 = sequential)")
     return parser.parse_args()
 
 def run():
@@ -189,7 +321,7 @@ def run():
         print("Skipping night run on weekend")
         return []
     
-    generated_files = main_with_tag(args.run_tag)
+    generated_files = main_with_tag(args.run_tag, workers=args.workers)
     
     # Fail with error code if no reports were generated during a generate run
     if not generated_files:
@@ -198,8 +330,18 @@ def run():
         
     return generated_files
 
-def main_with_tag(run_tag=None):
+def warm_up_models():
+    """Load every saved model once so per-symbol predictions hit the registry"""
+    try:
+        from app.services.ml_service import LightGBMService, OptionDecayService
+        loaded = LightGBMService().warm_up() + OptionDecayService().warm_up()
+        print(f"Preloaded {loaded} model(s)")
+    except Exception as e:
+        print(f"Warning: model warm-up failed: {e}")
+
+def main_with_tag(run_tag=None, workers=1):
     symbols = ['SENSEX', 'BANKNIFTY', 'NIFTY50']
+    warm_up_models()
     report_date = datetime.now()
     current_day = report_date.strftime('%A').lower()
     repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -207,20 +349,27 @@ def main_with_tag(run_tag=None):
     os.makedirs(repo_reports_dir, exist_ok=True)
     backend_reports_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reports')
     os.makedirs(backend_reports_dir, exist_ok=True)
-    generated_files = []
     is_weekend = current_day in ['saturday', 'sunday']
+    is_weekly = is_weekend
+    name_prefix = None if is_weekly else run_tag
     if is_weekend:
         print("Generating weekly consolidated report for past 5 days...")
-        for symbol in symbols:
-            pdf_path = generate_report_for_symbol(symbol, report_date, is_weekly=True)
-            if pdf_path:
-                generated_files.append(pdf_path)
     else:
         print(f"Generating daily reports for: {', '.join(symbols)}")
-        for symbol in symbols:
-            pdf_path = generate_report_for_symbol(symbol, report_date, is_weekly=False, name_prefix=run_tag)
-            if pdf_path:
-                generated_files.append(pdf_path)
+    if workers > 1:
+        pdf_paths = generate_reports_parallel(symbols, report_date, is_weekly, name_prefix, workers)
+    else:
+        try:
+            pdf_paths = [generate_report_for_symbol(symbol, report_date, is_weekly=is_weekly, name_prefix=name_prefix)
+                         for symbol in symbols]
+        finally:
+            close_chart_generator()
+    generated_files = [path for path in pdf_paths if path]
+    scheduler = get_retrain_scheduler()
+    if scheduler.pending():
+        # Reports are already written; let background retrains finish before exiting
+        print(f"Finishing background model retrain(s): {', '.join(scheduler.pending())}")
+        scheduler.wait()
     print("\nReport generation complete!")
     print(f"Generated {len(generated_files)} out of {len(symbols)} reports.")
     for file in generated_files:
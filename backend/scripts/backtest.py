@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import argparse
+from datetime import time as clock_time
+from dotenv import load_dotenv
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+load_dotenv(os.path.join(backend_dir, ".env"))
+
+from app.services.backtester import Backtester
+from app.services.data_fetcher import MarketDataFetcher
+
+def main():
+    """
+    Replay intraday bars through TradingStrategy and the execute_trades rules.
+    Sizing and filters come from the same environment variables as the live run.
+    """
+    p = argparse.ArgumentParser()
+    p.add_argument("--index", default="SENSEX")
+    p.add_argument("--period", default="60d", help="history to replay (Yahoo keeps 60 days of 5m bars)")
+    p.add_argument("--interval", default="5m")
+    p.add_argument("--out", default=os.path.join(backend_dir, "backtests"), help="folder for the ledger and equity CSVs")
+    p.add_argument("--expiry-weekday", type=int, default=None, help="0=Monday; applies the expiry-day filters")
+    args = p.parse_args()
+
+    capital = float(os.environ.get("CAPITAL", "0"))
+    lot_size = int(os.environ.get("SENSEX_LOT_SIZE", os.environ.get("LOT_SIZE", "0")))
+    if capital <= 0 or lot_size <= 0:
+        print("Invalid capital or lot size.")
+        sys.exit(1)
+
+    data = MarketDataFetcher().fetch_data(args.index, period=args.period, interval=args.interval)
+    if data is None or data.empty:
+        print("No market data available.")
+        sys.exit(1)
+
+    backtester = Backtester(
+        capital=capital,
+        lot_size=lot_size,
+        premium_min=float(os.environ.get("PREMIUM_MIN", "50")),
+        premium_max=float(os.environ.get("PREMIUM_MAX", "200")),
+        allocation_pct=float(os.environ.get("ALLOCATION_PCT", "0.6")),
+        max_spread_pct=float(os.environ.get("MAX_SPREAD_PCT", "0.02")),
+        oi_change_pct=float(os.environ.get("OI_CHANGE_PCT", "0.08")),
+        window=(clock_time(int(os.environ.get("TRADING_START_H", "10")), int(os.environ.get("TRADING_START_M", "0"))),
+                clock_time(int(os.environ.get("TRADING_END_H", "14")), int(os.environ.get("TRADING_END_M", "0")))),
+        expiry_weekday=args.expiry_weekday,
+    )
+    started = time.perf_counter()
+    result = backtester.run(data)
+    print(f"Replayed {len(data)} bars in {time.perf_counter() - started:.2f}s")
+
+    os.makedirs(args.out, exist_ok=True)
+    stem = f"{args.index.upper()}_{args.interval}"
+    result['trades'].to_csv(os.path.join(args.out, f"{stem}_trades.csv"), index=False)
+    result['equity'].to_csv(os.path.join(args.out, f"{stem}_equity.csv"))
+    for key, value in result['summary'].items():
+        print(f"{key}: {value}")
+
+if __name__ == "__main__":
+    main()
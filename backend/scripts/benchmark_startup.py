@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that make up most of the start-up cost when imported eagerly
+HEAVY_MODULES = ['pandas', 'numpy', 'talib', 'matplotlib', 'reportlab', 'lightgbm',
+                 'sklearn', 'openai', 'yfinance', 'sqlalchemy', 'celery']
+
+HEALTH = """
+from app import create_app
+client = create_app().test_client()
+assert client.get('/api/health').status_code == 200
+"""
+
+FULL_STACK = """
+import generate_reports
+generate_reports._import_render_stack()
+import app.services.ml_service
+import app.services.data_fetcher
+"""
+
+def scenarios():
+    return {
+        'interpreter': [sys.executable, '-c', 'pass'],
+        'api health': [sys.executable, '-c', HEALTH],
+        'cleanup mode': [sys.executable, os.path.join(backend_dir, 'generate_reports.py'), '--mode', 'cleanup'],
+        'report stack': [sys.executable, '-c', FULL_STACK],
+    }
+
+def run_env():
+    env = dict(os.environ)
+    # Keep the benchmark side-effect free: cleanup must not delete anything
+    env.update({'REPORTS_KEEP_LATEST': '1000000', 'ARTIFACT_CACHE': '0', 'PYTHONPATH': backend_dir})
+    return env
+
+def time_command(cmd, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(cmd, cwd=backend_dir, env=run_env(), check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def heavy_imports(cmd):
+    """Heavy top-level packages the command imports (from -X importtime)"""
+    result = subprocess.run([cmd[0], '-X', 'importtime'] + cmd[1:], cwd=backend_dir, env=run_env(),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            name = line.rsplit('|', 1)[1].strip()
+            loaded.add(name.split('.')[0])
+    return [name for name in HEAVY_MODULES if name in loaded]
+
+def main():
+    """Cold-start time of the API and CLI entry points, each in a fresh interpreter"""
+    p = argparse.ArgumentParser()
+    p.add_argument("--runs", type=int, default=5)
+    p.add_argument("--only", nargs="+", help="scenario names to run")
+    args = p.parse_args()
+
+    print(f"{'scenario':<14} {'min':>7} {'median':>7}  heavy imports")
+    for name, cmd in scenarios().items():
+        if args.only and name not in args.only:
+            continue
+        timings = time_command(cmd, args.runs)
+        heavy = ', '.join(heavy_imports(cmd)) or '-'
+        print(f"{name:<14} {min(timings):>6.2f}s {statistics.median(timings):>6.2f}s  {heavy}")
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,10 @@ from datetime import datetime, time
 from zoneinfo import ZoneInfo
 from app.services.data_fetcher import MarketDataFetcher
 from app.services.strategy import TradingStrategy
+from app.services.incremental_indicators import IncrementalIndicators
+from app.services.option_chain import OptionChain
+from app.services.trade_rules import (check_exit, entry_block_reason, expiry_adjusted_filters, lot_capacity,
+                                      mock_chain, mock_premium, parse_contract)
 
 scripts_dir = os.path.dirname(os.path.abspath(__file__))
 if scripts_dir not in sys.path:
@@ -32,58 +36,10 @@ def in_window(start_h: int, start_m: int, end_h: int, end_m: int):
 def is_weekend():
     return ist_now().weekday() >= 5
 
-def lot_capacity(capital: float, allocation_pct: float, premium: float, lot_size: int, buffer_per_lot: float = 50.0) -> int:
-    alloc = capital * allocation_pct
-    per_lot = premium * lot_size + buffer_per_lot
-    return max(0, int(alloc // per_lot))
-
-def passes_filters(premium: float, spread: float, d_oi: float, premium_min: float, premium_max: float, max_spread_pct: float, oi_change_pct: float, signal_type: str, contract_type: str) -> bool:
-    # Check if contract matches signal (BUY_CALL -> CE, BUY_PUT -> PE)
-    if signal_type == "BUY_CALL" and contract_type != "CE":
-        return False
-    if signal_type == "BUY_PUT" and contract_type != "PE":
-        return False
-    
-    return (premium_min <= premium <= premium_max) and (spread <= max_spread_pct) and (d_oi >= oi_change_pct)
-
 def generate_mock_chain(spot_price: float):
     """Generate synthetic option chain for simulation/testing when API fails"""
     print(f"Generating mock option chain around spot: {spot_price}")
-    contracts = []
-    
-    # Round spot to nearest 100
-    atm_strike = round(spot_price / 100) * 100
-    strikes = [atm_strike - 200, atm_strike - 100, atm_strike, atm_strike + 100, atm_strike + 200]
-    
-    for strike in strikes:
-        # Simple mock premium logic
-        dist = abs(spot_price - strike)
-        # Call Premium
-        if strike <= spot_price: # ITM/ATM Call
-            ce_prem = (spot_price - strike) + 150 - (dist * 0.1)
-        else: # OTM Call
-            ce_prem = max(10, 150 - (dist * 0.5))
-            
-        # Put Premium
-        if strike >= spot_price: # ITM/ATM Put
-            pe_prem = (strike - spot_price) + 150 - (dist * 0.1)
-        else: # OTM Put
-            pe_prem = max(10, 150 - (dist * 0.5))
-            
-        contracts.append({
-            "symbol": f"SENSEX26JAN{strike}CE",
-            "premium": round(ce_prem, 1),
-            "oi_change_pct": 0.1,
-            "spread_pct": 0.01
-        })
-        contracts.append({
-            "symbol": f"SENSEX26JAN{strike}PE",
-            "premium": round(pe_prem, 1),
-            "oi_change_pct": 0.1,
-            "spread_pct": 0.01
-        })
-        
-    return contracts
+    return mock_chain(spot_price)
 
 def fetch_option_chain(url: str, spot_price: float = 0):
     if not url:
@@ -115,13 +71,32 @@ def get_current_option_price(symbol: str, spot_price: float):
     """
     Simulate fetching current option price.
     In real world, this would call an API.
-    For simulation, we regenerate mock chain and find the symbol.
+    For simulation, the contract is priced with the mock chain formula.
+    """
+    parsed = parse_contract(symbol or "")
+    if not parsed:
+        return None
+    return mock_premium(spot_price, *parsed)
+
+def load_indicator_engine(path: str):
+    """Restore the saved indicator state, or None if missing/corrupt"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return IncrementalIndicators.load(path)
+    except Exception as e:
+        print(f"Could not restore indicator state ({e}). Warming up from scratch.")
+        return None
+
+def intraday_fetch_period(engine) -> str:
+    """
+    Only today's bars are needed when the saved state already covers today;
+    otherwise fetch the usual 5-day warm-up window.
     """
-    contracts = generate_mock_chain(spot_price)
-    for c in contracts:
-        if c["symbol"] == symbol:
-            return c["premium"]
-    return None
+    if engine is None or engine.last_timestamp is None:
+        return "5d"
+    last_day = datetime.fromisoformat(engine.last_timestamp).astimezone(ZoneInfo("Asia/Kolkata")).date()
+    return "1d" if last_day == ist_now().date() else "5d"
 
 def main():
     p = argparse.ArgumentParser()
@@ -183,9 +158,7 @@ def main():
         fetcher = MarketDataFetcher()
         current_spot = 0.0
         try:
-            import yfinance as yf
-            ticker = yf.Ticker("^BSESN")
-            market_data = ticker.history(period="1d", interval="5m") # Latest
+            market_data = fetcher.fetch_data("SENSEX", period="1d", interval="5m") # Latest
             if not market_data.empty:
                  current_spot = market_data['Close'].iloc[-1]
         except Exception:
@@ -196,28 +169,14 @@ def main():
             if current_prem:
                 print(f"Current Price for {symbol}: {current_prem} (Entry: {entry_price})")
                 
-                # SL/TP Logic
-                # SL: 30% loss
-                sl_price = entry_price * 0.7
-                # TP: 50% profit (1:1.5 approx) or Trailing
-                tp_price = entry_price * 1.5
-                
-                if current_prem <= sl_price:
-                    print(f"STOP LOSS HIT! Exiting @ {current_prem}")
-                    prev["outcome"] = "loss"
-                    prev["exit_price"] = current_prem
-                    prev["exit_reason"] = "SL Hit"
-                    prev["status"] = "CLOSED"
-                    state[today_key] = prev
-                    with open(state_path, "w", encoding="utf-8") as f:
-                        json.dump(state, f, indent=2)
-                    return # Exit after closing
-                    
-                elif current_prem >= tp_price:
-                    print(f"TARGET HIT! Exiting @ {current_prem}")
-                    prev["outcome"] = "profit"
+                # SL/TP Logic: SL at 30% loss, TP at 50% profit
+                exit_hit = check_exit(entry_price, current_prem)
+                if exit_hit:
+                    outcome, reason = exit_hit
+                    print(f"{'STOP LOSS HIT' if outcome == 'loss' else 'TARGET HIT'}! Exiting @ {current_prem}")
+                    prev["outcome"] = outcome
                     prev["exit_price"] = current_prem
-                    prev["exit_reason"] = "TP Hit"
+                    prev["exit_reason"] = reason
                     prev["status"] = "CLOSED"
                     state[today_key] = prev
                     with open(state_path, "w", encoding="utf-8") as f:
@@ -237,12 +196,9 @@ def main():
     # For now, plan says "Stop trading for the day if 2 consecutive Stop Losses are hit"
     # Or "Stop trading if Daily Target is reached".
     # Simplification: If outcome is profit, stop. If loss, maybe allow 1 more?
-    if prev.get("outcome") == "profit":
-        print("Daily Target Reached (Profit). No more trades.")
-        return
-        
-    if prev.get("outcome") == "loss" and trades_done >= 2:
-        print("Max daily losses reached. No more trades.")
+    blocked = entry_block_reason(prev)
+    if blocked:
+        print(blocked)
         return
         
     # --- TRADE MANAGEMENT END ---
@@ -253,16 +209,25 @@ def main():
     current_spot = 0.0
     signal = {"action": "WAIT"}
     
+    engine_path = os.path.join(backend_dir, "signals", f"indicator_state_{args.index.upper()}.json")
+    engine = load_indicator_engine(engine_path)
+    
     try:
-        import yfinance as yf
-        ticker = yf.Ticker("^BSESN")
-        market_data = ticker.history(period="5d", interval="5m")
+        fetch_period = intraday_fetch_period(engine)
+        market_data = fetcher.fetch_data("SENSEX", period=fetch_period, interval="5m")
         
         if market_data.empty:
             print("No market data available. Exiting.")
             return
             
-        strategy = TradingStrategy(market_data)
+        if engine is None or fetch_period == "5d":
+            # Saved state is missing or too old to bridge the gap: rebuild from the window
+            engine = IncrementalIndicators()
+        applied = engine.update_from_dataframe(market_data)
+        print(f"Indicator engine: applied {applied} bar(s) ({fetch_period} fetch, {engine.count} total)")
+        engine.save(engine_path)
+        
+        strategy = TradingStrategy(market_data, indicators=engine.snapshot())
         signal = strategy.get_signal()
         current_spot = strategy.indicators.get('current_price', 0.0)
         print(f"Spot: {current_spot}")
@@ -277,27 +242,13 @@ def main():
         return
     # --- STRATEGY EXECUTION END ---
 
-    eff_spread = max_spread_pct * (0.75 if is_expiry else 1.0)
-    eff_oi = oi_change_pct + (0.05 if is_expiry else 0.0)
+    eff_spread, eff_oi = expiry_adjusted_filters(max_spread_pct, oi_change_pct, is_expiry)
     
     # Pass current_spot to fetch_option_chain for mock generation if needed
-    contracts = fetch_option_chain(url, current_spot)
+    chain = OptionChain(fetch_option_chain(url, current_spot))
     
-    # Sort contracts by premium (cheaper first) to find affordable ones
-    contracts.sort(key=lambda x: float(x.get("premium", 0.0)))
-    
-    selected = None
-    
-    for c in contracts:
-        symbol = c.get("symbol", "")
-        premium = float(c.get("premium", 0.0))
-        d_oi = float(c.get("oi_change_pct", 0.0))
-        spread = float(c.get("spread_pct", 1.0))
-        c_type = "CE" if "CE" in symbol else "PE" if "PE" in symbol else "UNKNOWN"
-        
-        if passes_filters(premium, spread, d_oi, premium_min, premium_max, eff_spread, eff_oi, signal["action"], c_type):
-            selected = {"symbol": symbol, "premium": premium, "type": c_type}
-            break
+    # Cheapest contract that passes the filters for the signal
+    selected = chain.select(signal["action"], premium_min, premium_max, eff_spread, eff_oi)
             
     if not selected:
         print("No candidate passed filters.")
@@ -2,6 +2,7 @@ import os
 import sys
 import json
 import logging
+import math
 from datetime import datetime
 
 # Add parent directory to path
@@ -9,11 +10,60 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')
 
 from backend.app.services.data_fetcher import MarketDataFetcher
 from backend.app.services.sentiment_engine import MarketSentimentEngine, SentimentInput
+from backend.app.services.implied_vol import VolSurface
+from backend.app.services.trade_rules import parse_contract
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def fetch_chain_snapshot(url):
+    """Contracts of the OPTION_CHAIN_URL JSON feed ({"contracts": [...]}), or []"""
+    if not url:
+        return []
+    try:
+        import requests
+        r = requests.get(url, timeout=10)
+        return r.json().get("contracts", [])
+    except Exception as e:
+        logger.warning(f"Option chain unavailable: {e}")
+        return []
+
+def atm_implied_vol(contracts, spot, as_of=None):
+    """
+    Nearest-expiry ATM implied volatility (%) of a chain snapshot, or None.
+    Contracts carry symbol (e.g. SENSEX26JAN82000CE), premium and an ISO
+    expiry date; OPTION_EXPIRY supplies the date when the feed has none.
+    """
+    default_expiry = os.environ.get("OPTION_EXPIRY")
+    rate = float(os.environ.get("RISK_FREE_RATE", 0.065))
+    strikes, expiries, types, premiums = [], [], [], []
+    for c in contracts:
+        parsed = parse_contract(c.get("symbol", ""))
+        expiry = c.get("expiry") or default_expiry
+        if not parsed or not expiry or c.get("premium") is None:
+            continue
+        strikes.append(parsed[0])
+        types.append(parsed[1])
+        expiries.append(datetime.strptime(str(expiry)[:10], "%Y-%m-%d").date())
+        premiums.append(float(c["premium"]))
+    if not strikes or not spot:
+        return None
+    surface = VolSurface.from_chain(spot, strikes, expiries, types, premiums, rate=rate, as_of=as_of)
+    atm_iv = float(surface.atm_iv())
+    return round(atm_iv * 100, 2) if math.isfinite(atm_iv) else None
+
+def previous_atm_iv(output_path):
+    """ATM IV saved by the last run on an earlier day"""
+    try:
+        with open(output_path) as f:
+            previous = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if previous.get("date") == datetime.now().strftime("%Y-%m-%d"):
+        return previous.get("previous_atm_iv")
+    return previous.get("atm_iv")
+
 def fetch_and_analyze():
     """
     Orchestrates the data fetching and sentiment analysis.
@@ -26,7 +76,12 @@ def fetch_and_analyze():
     
     # 1. Fetch Data
     logger.info("Fetching Market Data...")
-    market_summary = fetcher.get_market_summary()
+    market_summary, timings = fetcher.get_market_summary_timed()
+    for name, timing in sorted(timings.items(), key=lambda item: -item[1]['seconds']):
+        logger.info(f"  {name} ({timing['symbol']}): {timing['seconds']:.2f}s [{timing['status']}]")
+    if timings:
+        slowest = max(timings, key=lambda name: timings[name]['seconds'])
+        logger.info(f"Slowest feed: {slowest} ({timings[slowest]['seconds']:.2f}s)")
     
     # Extract Global Cues
     us_indices = {}
@@ -47,6 +102,17 @@ def fetch_and_analyze():
     if market_summary.get('INDIAVIX'):
         vix_change = market_summary['INDIAVIX']['change_pct']
     
+    # ATM implied volatility from the option chain snapshot vs the last saved run
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../data')
+    output_path = os.path.join(data_dir, 'daily_sentiment.json')
+    spot = (market_summary.get('SENSEX') or {}).get('current')
+    atm_iv = atm_implied_vol(fetch_chain_snapshot(os.environ.get("OPTION_CHAIN_URL", "")), spot)
+    prev_iv = previous_atm_iv(output_path)
+    iv_change = None
+    if atm_iv is not None and prev_iv:
+        iv_change = (atm_iv / prev_iv - 1) * 100
+        logger.info(f"ATM IV: {atm_iv:.2f}% (previous {prev_iv:.2f}%, change {iv_change:+.1f}%)")
+
     # Note: Advanced data (PCR, OI, FII) would need specialized fetchers or scraping.
     # For now, we use the indices data we have.
     
@@ -55,6 +121,7 @@ def fetch_and_analyze():
         us_indices_change_pct=us_indices,
         asia_market_change_pct=asia_markets,
         india_vix_change_pct=vix_change,
+        atm_iv_change_pct=iv_change,
         # Default/Placeholder for missing data points
         sensex_prev_close_vs_high_low="MID",
         pcr_total=1.0, # Neutral default
@@ -71,6 +138,8 @@ def fetch_and_analyze():
         "timestamp": datetime.now().strftime("%H:%M:%S"),
         "market_sentiment": output.market_sentiment,
         "confidence_score": output.confidence_score,
+        "atm_iv": atm_iv,
+        "previous_atm_iv": prev_iv,
         "supporting_factors": output.supporting_factors,
         "risk_notes": output.risk_notes,
         "trading_implication": {
@@ -79,11 +148,9 @@ def fetch_and_analyze():
         }
     }
     
-    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../data')
     if not os.path.exists(data_dir):
         os.makedirs(data_dir)
         
-    output_path = os.path.join(data_dir, 'daily_sentiment.json')
     with open(output_path, 'w') as f:
         json.dump(output_data, f, indent=4)
         
@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+import argparse
+from dotenv import load_dotenv
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+load_dotenv(os.path.join(backend_dir, ".env"))
+
+from app.services.data_fetcher import MarketDataFetcher
+from app.services.param_sweep import ParamSweep, grid_configs, random_configs
+
+DEFAULT_SYMBOLS = ['SENSEX', 'BANKNIFTY', 'NIFTY50']
+
+def main():
+    """
+    Sweep the actionable-plan thresholds and confidence weights over cached
+    daily history and print the best configurations.
+    """
+    p = argparse.ArgumentParser()
+    p.add_argument("--symbols", nargs="+", default=DEFAULT_SYMBOLS)
+    p.add_argument("--period", default="5y")
+    p.add_argument("--search", choices=["grid", "random"], default="grid")
+    p.add_argument("--samples", type=int, default=2000, help="configurations drawn by random search")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--horizon", type=int, default=5, help="bars each plan is followed for")
+    p.add_argument("--min-trades", type=int, default=20)
+    p.add_argument("--workers", type=int, default=os.cpu_count())
+    p.add_argument("--top", type=int, default=20)
+    p.add_argument("--out", help="write the full ranking to this CSV")
+    args = p.parse_args()
+
+    fetcher = MarketDataFetcher()
+    data = {}
+    for symbol in args.symbols:
+        frame = fetcher.fetch_data(symbol, period=args.period, interval='1d')
+        if frame is None or frame.empty:
+            print(f"{symbol}: no data, skipped")
+            continue
+        data[symbol] = frame
+        print(f"{symbol}: {len(frame)} bars")
+    if not data:
+        sys.exit(1)
+
+    configs = grid_configs() if args.search == "grid" else random_configs(args.samples, seed=args.seed)
+    started = time.perf_counter()
+    ranking = ParamSweep(data, horizon=args.horizon, workers=args.workers).run(configs, min_trades=args.min_trades)
+    print(f"Evaluated {len(configs)} configurations in {time.perf_counter() - started:.1f}s ({args.workers} workers)")
+
+    if args.out:
+        ranking.to_csv(args.out, index=False)
+    print(ranking.head(args.top).to_string())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import os
+import sys
+import argparse
+from dotenv import load_dotenv
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+load_dotenv(os.path.join(backend_dir, ".env"))
+
+from app.services.data_fetcher import MarketDataFetcher
+from app.services.ml_service import LightGBMService
+
+DEFAULT_SYMBOLS = ['SENSEX', 'BANKNIFTY', 'NIFTY50']
+
+def main():
+    """
+    Retrain missing or stale LightGBM models outside the report/prediction path.
+    Staleness = model age, feature schema change or drift of recent features.
+    """
+    p = argparse.ArgumentParser()
+    p.add_argument("--symbols", nargs="+", default=DEFAULT_SYMBOLS)
+    p.add_argument("--model-dir", default="models")
+    p.add_argument("--period", default="2y")
+    p.add_argument("--force", action="store_true", help="retrain even if the model is fresh")
+    p.add_argument("--check", action="store_true", help="only report model status")
+    args = p.parse_args()
+
+    service = LightGBMService(model_dir=args.model_dir)
+    fetcher = MarketDataFetcher()
+    failures = 0
+
+    for symbol in args.symbols:
+        X = None
+        try:
+            X, _ = service._prepare_features(fetcher.fetch_data(symbol, period='3mo'))
+        except Exception as e:
+            print(f"{symbol}: could not fetch recent data for the drift check ({e})")
+
+        status = service.model_status(symbol, X)
+        metadata = status['metadata'] or {}
+        reasons = ', '.join(status['reasons']) or 'up to date'
+        print(f"{symbol}: {status['state']} ({reasons}); trained {metadata.get('trained_at', 'unknown')}, AUC {metadata.get('auc')}")
+
+        if args.check or (status['state'] == 'fresh' and not args.force):
+            continue
+        try:
+            if not service.train_model(symbol, period=args.period):
+                failures += 1
+        except Exception as e:
+            print(f"{symbol}: retrain failed ({e})")
+            failures += 1
+
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -15,16 +15,13 @@ def test_market_data():
     try:
         # Fetch 5-day data with 5-minute interval? 
         # yfinance history supports interval='5m' for recent data
-        ticker_symbol = fetcher.INDIAN_SYMBOLS['SENSEX']
-        import yfinance as yf
-        ticker = yf.Ticker(ticker_symbol)
         # Fetch 1 day of 5m data
-        data = ticker.history(period='1d', interval='5m')
-        
-        if data.empty:
-            print("No data received for SENSEX (5m). Market might be closed or API issue.")
+        try:
+            data = fetcher.fetch_data('SENSEX', period='1d', interval='5m')
+        except Exception as e:
+            print(f"No data received for SENSEX (5m). Market might be closed or API issue. ({e})")
             # Fallback to daily for testing logic
-            data = ticker.history(period='1mo', interval='1d')
+            data = fetcher.fetch_data('SENSEX', period='1mo', interval='1d')
             print("Fetched Daily data instead.")
         
         print(f"Data shape: {data.shape}")
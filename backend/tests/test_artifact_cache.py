@@ -0,0 +1,102 @@
+import sys
+import os
+import tempfile
+from datetime import datetime
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_reports
+from app.config import Config
+from app.services.artifact_cache import ArtifactCache, artifact_key
+from app.services.chart_generator import ChartGenerator
+from app.services.report_generator import ReportGenerator
+from app.services.retrain_scheduler import get_retrain_scheduler
+from test_indicator_cache import generate_sample_ohlcv
+
+def test_artifact_key():
+    print("Testing artifact keys...")
+    data = generate_sample_ohlcv(100)
+    assert artifact_key('chart', data, {'a': 1, 'b': 2}) == artifact_key('chart', data.copy(), {'b': 2, 'a': 1})
+    changed = data.copy()
+    changed.iloc[-1, changed.columns.get_loc('Close')] += 0.01
+    assert artifact_key('chart', data) != artifact_key('chart', changed)
+    assert artifact_key('chart', data) != artifact_key('chart', data.iloc[1:])
+
+def test_chart_reused_from_cache():
+    print("Testing chart reuse...")
+    data = generate_sample_ohlcv(120)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            cache = ArtifactCache(os.path.join(workdir, 'artifacts'))
+            path = ChartGenerator(cache).generate_chart('TEST', data)
+            assert cache.stats == {'hits': 0, 'misses': 1, 'stores': 1}
+
+            # A fresh generator never builds a figure on a hit
+            generator = ChartGenerator(cache)
+            draws = []
+            draw = generator._draw
+            generator._draw = lambda *args: (draws.append(args[2]), draw(*args))
+            assert generator.generate_chart('TEST', data) == path
+            assert draws == []
+            assert cache.stats['hits'] == 1
+            entry = cache.latest('chart', 'TEST')
+            assert os.path.samefile(entry['path'], path)
+            assert entry['inputs']['bars'] == 120
+
+            changed = data.copy()
+            changed.iloc[-1, changed.columns.get_loc('Close')] *= 1.01
+            generator.generate_chart('TEST', changed)
+            assert draws == ['TEST']
+            assert cache.get_stats()['entries'] == 2
+            assert not os.path.samefile(entry['path'], path)
+
+            assert cache.prune(max_age_days=-1) == 2
+            assert not os.listdir(cache.objects_dir)
+        finally:
+            os.chdir(cwd)
+
+def test_report_reused_from_cache():
+    print("Testing report reuse...")
+    cwd = os.getcwd()
+    original_source = Config.DATA_SOURCE
+    Config.DATA_SOURCE = 'synthetic'
+    created = []
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            prepared = generate_reports.prepare_report('SENSEX', datetime(2024, 12, 31))
+            get_retrain_scheduler().wait(timeout=120)
+            cache = ArtifactCache(os.path.join(workdir, 'artifacts'))
+            report_data = dict(prepared['report_data'])
+            report_data['chart_path'] = ChartGenerator(cache).generate_chart(
+                'SENSEX', prepared['market_data'], frame=prepared['indicator_frame'])
+
+            created.append(ReportGenerator(cache).generate_pdf(report_data, name_prefix='CACHE_TEST'))
+            created.append(ReportGenerator(cache).generate_pdf(report_data, name_prefix='CACHE_TEST_AGAIN'))
+            # chart + first PDF stored, second PDF reused
+            assert cache.stats['hits'] == 1 and cache.stats['stores'] == 2
+            assert os.path.samefile(created[0], created[1])
+            assert os.path.samefile(cache.latest('report', 'SENSEX')['path'], created[1])
+
+            # The signal is still logged for the reused report
+            with open(os.path.join('signals', 'signals_log.json')) as f:
+                assert len(f.readlines()) == 2
+
+            report_data['ai_commentary'] = 'different'
+            created.append(ReportGenerator(cache).generate_pdf(report_data, name_prefix='CACHE_TEST_CHANGED'))
+            assert not os.path.samefile(created[0], created[2])
+        finally:
+            for path in created:
+                if os.path.exists(path):
+                    os.remove(path)
+            Config.DATA_SOURCE = original_source
+            os.chdir(cwd)
+
+if __name__ == "__main__":
+    test_artifact_key()
+    test_chart_reused_from_cache()
+    test_report_reused_from_cache()
+    print("All artifact cache tests passed!")
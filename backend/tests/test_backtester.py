@@ -0,0 +1,85 @@
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.backtester import Backtester
+from app.services.strategy import TradingStrategy
+from app.services import trade_rules
+
+def generate_intraday_bars(n_days=20, seed=3, start='2025-07-01'):
+    """Synthetic 5m session bars (09:15-15:25 IST)"""
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range(start, periods=n_days)
+    index = pd.DatetimeIndex([day + pd.Timedelta(hours=9, minutes=15 + 5 * k) for day in days for k in range(75)])
+    close = 80000 + np.cumsum(rng.normal(0, 40, len(index)))
+    open_ = close + rng.normal(0, 10, len(index))
+    return pd.DataFrame({'Open': open_, 'High': np.maximum(open_, close) + 15, 'Low': np.minimum(open_, close) - 15,
+                         'Close': close, 'Volume': 1.0}, index=index.tz_localize('Asia/Kolkata'))
+
+def test_trade_rules():
+    print("Testing shared trade rules...")
+    assert trade_rules.check_exit(100.0, 70.0) == ('loss', 'SL Hit')
+    assert trade_rules.check_exit(100.0, 150.0) == ('profit', 'TP Hit')
+    assert trade_rules.check_exit(100.0, 120.0) is None
+
+    assert trade_rules.entry_block_reason({}) is None
+    assert trade_rules.entry_block_reason({'trades_executed': 1}) == 'Position open'
+    assert trade_rules.entry_block_reason({'trades_executed': 1, 'outcome': 'loss'}) is None
+    assert trade_rules.entry_block_reason({'trades_executed': 2, 'outcome': 'loss'}) is not None
+    assert trade_rules.entry_block_reason({'trades_executed': 1, 'outcome': 'profit'}) is not None
+
+    chain = trade_rules.mock_chain(80040.0)
+    assert len(chain) == 10 and chain[0]['symbol'] == 'SENSEX26JAN79800CE'
+    # ITM call: intrinsic 240 + 150 - 24
+    assert chain[0]['premium'] == 366.0
+    selected = trade_rules.select_contract(chain, 'BUY_PUT', 50, 200, 0.02, 0.08)
+    assert selected['type'] == 'PE' and selected['premium'] == min(
+        c['premium'] for c in chain if c['symbol'].endswith('PE') and c['premium'] >= 50)
+    spread, oi = trade_rules.expiry_adjusted_filters(0.02, 0.08, True)
+    assert trade_rules.select_contract(chain, 'BUY_PUT', 50, 200, spread, oi) is None
+
+def test_backtest_follows_live_rules():
+    print("Testing backtest ledger against the live rules...")
+    data = generate_intraday_bars()
+    result = Backtester(capital=20000, lot_size=20).run(data)
+    trades, equity = result['trades'], result['equity']
+    assert len(trades) > 0 and len(equity) == len(data)
+
+    for _, day in trades.groupby('day'):
+        assert len(day) <= trade_rules.MAX_TRADES_PER_DAY
+        # A second trade only follows a stopped-out first one
+        if len(day) == 2:
+            assert day['outcome'].iloc[0] == 'loss'
+    window = (trades['entry_time'].dt.time >= pd.Timestamp('10:00').time()) & \
+             (trades['exit_time'].dt.time <= pd.Timestamp('14:00').time())
+    assert window.all()
+    assert (trades['entry_time'].dt.date == trades['exit_time'].dt.date).all()
+    assert set(trades['exit_reason']) <= {'SL Hit', 'TP Hit', 'EOD'}
+    assert np.isclose(equity.iloc[-1], 20000 + trades['pnl'].sum())
+
+    # Entries use the same signal the batch strategy computes on the bars seen so far
+    for _, trade in trades.head(3).iterrows():
+        seen = data[data.index <= trade['entry_time']]
+        assert TradingStrategy(seen).get_signal()['action'] == trade['signal']
+    print(f"Summary: {result['summary']}")
+
+def test_backtest_speed():
+    print("Testing backtest speed...")
+    data = generate_intraday_bars(n_days=60)
+    started = time.perf_counter()
+    Backtester(capital=20000, lot_size=20).run(data)
+    elapsed = time.perf_counter() - started
+    print(f"Replayed {len(data)} bars in {elapsed:.2f}s")
+    assert elapsed < 5.0
+
+if __name__ == "__main__":
+    test_trade_rules()
+    test_backtest_follows_live_rules()
+    test_backtest_speed()
+    print("All backtester tests passed!")
@@ -0,0 +1,120 @@
+import sys
+import os
+import json
+import tempfile
+import pandas as pd
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.bar_cache import BarCache, slice_period
+from app.services.data_fetcher import MarketDataFetcher
+from test_indicator_cache import generate_sample_ohlcv
+
+class FakeDownloader:
+    """Serves bars from a fixed history up to `now`, recording every call"""
+    def __init__(self, history):
+        self.history = history
+        self.now = history.index[-1]
+        self.calls = []
+
+    def __call__(self, symbol, period=None, start=None, interval='1d'):
+        self.calls.append({'period': period, 'start': start})
+        available = self.history[self.history.index <= self.now]
+        if start is not None:
+            return available[available.index >= start]
+        return slice_period(available, period)
+
+def make_history():
+    data = generate_sample_ohlcv(n_rows=400)
+    data.index = data.index.tz_localize('Asia/Kolkata')
+    return data
+
+def test_delta_fetch():
+    print("Testing bar cache delta fetch...")
+    history = make_history()
+    download = FakeDownloader(history)
+    download.now = history.index[-11]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = BarCache(cache_dir=cache_dir, refresh_after=0)
+        first = cache.get('^NSEI', '1y', '1d', download)
+        assert download.calls[-1]['period'] == '1y'
+
+        # Ten new bars later only the tail is requested
+        download.now = history.index[-1]
+        data = cache.get('^NSEI', '3mo', '1d', download)
+        assert download.calls[-1]['start'] == first.index[-1]
+        assert data.index[-1] == history.index[-1]
+        assert data.index[0] > history.index[-1] - pd.DateOffset(months=3)
+        assert len(cache.load('^NSEI', '1d')) == len(first) + 10
+
+        # A longer period than ever fetched needs a full download
+        cache.get('^NSEI', '2y', '1d', download)
+        assert download.calls[-1]['period'] == '2y'
+    print(f"Downloads: {len(download.calls)}")
+
+def test_empty_delta():
+    print("Testing bar cache with an empty delta download...")
+    history = make_history()
+    download = FakeDownloader(history)
+    download.now = history.index[-11]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = BarCache(cache_dir=cache_dir, refresh_after=0)
+        cache.get('^NSEI', '6mo', '1d', download)
+        meta_path = next(os.path.join(cache_dir, f) for f in os.listdir(cache_dir) if f.endswith('.json'))
+
+        def read_updated():
+            with open(meta_path, encoding='utf-8') as f:
+                return json.load(f)['updated']
+
+        # An empty delta is no refresh: the full window is downloaded
+        download.now = history.index[-1]
+        full = lambda symbol, period=None, start=None, interval='1d': \
+            download.history.iloc[:0] if start is not None else download(symbol, period=period, interval=interval)
+        updated = read_updated()
+        data = cache.get('^NSEI', '6mo', '1d', full)
+        assert download.calls[-1] == {'period': '6mo', 'start': None}
+        assert data.index[-1] == history.index[-1]
+        assert read_updated() > updated
+
+        # Nothing at all comes back: cached bars are served and stay stale
+        updated = read_updated()
+        data = cache.get('^NSEI', '6mo', '1d', lambda *a, **k: history.iloc[:0])
+        assert data.index[-1] == history.index[-1]
+        assert read_updated() == updated
+    print("Empty delta fell back to a full download")
+
+def test_refresh_window_and_offline():
+    print("Testing refresh window and offline mode...")
+    download = FakeDownloader(make_history())
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = BarCache(cache_dir=cache_dir, refresh_after=3600)
+        cache.get('^NSEI', '6mo', '1d', download)
+        cache.get('^NSEI', '3mo', '1d', download)
+        assert len(download.calls) == 1
+
+        offline = BarCache(cache_dir=cache_dir, offline=True)
+        data = offline.get('^NSEI', '5d', '1d', lambda *a, **k: 1 / 0)
+        assert len(data) == 5
+        try:
+            offline.get('^NSEBANK', '5d', '1d', download)
+            assert False, "expected a cache miss"
+        except ValueError:
+            pass
+    print("Offline mode served from disk")
+
+def test_fetcher_uses_cache():
+    print("Testing MarketDataFetcher with an offline cache...")
+    download = FakeDownloader(make_history())
+    with tempfile.TemporaryDirectory() as cache_dir:
+        BarCache(cache_dir=cache_dir).get('^NSEBANK', '1y', '1d', download)
+        fetcher = MarketDataFetcher(cache=BarCache(cache_dir=cache_dir, offline=True))
+        data = fetcher.fetch_data('BANKNIFTY', period='1mo')
+        assert not data.empty and data.index[-1] == download.history.index[-1]
+    print(f"Fetched {len(data)} bars without network")
+
+if __name__ == "__main__":
+    test_delta_fetch()
+    test_empty_delta()
+    test_refresh_window_and_offline()
+    test_fetcher_uses_cache()
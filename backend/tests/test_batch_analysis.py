@@ -0,0 +1,72 @@
+import sys
+import os
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.batch_analysis import BatchTechnicalAnalyzer
+from app.services.technical_analysis import TechnicalAnalyzer
+from test_indicator_cache import generate_sample_ohlcv
+
+def test_batch_matches_per_symbol():
+    print("Testing batch analysis against per-symbol analyzer...")
+    frames = {f"SYM{i}": generate_sample_ohlcv(n_rows=260, seed=i) for i in range(8)}
+    results = BatchTechnicalAnalyzer.from_frames(frames).analyze()
+    assert [r['symbol'] for r in results] == list(frames)
+
+    for result in results:
+        analyzer = TechnicalAnalyzer(frames[result['symbol']])
+        assert result['indicators'] == analyzer.calculate_all_indicators()
+        assert result['trend'] == analyzer.get_trend()
+        assert result['market_regime'] == analyzer.get_market_regime()
+        assert result['trade_bias'] == analyzer.get_trade_bias()
+        assert result['pivots'] == analyzer.calculate_pivot_points()
+        assert result['cpr'] == analyzer.calculate_cpr_levels()
+    print(f"{len(results)} symbols match")
+
+def test_batch_uses_plan_params():
+    print("Testing batch analysis with non-default plan params...")
+    params = {'adx_strong': 18, 'adx_weak': 12, 'atr_pct_volatile': 1.0,
+              'weight_trend': 35, 'weight_adx': 22.5, 'weight_rsi': 27.5, 'weight_volume': 15}
+    frames = {f"SYM{i}": generate_sample_ohlcv(n_rows=260, seed=i) for i in range(8)}
+    results = BatchTechnicalAnalyzer.from_frames(frames, plan_params=params).analyze()
+    defaults = BatchTechnicalAnalyzer.from_frames(frames).analyze()
+
+    for result in results:
+        analyzer = TechnicalAnalyzer(frames[result['symbol']], plan_params=params)
+        assert result['market_regime'] == analyzer.get_market_regime()
+        assert result['trade_bias'] == analyzer.get_trade_bias()
+    assert any(r['trade_bias'] != d['trade_bias'] for r, d in zip(results, defaults))
+    assert any(r['market_regime'] != d['market_regime'] for r, d in zip(results, defaults))
+    print(f"{len(results)} symbols match with custom params")
+
+def test_batch_frames_match_indicator_frame():
+    print("Testing batch indicator frames...")
+    frames = {f"SYM{i}": generate_sample_ohlcv(n_rows=120, seed=i) for i in range(3)}
+    batch_frames = BatchTechnicalAnalyzer.from_frames(frames).indicator_frames()
+
+    for symbol, df in frames.items():
+        expected = TechnicalAnalyzer(df).indicator_frame()
+        for column in batch_frames:
+            got = batch_frames[column][symbol].to_numpy()
+            want = expected[column].to_numpy()
+            assert np.array_equal(np.isnan(got), np.isnan(want)), column
+            mask = ~np.isnan(want)
+            assert np.allclose(got[mask], want[mask], rtol=1e-9, atol=1e-9), column
+    print("Batch frames match")
+
+def test_short_history():
+    print("Testing batch analysis on short history...")
+    frames = {f"SYM{i}": generate_sample_ohlcv(n_rows=15, seed=i) for i in range(2)}
+    for result in BatchTechnicalAnalyzer.from_frames(frames).analyze():
+        analyzer = TechnicalAnalyzer(frames[result['symbol']])
+        assert result['indicators'] == analyzer.calculate_all_indicators()
+        assert result['trade_bias'] == analyzer.get_trade_bias()
+    print("Short history OK")
+
+if __name__ == "__main__":
+    test_batch_matches_per_symbol()
+    test_batch_uses_plan_params()
+    test_batch_frames_match_indicator_frame()
+    test_short_history()
@@ -0,0 +1,53 @@
+import sys
+import os
+import tempfile
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection, PolyCollection
+
+from app.services.chart_generator import ChartGenerator
+from test_indicator_cache import generate_sample_ohlcv
+
+def test_chart_uses_collections_and_reuses_figure():
+    print("Testing chart generation...")
+    data = generate_sample_ohlcv(250)
+    cwd = os.getcwd()
+    open_before = set(plt.get_fignums())
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            generator = ChartGenerator()
+            # The price axis as it is saved holds one collection per layer
+            saved_kinds = []
+            save = generator._save
+            generator._save = lambda fig, *args: (saved_kinds.append([type(c) for c in fig.axes[0].collections]),
+                                                  save(fig, *args))
+            path = generator.generate_chart("TEST", data, preview_dpi=50)
+            preview = generator.preview_path("TEST")
+
+            assert os.path.exists(path) and os.path.exists(preview)
+            assert os.path.getsize(preview) < os.path.getsize(path)
+            print(f"chart {os.path.getsize(path)} bytes, preview {os.path.getsize(preview)} bytes")
+            assert LineCollection in saved_kinds[0] and PolyCollection in saved_kinds[0]
+
+            # Later charts reuse the figure and draw the same image as a fresh one
+            other = generate_sample_ohlcv(120, seed=5)
+            with open(generator.generate_chart("OTHER", other), 'rb') as f:
+                reused = f.read()
+            assert len(set(plt.get_fignums()) - open_before) == 1
+            generator.close()
+            assert set(plt.get_fignums()) == open_before
+            with ChartGenerator() as fresh:
+                with open(fresh.generate_chart("OTHER", other), 'rb') as f:
+                    assert f.read() == reused
+            assert set(plt.get_fignums()) == open_before
+            assert not [name for name in os.listdir('charts') if name.endswith('.tmp.png')]
+        finally:
+            os.chdir(cwd)
+
+if __name__ == "__main__":
+    test_chart_uses_collections_and_reuses_figure()
+    print("All chart generator tests passed!")
@@ -1,6 +1,7 @@
 import requests
 import pytest
 import time
+from test_end_to_end import wait_for_job
 
 @pytest.mark.parametrize("symbol", ["RELIANCE.NS", "TCS.NS", "INFY.NS"])
 def test_symbol(symbol):
@@ -15,16 +16,16 @@ def test_symbol(symbol):
     try:
         start_time = time.time()
         response = requests.post(url, json=payload, headers=headers)
-        duration = time.time() - start_time
         
-        if response.status_code == 200:
-            data = response.json()
-            if data['success']:
+        if response.status_code == 202:
+            data = wait_for_job(response)
+            duration = time.time() - start_time
+            if data.get('success'):
                 print(f"✅ Success ({duration:.2f}s)")
                 print(f"   Report: {data['report_path']}")
                 print(f"   Price: {data['data']['indicators']['current_price']}")
             else:
-                print(f"❌ Failed: API returned success=False")
+                print(f"❌ Failed: report job did not succeed")
                 print(data)
         else:
             print(f"❌ Failed: Status Code {response.status_code}")
@@ -41,12 +42,13 @@ def test_invalid_symbol():
     
     try:
         response = requests.post(url, json=payload, headers=headers)
-        if response.status_code != 200:
+        if response.status_code != 202:
              # Expecting 400 or 500, but hopefully handled gracefully
              print(f"✅ Correctly handled invalid symbol (Status: {response.status_code})")
              print(f"   Response: {response.text}")
         else:
-            data = response.json()
+            # The symbol is only checked when the job fetches data
+            data = wait_for_job(response)
             if not data.get('success'):
                 print(f"✅ Correctly handled invalid symbol (success=False)")
                 print(f"   Error: {data.get('error')}")
@@ -1,8 +1,22 @@
 import requests
 import os
+import time
+
+BASE_URL = 'http://localhost:5000'
+
+def wait_for_job(response, timeout=300):
+    """Poll a 202 job response until the report job finishes; returns the final status"""
+    status_url = BASE_URL + response.json()['status_url']
+    deadline = time.time() + timeout
+    while True:
+        status = requests.get(status_url).json()
+        if status.get('status') in ('done', 'failed') or time.time() > deadline:
+            return status
+        print(f"   {status.get('stage')} ({status.get('progress', 0):.0%})")
+        time.sleep(1)
 
 def test_generate_report():
-    url = 'http://localhost:5000/api/reports/generate'
+    url = f'{BASE_URL}/api/reports/generate'
     payload = {
         'symbol': 'BANKNIFTY',
         'period': '3mo'
@@ -12,8 +26,8 @@ def test_generate_report():
     try:
         print(f"Sending request to {url}...")
         response = requests.post(url, json=payload, headers=headers)
-        if response.status_code == 200:
-            data = response.json()
+        if response.status_code == 202:
+            data = wait_for_job(response)
             if data.get('success'):
                 report_path = data.get('report_path')
                 print(f"Report generated successfully: {report_path}")
@@ -23,7 +37,7 @@ def test_generate_report():
                 else:
                     print("❌ PDF file NOT found.")
             else:
-                print("❌ API returned success=False")
+                print("❌ Report job did not succeed")
                 print(data)
         else:
             print(f"❌ Request failed with status code {response.status_code}")
@@ -0,0 +1,127 @@
+import os
+import sys
+import time
+from datetime import date, datetime
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.greeks import bsm, black76, option_data_rows, price_chain, years_to_expiry
+
+def test_reference_price_and_parity():
+    print("\nTesting Black-Scholes reference values...")
+    # Hull: S=42, K=40, r=10%, vol=20%, T=0.5 -> call 4.76, put 0.81
+    call = bsm(42, 40, 0.5, 0.2, 0.1, is_call=True)
+    put = bsm(42, 40, 0.5, 0.2, 0.1, is_call=False)
+    assert abs(call['price'] - 4.7594) < 1e-3
+    assert abs(put['price'] - 0.8086) < 1e-3
+    # Put-call parity and delta(call) - delta(put) = 1 without carry loss
+    assert abs(call['price'] - put['price'] - (42 - 40 * np.exp(-0.05))) < 1e-9
+    assert abs(call['delta'] - put['delta'] - 1) < 1e-12
+    assert abs(call['gamma'] - put['gamma']) < 1e-12
+
+    # Black-76: parity discounts the forward
+    c76 = black76(50000, 49000, 0.1, 0.15, 0.06, is_call=True)
+    p76 = black76(50000, 49000, 0.1, 0.15, 0.06, is_call=False)
+    assert abs(c76['price'] - p76['price'] - np.exp(-0.006) * 1000) < 1e-6
+    print("Reference prices and parity hold.")
+
+def test_greeks_match_finite_differences():
+    print("\nTesting greeks against finite differences...")
+    spot, strike, t, vol, r = 82000.0, 82500.0, 7 / 365, 0.13, 0.065
+    for is_call in (True, False):
+        g = bsm(spot, strike, t, vol, r, is_call=is_call)
+        price = lambda **kw: float(bsm(kw.get('s', spot), strike, kw.get('t', t), kw.get('v', vol), r, is_call=is_call)['price'])
+        h = 1.0
+        delta = (price(s=spot + h) - price(s=spot - h)) / (2 * h)
+        gamma = (price(s=spot + h) - 2 * price() + price(s=spot - h)) / h ** 2
+        vega = (price(v=vol + 1e-4) - price(v=vol - 1e-4)) / 2e-4 / 100
+        theta = (price(t=t - 1 / 365 / 24) - price()) * 24
+        assert abs(g['delta'] - delta) < 1e-6
+        assert abs(g['gamma'] - gamma) / gamma < 1e-3
+        assert abs(g['vega'] - vega) / vega < 1e-6
+        assert abs(g['theta'] - theta) / abs(theta) < 0.01
+    print("Greeks match finite differences.")
+
+def test_price_chain_grid():
+    print("\nTesting whole-chain pricing...")
+    strikes = np.arange(78000, 86100, 100)
+    expiries = [date(2026, 1, 8), date(2026, 1, 15), date(2026, 1, 29)]
+    as_of = datetime(2026, 1, 5, 10, 0)
+    vols = np.full((len(expiries), len(strikes)), 0.14)
+    chain = price_chain(82000, strikes, expiries, vols, rate=0.065, as_of=as_of)
+    n = len(expiries) * len(strikes) * 2
+    assert all(len(chain[key]) == n for key in chain)
+    # Expiry-major, strike, then CE/PE
+    assert chain['expiry'][0] == expiries[0] and chain['expiry'][-1] == expiries[-1]
+    assert list(chain['option_type'][:4]) == ['CE', 'PE', 'CE', 'PE']
+    assert chain['strike'][0] == chain['strike'][1] == 78000
+    assert abs(chain['t'][0] - (3 + 5.5 / 24) / 365) < 1e-9
+    # Same results as pricing each contract on its own
+    i = 2 * len(strikes) + 2 * 40 + 1
+    single = bsm(82000, chain['strike'][i], chain['t'][i], 0.14, 0.065, is_call=False)
+    assert all(abs(chain[k][i] - single[k]) < 1e-9 for k in ('price', 'delta', 'gamma', 'theta', 'vega'))
+    # Later expiries are worth more, calls fall with the strike
+    ce = chain['option_type'] == 'CE'
+    first = chain['expiry'] == expiries[0]
+    last = chain['expiry'] == expiries[-1]
+    assert (chain['price'][ce & last] > chain['price'][ce & first]).all()
+    assert (np.diff(chain['price'][ce & first]) < 0).all()
+    assert np.isclose(years_to_expiry([0.25])[0], 0.25)
+
+    # An expired contract stays finite
+    expired = bsm(82000, 82000, 0.0, 0.14, 0.065, is_call=True)
+    assert all(np.isfinite(expired[k]) for k in expired)
+
+    # Repricing a large chain is a vectorized call, not a loop
+    strikes = np.arange(70000, 94000, 100)
+    expiries = [date(2026, 1, d) for d in (8, 15, 22, 29)] + [date(2026, 2, 26), date(2026, 3, 26)]
+    price_chain(82000, strikes, expiries, 0.14, 0.065, as_of=as_of)
+    runs = 20
+    start = time.perf_counter()
+    for _ in range(runs):
+        chain = price_chain(82000, strikes, expiries, 0.14, 0.065, as_of=as_of)
+    per_contract = (time.perf_counter() - start) / runs / len(chain['price'])
+    print(f"{len(chain['price'])} contracts: {per_contract * 1e6:.2f} us per contract")
+    assert per_contract < 20e-6
+    print("Chain pricing works.")
+
+def test_write_option_data():
+    print("\nTesting the options_data bulk write...")
+    from app import create_app, db
+    from app.config import Config
+    from app.models import OptionData
+
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+
+    as_of = datetime(2026, 1, 5, 10, 0)
+    chain = price_chain(52000, np.arange(51000, 53100, 100), [date(2026, 1, 27)], 0.16, 0.065, as_of=as_of)
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        from app.services.greeks import write_option_data
+        written = write_option_data('BANKNIFTY', chain, timestamp=as_of)
+        assert written == len(chain['price']) == 42
+        rows = OptionData.query.filter_by(option_type='CALL').order_by(OptionData.strike_price).all()
+        assert len(rows) == 21
+        assert rows[0].expiry_date == date(2026, 1, 27) and rows[0].timestamp == as_of
+        assert abs(float(rows[10].delta) - round(chain['delta'][20], 4)) < 1e-9
+        assert float(rows[10].gamma) > 0 and float(rows[10].theta) < 0
+        db.session.remove()
+        db.drop_all()
+
+    try:
+        option_data_rows('BANKNIFTY', price_chain(52000, [52000], [0.1], 0.16))
+        assert False, "expected ValueError for expiries given in years"
+    except ValueError:
+        pass
+    print("Bulk write works.")
+
+if __name__ == "__main__":
+    test_reference_price_and_parity()
+    test_greeks_match_finite_differences()
+    test_price_chain_grid()
+    test_write_option_data()
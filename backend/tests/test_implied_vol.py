@@ -0,0 +1,106 @@
+import os
+import sys
+import time
+from datetime import date, datetime
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.greeks import bsm, price_chain
+from app.services.implied_vol import VolSmile, VolSurface, implied_vol
+from app.services.sentiment_engine import MarketSentimentEngine, SentimentInput
+
+def test_round_trip_and_masking():
+    print("\nTesting implied volatility round trips...")
+    rng = np.random.default_rng(7)
+    n = 5000
+    spot = 82000.0
+    strike = spot * np.exp(rng.uniform(-0.15, 0.15, n))
+    t = rng.uniform(1 / 365, 0.5, n)
+    vol = rng.uniform(0.08, 0.6, n)
+    is_call = rng.random(n) < 0.5
+    price = bsm(spot, strike, t, vol, 0.065, is_call=is_call)['price']
+
+    solved = implied_vol(price, spot, strike, t, 0.065, is_call=is_call)
+    ok = solved['converged']
+    assert ok.mean() > 0.99
+    # Below one tick (0.05) of time value the premium says nothing about the volatility
+    intrinsic = np.where(is_call, np.maximum(spot - strike * np.exp(-0.065 * t), 0),
+                         np.maximum(strike * np.exp(-0.065 * t) - spot, 0))
+    quoted = price - intrinsic >= 0.05
+    assert ok[quoted].all()
+    assert np.abs(solved['iv'][quoted] - vol[quoted]).max() < 1e-6
+    repriced = bsm(spot, strike[ok], t[ok], solved['iv'][ok], 0.065, is_call=is_call[ok])['price']
+    assert np.abs(repriced - price[ok]).max() <= 1e-6
+    assert solved['iterations'][ok].max() <= 50
+    assert np.isnan(solved['iv'][~ok]).all()
+
+    # Below intrinsic, above the spot, expired and NaN premiums are masked
+    bad = implied_vol([100.0, 90000.0, 500.0, np.nan], 82000, [81000, 82000, 82000, 82000],
+                      [0.02, 0.02, 0.0, 0.02], 0.065, is_call=True)
+    assert not bad['converged'].any() and np.isnan(bad['iv']).all()
+    assert (bad['iterations'] == 0).all()
+
+    # Black-76 (zero carry) inverts its own prices
+    f76 = bsm(50000, 51000, 0.1, 0.18, 0.06, carry=0.0, is_call=False)['price']
+    assert abs(implied_vol(f76, 50000, 51000, 0.1, 0.06, carry=0.0, is_call=False)['iv'] - 0.18) < 1e-6
+
+    # A snapshot of thousands of contracts solves in one fast batch
+    start = time.perf_counter()
+    implied_vol(price, spot, strike, t, 0.065, is_call=is_call)
+    elapsed = time.perf_counter() - start
+    print(f"{n} contracts solved in {elapsed * 1000:.1f} ms")
+    assert elapsed < 1.0
+    print("Round trips and masking work.")
+
+def test_smile_and_surface():
+    print("\nTesting the IV smile and surface...")
+    as_of = datetime(2026, 1, 5, 10, 0)
+    expiries = [date(2026, 1, 8), date(2026, 1, 29)]
+    strikes = np.arange(80000, 84100, 200)
+    spot, rate = 82000.0, 0.065
+    # Skewed smile per expiry: puts richer than calls
+    chain = price_chain(spot, strikes, expiries, 0.0, rate, as_of=as_of)
+    smile_vol = lambda k, level: level - 0.6 * np.log(k / spot)
+    vols = np.where(chain['expiry'] == expiries[0], smile_vol(chain['strike'], 0.12), smile_vol(chain['strike'], 0.15))
+    prices = bsm(spot, chain['strike'], chain['t'], vols, rate, is_call=chain['option_type'] == 'CE')['price']
+
+    surface = VolSurface.from_chain(spot, chain['strike'], chain['expiry'], chain['option_type'], prices,
+                                    rate=rate, as_of=as_of)
+    assert surface.expiries == expiries
+    near = surface[expiries[0]]
+    assert len(near) == len(strikes)
+    # Recovered smile matches the input skew at quoted strikes
+    assert np.abs(near.iv(strikes) - smile_vol(strikes, 0.12)).max() < 1e-4
+    # ATM-forward IV sits between neighbouring strikes
+    forward = spot * np.exp(rate * near.t)
+    assert abs(surface.atm_iv() - smile_vol(forward, 0.12)) < 2e-4
+    # Flat beyond the quoted strikes
+    assert near.iv(70000) == near.ivs[0] and near.iv(95000) == near.ivs[-1]
+
+    # Total variance is linear in time between expiries
+    far = surface[expiries[1]]
+    t_mid = 0.5 * (near.t + far.t)
+    expected = np.sqrt((0.5 * near.iv(82000) ** 2 * near.t + 0.5 * far.iv(82000) ** 2 * far.t) / t_mid)
+    assert abs(surface.iv(82000, t_mid) - expected) < 1e-12
+    assert surface.iv(82000, 0.001) == near.iv(82000)
+    assert np.isnan(VolSmile([], [], 82000, 0.1).iv(82000))
+    print("Smile and surface work.")
+
+def test_atm_iv_change_in_sentiment():
+    print("\nTesting the ATM IV sentiment input...")
+    engine = MarketSentimentEngine()
+    jumped = engine.analyze(SentimentInput(atm_iv_change_pct=18.0))
+    assert any('ATM IV jumped' in note for note in jumped.risk_notes)
+    eased = engine.analyze(SentimentInput(atm_iv_change_pct=-15.0))
+    assert any('ATM IV easing' in factor for factor in eased.supporting_factors)
+    calm = engine.analyze(SentimentInput(atm_iv_change_pct=2.0))
+    assert not any('ATM IV' in text for text in calm.risk_notes + calm.supporting_factors)
+    print("Sentiment input works.")
+
+if __name__ == "__main__":
+    test_round_trip_and_masking()
+    test_smile_and_surface()
+    test_atm_iv_change_in_sentiment()
@@ -0,0 +1,75 @@
+import sys
+import os
+import tempfile
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.incremental_indicators import IncrementalIndicators
+from app.services.technical_analysis import TechnicalAnalyzer
+from app.services.strategy import TradingStrategy
+from test_indicator_cache import generate_sample_ohlcv
+
+def bar_at(data, i, close_offset=0.0):
+    row = data.iloc[i]
+    return {
+        'timestamp': data.index[i],
+        'open': row['Open'],
+        'high': row['High'],
+        'low': row['Low'],
+        'close': row['Close'] + close_offset,
+    }
+
+def assert_matches_batch(engine, data):
+    frame = TechnicalAnalyzer(data).indicator_frame()
+    for key, value in engine.values().items():
+        expected = frame[key].iloc[-1]
+        if value is None:
+            assert np.isnan(expected), key
+        else:
+            assert np.isclose(value, expected, rtol=1e-9, atol=1e-9), key
+
+def test_streaming_matches_batch():
+    print("Testing incremental indicators against the batch path...")
+    data = generate_sample_ohlcv(400, seed=11)
+    engine = IncrementalIndicators()
+    for i in range(len(data)):
+        engine.update(bar_at(data, i))
+        if i in (10, 30, 120, len(data) - 1):
+            assert_matches_batch(engine, data.iloc[:i + 1])
+
+    expected = TechnicalAnalyzer(data).calculate_all_indicators()
+    snapshot = engine.snapshot()
+    for key, value in snapshot.items():
+        assert value == expected[key], key
+
+def test_replace_last_bar():
+    data = generate_sample_ohlcv(120, seed=5)
+    engine = IncrementalIndicators.from_dataframe(data.iloc[:-1])
+    engine.update(bar_at(data, len(data) - 1, close_offset=250.0))
+    engine.replace_last(bar_at(data, len(data) - 1))
+    assert engine.count == len(data)
+    assert_matches_batch(engine, data)
+
+def test_state_roundtrip():
+    data = generate_sample_ohlcv(300, seed=9)
+    engine = IncrementalIndicators.from_dataframe(data.iloc[:250])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'state.json')
+        engine.save(path)
+        restored = IncrementalIndicators.load(path)
+
+    # The last saved bar is re-applied as a correction, then 50 new bars follow
+    applied = restored.update_from_dataframe(data)
+    assert applied == 51
+    assert restored.count == len(data)
+    assert_matches_batch(restored, data)
+
+    signal = TradingStrategy(data, indicators=restored.snapshot()).get_signal()
+    assert signal == TradingStrategy(data).get_signal()
+
+if __name__ == "__main__":
+    test_streaming_matches_batch()
+    test_replace_last_bar()
+    test_state_roundtrip()
@@ -0,0 +1,84 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.technical_analysis import TechnicalAnalyzer
+
+def generate_sample_ohlcv(n_rows=300, seed=7):
+    """Generate a synthetic daily OHLCV frame"""
+    rng = np.random.default_rng(seed)
+    close = 50000 + np.cumsum(rng.normal(0, 150, n_rows))
+    open_ = close + rng.normal(0, 40, n_rows)
+    high = np.maximum(open_, close) + np.abs(rng.normal(0, 60, n_rows))
+    low = np.minimum(open_, close) - np.abs(rng.normal(0, 60, n_rows))
+    volume = rng.integers(100000, 200000, n_rows).astype(float)
+    index = pd.date_range('2024-01-01', periods=n_rows, freq='D')
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}, index=index)
+
+def run_report_calls(analyzer):
+    analyzer.calculate_all_indicators()
+    analyzer.get_trend()
+    analyzer.get_signal()
+    analyzer.get_trade_bias()
+    analyzer.get_risk_context()
+    analyzer.get_market_regime()
+    analyzer.get_position_sizing()
+    analyzer.get_overall_signal()
+    return analyzer.generate_actionable_plan()
+
+def test_indicators_computed_once():
+    print("Testing indicator cache...")
+    analyzer = TechnicalAnalyzer(generate_sample_ohlcv())
+    run_report_calls(analyzer)
+    first = analyzer.get_cache_stats()
+    print(f"Cache after one report: {first}")
+    assert first['hits'] > first['misses']
+
+    # A second pass must be served entirely from the cache
+    run_report_calls(analyzer)
+    second = analyzer.get_cache_stats()
+    assert second['misses'] == first['misses']
+    assert second['hits'] > first['hits']
+
+def test_returned_dicts_are_copies():
+    analyzer = TechnicalAnalyzer(generate_sample_ohlcv())
+    indicators = analyzer.calculate_all_indicators()
+    indicators['rsi'] = -1
+    assert analyzer.calculate_all_indicators()['rsi'] != -1
+
+def test_set_data_invalidates_cache():
+    data = generate_sample_ohlcv()
+    analyzer = TechnicalAnalyzer(data.iloc[:-1])
+    stale = analyzer.calculate_all_indicators()
+    analyzer.set_data(data)
+    fresh = analyzer.calculate_all_indicators()
+    assert fresh == TechnicalAnalyzer(data).calculate_all_indicators()
+    assert fresh['current_price'] != stale['current_price']
+
+def test_indicator_frame_matches_scalar_view():
+    print("Testing indicator frame...")
+    data = generate_sample_ohlcv()
+    analyzer = TechnicalAnalyzer(data)
+    frame = analyzer.indicator_frame()
+    assert frame.index.equals(data.index)
+    assert 'talib_macd' in frame.columns
+
+    # The scalar dict is the rounded last row of the frame
+    indicators = analyzer.calculate_all_indicators()
+    for key, value in indicators.items():
+        assert value == round(float(frame[key].iloc[-1]), 6 if key.startswith('macd_log') else 4 if key.startswith('macd_pct') else 2)
+
+    # Every row is what a truncated analyzer would report as "latest"
+    truncated = TechnicalAnalyzer(data.iloc[:250]).calculate_all_indicators()
+    assert truncated['rsi'] == round(float(frame['rsi'].iloc[249]), 2)
+    assert truncated['ema_50'] == round(float(frame['ema_50'].iloc[249]), 2)
+
+if __name__ == "__main__":
+    test_indicators_computed_once()
+    test_returned_dicts_are_copies()
+    test_set_data_invalidates_cache()
+    test_indicator_frame_matches_scalar_view()
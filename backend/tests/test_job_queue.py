@@ -0,0 +1,106 @@
+import sys
+import os
+import time
+import tempfile
+import threading
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.config import Config
+from app.services import job_queue
+from app.services.job_queue import LocalJobQueue
+
+release = threading.Event()
+calls = []
+
+def gated_job(params, progress=None):
+    """Test task: reports a stage, then blocks until the test releases it"""
+    calls.append(params)
+    progress('waiting', 0.5)
+    release.wait(10)
+    if params.get('fail'):
+        raise ValueError('boom')
+    return {'echo': params['value']}
+
+def test_local_queue_coalesces_identical_jobs():
+    print("Testing job coalescing...")
+    job_queue.JOB_TASKS['gated'] = 'test_job_queue:gated_job'
+    release.clear()
+    del calls[:]
+    queue = LocalJobQueue(max_workers=2)
+    try:
+        first, coalesced = queue.submit('gated', {'value': 1})
+        assert not coalesced
+        assert queue.submit('gated', {'value': 1}) == (first, True)
+        other, coalesced = queue.submit('gated', {'value': 2})
+        assert other != first and not coalesced
+
+        deadline = time.monotonic() + 5
+        while queue.get(first)['stage'] != 'waiting' and time.monotonic() < deadline:
+            time.sleep(0.01)
+        job = queue.get(first)
+        assert job['status'] == 'running' and job['progress'] == 0.5
+
+        release.set()
+        assert queue.wait(first, timeout=5)['result'] == {'echo': 1}
+        assert queue.wait(other, timeout=5)['status'] == 'done'
+        assert len(calls) == 2
+
+        # Once finished, the same request starts a new job
+        again, coalesced = queue.submit('gated', {'value': 1})
+        assert again != first and not coalesced
+        queue.wait(again, timeout=5)
+
+        failed, _ = queue.submit('gated', {'value': 3, 'fail': True})
+        job = queue.wait(failed, timeout=5)
+        assert job['status'] == 'failed' and job['error'] == 'boom'
+        assert queue.get('missing') is None
+    finally:
+        release.set()
+        del job_queue.JOB_TASKS['gated']
+    print(f"{len(calls)} task runs for 5 submissions")
+
+def test_generate_endpoint_returns_job():
+    print("Testing async report endpoint...")
+    cwd = os.getcwd()
+    original_source = Config.DATA_SOURCE
+    Config.DATA_SOURCE = 'synthetic'
+    report_path = None
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        os.environ['ARTIFACT_CACHE_DIR'] = os.path.join(workdir, 'artifacts')
+        try:
+            client = create_app().test_client()
+            response = client.post('/api/reports/generate', json={'symbol': 'NIFTY', 'report_date': '2024-12-31'})
+            assert response.status_code == 202
+            job = response.get_json()
+            assert response.headers['Location'] == job['status_url']
+            assert client.post('/api/reports/generate', json={'symbol': 'NIFTY', 'report_date': '2024-12-31'}).get_json()['job_id'] == job['job_id']
+
+            deadline = time.monotonic() + 120
+            while True:
+                status = client.get(job['status_url']).get_json()
+                if status['status'] in ('done', 'failed') or time.monotonic() > deadline:
+                    break
+                time.sleep(0.2)
+            assert status['status'] == 'done', status
+            report_path = status['report_path']
+            assert status['data']['symbol'] == 'NIFTY'
+            assert client.get(status['report_url']).status_code == 200
+
+            assert client.get('/api/reports/jobs/unknown').status_code == 404
+            assert client.post('/api/reports/generate', json={'report_date': '31-12-2024'}).status_code == 400
+        finally:
+            if report_path and os.path.exists(report_path):
+                os.remove(report_path)
+            del os.environ['ARTIFACT_CACHE_DIR']
+            Config.DATA_SOURCE = original_source
+            os.chdir(cwd)
+    print(f"Job {job['job_id']} finished at stage {status['stage']}")
+
+if __name__ == "__main__":
+    test_local_queue_coalesces_identical_jobs()
+    test_generate_endpoint_returns_job()
+    print("All job queue tests passed!")
@@ -0,0 +1,39 @@
+import sys
+import os
+import time
+import pandas as pd
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.data_fetcher import MarketDataFetcher
+from app.services.data_sources import DataSource
+
+class FakeSource(DataSource):
+    """^N225 is slow, ^HSI fails, everything else returns two closes"""
+    def fetch(self, symbol, period=None, start=None, interval='1d'):
+        if symbol == '^N225':
+            time.sleep(1.0)
+        if symbol == '^HSI':
+            raise ConnectionError("feed down")
+        time.sleep(0.2)
+        return pd.DataFrame({'Close': [100.0, 102.0]})
+
+def test_concurrent_summary_with_deadline():
+    print("Testing concurrent market summary...")
+    fetcher = MarketDataFetcher(source=FakeSource())
+    started = time.perf_counter()
+    summary, timings = fetcher.get_market_summary_timed(timeout=0.5)
+    elapsed = time.perf_counter() - started
+    print(f"Summary in {elapsed:.2f}s: {timings}")
+
+    # Sequential fetching would take well over 1.5s
+    assert elapsed < 0.9
+    assert summary['NIFTY']['change_pct'] == 2.0
+    assert summary['NIKKEI'] is None and timings['NIKKEI']['status'] == 'timeout'
+    assert summary['HANG SENG'] is None and timings['HANG SENG']['status'] == 'error'
+    assert timings['S&P 500']['status'] == 'ok'
+    assert set(summary) == set(timings)
+
+if __name__ == "__main__":
+    test_concurrent_summary_with_deadline()
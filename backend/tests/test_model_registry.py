@@ -0,0 +1,49 @@
+import sys
+import os
+import tempfile
+import joblib
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.model_registry import ModelRegistry
+from app.services.ml_service import LightGBMService
+
+def test_registry_caches_and_reloads():
+    print("Testing model registry...")
+    registry = ModelRegistry(max_size=2)
+    with tempfile.TemporaryDirectory() as model_dir:
+        path = os.path.join(model_dir, "lgb_TEST.pkl")
+        joblib.dump({'version': 1}, path)
+
+        first = registry.get(path)
+        assert registry.get(path) is first
+        assert registry.get_stats()['loads'] == 1 and registry.get_stats()['hits'] == 1
+
+        # Rewriting the file (new size/mtime) triggers a reload
+        joblib.dump({'version': 2, 'retrained': True}, path)
+        assert registry.get(path)['version'] == 2
+        assert registry.get_stats()['reloads'] == 1
+
+        assert registry.get(os.path.join(model_dir, "missing.pkl")) is None
+    print(f"Stats: {registry.get_stats()}")
+
+def test_lru_eviction_and_warm_up():
+    print("Testing LRU eviction and warm-up...")
+    registry = ModelRegistry(max_size=2)
+    with tempfile.TemporaryDirectory() as model_dir:
+        for symbol in ['SENSEX', 'BANKNIFTY', 'NIFTY50']:
+            joblib.dump({'symbol': symbol}, os.path.join(model_dir, f"lgb_{symbol}.pkl"))
+
+        service = LightGBMService(model_dir=model_dir, registry=registry)
+        assert service.warm_up() == 3
+        stats = registry.get_stats()
+        assert stats['size'] == 2 and stats['evictions'] == 1
+        # The most recently loaded models are the ones kept
+        assert registry.get(os.path.join(model_dir, "lgb_SENSEX.pkl"))['symbol'] == 'SENSEX'
+        assert registry.get_stats()['hits'] == 1
+    print(f"Stats: {registry.get_stats()}")
+
+if __name__ == "__main__":
+    test_registry_caches_and_reloads()
+    test_lru_eviction_and_warm_up()
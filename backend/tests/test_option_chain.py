@@ -0,0 +1,124 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import trade_rules
+from app.services.option_chain import OptionChain, parse_symbol
+
+def generate_chain(n_expiries=4, strikes_each_side=130, spot=82000.0, seed=3):
+    """Contract dicts of a large SENSEX-style chain (2 x strikes x expiries)"""
+    rng = np.random.default_rng(seed)
+    contracts = []
+    atm = round(spot / 100) * 100
+    for code in ['26JAN', '26FEB', '26MAR', '26APR'][:n_expiries]:
+        for offset in range(-strikes_each_side, strikes_each_side + 1):
+            strike = atm + offset * 100
+            for option_type in ('CE', 'PE'):
+                contracts.append({
+                    'symbol': f"SENSEX{code}{strike}{option_type}",
+                    'premium': round(float(rng.uniform(5, 800)), 1),
+                    'spread_pct': round(float(rng.uniform(0.0, 0.04)), 4),
+                    'oi_change_pct': round(float(rng.uniform(-0.2, 0.3)), 3),
+                })
+    return contracts
+
+def legacy_select(contracts, signal_action, premium_min, premium_max, max_spread_pct, oi_change_pct):
+    """The list scan select_contract used before the chain was indexed"""
+    for c in sorted(contracts, key=lambda x: float(x.get("premium", 0.0))):
+        premium = float(c.get("premium", 0.0))
+        c_type = "CE" if "CE" in c["symbol"] else "PE" if "PE" in c["symbol"] else "UNKNOWN"
+        if signal_action == "BUY_CALL" and c_type != "CE":
+            continue
+        if signal_action == "BUY_PUT" and c_type != "PE":
+            continue
+        if (premium_min <= premium <= premium_max and float(c.get("spread_pct", 1.0)) <= max_spread_pct
+                and float(c.get("oi_change_pct", 0.0)) >= oi_change_pct):
+            return {"symbol": c["symbol"], "premium": premium, "type": c_type}
+    return None
+
+def test_parse_and_lookup():
+    print("\nTesting symbol parsing and lookups...")
+    assert parse_symbol('SENSEX26JAN82000CE') == ('SENSEX', '26JAN', 82000.0, 'CE')
+    assert parse_symbol('NIFTY2610822000PE') == ('NIFTY', '26108', 22000.0, 'PE')
+    assert parse_symbol('BANKNIFTY52000CE') == ('BANKNIFTY', '', 52000.0, 'CE')
+    assert parse_symbol('sensex 26JAN 82000 ce') == ('SENSEX', '26JAN', 82000.0, 'CE')
+    assert parse_symbol('SENSEX') is None
+    assert trade_rules.parse_contract('SENSEX26JAN82000CE') == (82000.0, 'CE')
+
+    chain = OptionChain(generate_chain())
+    assert len(chain) == 4 * 261 * 2
+    assert chain.expiries == ['26APR', '26FEB', '26JAN', '26MAR']
+    hit = chain.get('SENSEX26FEB82300PE')
+    assert hit['type'] == 'PE' and hit['premium'] == chain.premium_of('SENSEX26FEB82300PE')
+    assert chain.lookup(82300, 'PE', '26FEB') == hit
+    assert chain.get('SENSEX26FEB82350PE') is None and chain.lookup(82350, 'PE', '26FEB') is None
+    try:
+        chain.lookup(82300, 'PE')
+        assert False, "expected ValueError for an ambiguous expiry"
+    except ValueError:
+        pass
+
+    # A feed-supplied expiry overrides the symbol; single-expiry chains need none
+    single = OptionChain([{'symbol': 'SENSEX82000CE', 'premium': 120.0, 'expiry': '2026-01-08'}])
+    assert single.expiries == ['2026-01-08'] and single.lookup(82000, 'CE')['premium'] == 120.0
+    assert OptionChain([]).select('BUY_CALL', 50, 200, 0.02, 0.08) is None
+    print("Parsing and lookups work.")
+
+def test_queries_match_list_scan():
+    print("\nTesting vectorized selection against the list scan...")
+    contracts = generate_chain()
+    chain = OptionChain(contracts)
+    for action in ('BUY_CALL', 'BUY_PUT'):
+        for band, spread, oi in [((50, 200), 0.02, 0.08), ((300, 310), 0.015, 0.2), ((900, 1000), 0.02, 0.0)]:
+            args = (action, band[0], band[1], spread, oi)
+            assert chain.select(*args) == legacy_select(contracts, *args) == trade_rules.select_contract(contracts, *args)
+
+    # Mock chain keeps selecting the same contracts
+    mock = trade_rules.mock_chain(80040.0)
+    for action in ('BUY_CALL', 'BUY_PUT'):
+        assert OptionChain(mock).select(action, 50, 200, 0.02, 0.08) == legacy_select(mock, action, 50, 200, 0.02, 0.08)
+
+    # Premium band and filters
+    rows = chain.query(100, 300, max_spread_pct=0.02, min_oi_change_pct=0.05, option_type='CE', expiry='26MAR')
+    premiums = chain.premium[rows]
+    assert len(rows) and (np.diff(premiums) >= 0).all() and premiums.min() >= 100 and premiums.max() <= 300
+    assert (chain.spread_pct[rows] <= 0.02).all() and (chain.oi_change_pct[rows] >= 0.05).all()
+    assert set(chain.option_type[rows]) == {'CE'} and set(chain.expiry[rows]) == {'26MAR'}
+    expected = sum(1 for c in contracts if c['symbol'].startswith('SENSEX26MAR') and c['symbol'].endswith('CE')
+                   and 100 <= c['premium'] <= 300 and c['spread_pct'] <= 0.02 and c['oi_change_pct'] >= 0.05)
+    assert len(rows) == expected
+
+    # Moneyness: up to 1% out of the money
+    rows = chain.query(spot=82000.0, moneyness=(-0.01, 0.0), option_type='PE', expiry='26JAN')
+    assert sorted(chain.strike[rows]) == list(np.arange(81200.0, 82001.0, 100.0))
+    otm_call = chain.query(spot=82000.0, moneyness=(-0.0015, -0.0005), option_type='CE', expiry='26JAN')
+    assert list(chain.strike[otm_call]) == [82100.0]
+    print("Selection matches the list scan.")
+
+def test_selection_speed():
+    print("\nTesting selection speed on a large chain...")
+    contracts = generate_chain()
+    chain = OptionChain(contracts)
+    runs = 200
+    start = time.perf_counter()
+    for _ in range(runs):
+        chain.select('BUY_PUT', 50, 200, 0.02, 0.08)
+        chain.premium_of('SENSEX26MAR82300CE')
+    indexed = (time.perf_counter() - start) / runs
+    start = time.perf_counter()
+    for _ in range(20):
+        legacy_select(contracts, 'BUY_PUT', 50, 200, 0.02, 0.08)
+    scan = (time.perf_counter() - start) / 20
+    print(f"{len(chain)} contracts: indexed {indexed * 1e6:.0f} us vs list scan {scan * 1e6:.0f} us")
+    assert indexed < scan
+    print("Indexed selection is faster.")
+
+if __name__ == "__main__":
+    test_parse_and_lookup()
+    test_queries_match_list_scan()
+    test_selection_speed()
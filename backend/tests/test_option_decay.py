@@ -85,5 +85,37 @@ def test_option_decay():
     else:
         print("Prediction failed.")
 
+def test_chain_features_match_single_contract():
+    print("Testing chain-scale feature builder...")
+    service = OptionDecayService()
+    option_df, underlying_df = generate_sample_option_data()
+
+    # Long-format chain: the sample call plus shifted strikes and the matching puts
+    contracts = []
+    for strike_shift in [0, 500]:
+        for opt_type in ['CALL', 'PUT']:
+            contract = option_df.copy()
+            contract['Strike'] = contract['Strike'] + strike_shift
+            contract['Type'] = opt_type
+            contract['Close'] = contract['Close'] + strike_shift / 100
+            contracts.append(contract)
+    chain = pd.concat(contracts).reset_index()
+
+    X, y_class, y_reg = service.prepare_chain_features(chain, underlying_df)
+    print(f"Chain rows: {len(chain)}, feature rows: {len(X)}")
+    assert len(X) == 4 * len(service.prepare_option_features(option_df, underlying_df)[0])
+
+    for (strike, opt_type), rows in chain.groupby(['Strike', 'Type']):
+        expected_X, _, expected_decay = service.prepare_option_features(rows.set_index('Timestamp'), underlying_df)
+        got = X.loc[X.index.isin(rows.index)]
+        assert np.allclose(got.values, expected_X.values)
+        assert np.allclose(y_reg.loc[got.index].values, expected_decay.values)
+
+    # Put moneyness is K/S
+    puts = chain.loc[X.index][chain.loc[X.index, 'Type'] == 'PUT']
+    spot = underlying_df['Close'].reindex(puts['Timestamp']).values
+    assert np.allclose(X.loc[puts.index, 'moneyness'].values, puts['Strike'].values / spot)
+
 if __name__ == "__main__":
     test_option_decay()
+    test_chain_features_match_single_contract()
@@ -0,0 +1,65 @@
+import sys
+import os
+import json
+import pickle
+import tempfile
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_reports
+from app.config import Config
+from app.services.chart_generator import ChartGenerator
+from app.services.retrain_scheduler import get_retrain_scheduler
+from app.services.signal_tracker import SignalTracker
+
+def test_concurrent_signal_logging():
+    print("Testing concurrent signal log writes...")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            tracker = SignalTracker()
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(lambda i: tracker.log_signal(f"SYM{i % 3}", "LONG", 100.0 + i, "2024-01-01"), range(200)))
+            with open(tracker.signals_file) as f:
+                lines = [json.loads(line) for line in f]
+        finally:
+            os.chdir(cwd)
+    assert len(lines) == 200
+    print(f"{len(lines)} intact log lines")
+
+def test_prepare_stage_output_is_picklable():
+    print("Testing report prepare stage...")
+    cwd = os.getcwd()
+    original_source = Config.DATA_SOURCE
+    Config.DATA_SOURCE = 'synthetic'
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            prepared = generate_reports.prepare_report('SENSEX', datetime(2024, 12, 31))
+            # The render stage receives this through a process pool
+            restored = pickle.loads(pickle.dumps(prepared))
+            report_data = restored['report_data']
+            assert report_data['symbol'] == 'SENSEX'
+            assert 'ai_commentary' in report_data
+            assert restored['indicator_frame'].index.equals(restored['market_data'].index)
+
+            chart_path = ChartGenerator().generate_chart(
+                'SENSEX', restored['market_data'], report_data['indicators'],
+                report_data['support_resistance'], frame=restored['indicator_frame']
+            )
+            assert os.path.exists(chart_path)
+            assert os.listdir(os.path.dirname(chart_path)) == ['SENSEX_chart.png']
+            # The missing model was queued in the background, not trained inline
+            get_retrain_scheduler().wait(timeout=120)
+        finally:
+            Config.DATA_SOURCE = original_source
+            os.chdir(cwd)
+    print(f"Prepared report for {report_data['symbol']}: {report_data['action_plan']['decision']}")
+
+if __name__ == "__main__":
+    test_concurrent_signal_logging()
+    test_prepare_stage_output_is_picklable()
@@ -0,0 +1,92 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.param_sweep import ParamSweep, SymbolHistory, evaluate_config, grid_configs, random_configs
+from app.services.technical_analysis import DEFAULT_PLAN_PARAMS, TechnicalAnalyzer
+from test_indicator_cache import generate_sample_ohlcv
+from test_plan_series import as_number, same
+
+CUSTOM_PARAMS = {'trend_confidence': 55, 'range_confidence': 40, 'adx_strong': 22, 'adx_weak': 18,
+                 'atr_pct_volatile': 1.5, 'rsi_gate': 45, 'sl_tighten_ratio': 2.0,
+                 'weight_trend': 35, 'weight_adx': 20, 'weight_rsi': 30, 'weight_volume': 15}
+
+def test_default_params_unchanged():
+    print("Testing default plan params...")
+    analyzer = TechnicalAnalyzer(generate_sample_ohlcv())
+    score, details = analyzer.calculate_confidence_score('Bullish', 30.0, 55.0, False)
+    assert score == 30 + 25 + 25 + 10 and isinstance(score, int)
+    assert details[0] == "Trend Aligned (+30)" and details[-1] == "Volume Normal (+10)"
+    assert TechnicalAnalyzer(generate_sample_ohlcv(), plan_params={}).plan_params == DEFAULT_PLAN_PARAMS
+
+def test_custom_params_series_matches_scalar():
+    print("Testing custom plan params, scalar vs vectorized...")
+    decisions = set()
+    for seed in range(6):
+        df = generate_sample_ohlcv(n_rows=220, seed=seed)
+        series = TechnicalAnalyzer(df, plan_params=CUSTOM_PARAMS).actionable_plan_series()
+        for t in range(60, len(df), 4):
+            plan = TechnicalAnalyzer(df.iloc[:t + 1], plan_params=CUSTOM_PARAMS).generate_actionable_plan()
+            row = series.iloc[t]
+            decisions.add(plan['decision'])
+            assert row['decision'] == plan['decision'], (seed, t)
+            assert row['confidence'] == plan['confidence'], (seed, t)
+            for key in ['stop_loss', 'target_1', 'risk_reward']:
+                assert same(row[key], as_number(plan[key])), (seed, t, key)
+    print(f"Decisions covered: {sorted(decisions)}")
+    assert {'LONG', 'SHORT'} <= decisions
+
+def test_config_generation():
+    print("Testing grid and random configurations...")
+    grid = grid_configs({'adx_strong': [20, 25], 'adx_weak': [18, 22], 'rsi_gate': [45, 55]})
+    # adx_weak above adx_strong is skipped
+    assert len(grid) == 6 and all(c['adx_weak'] <= c['adx_strong'] for c in grid)
+    sampled = random_configs(50, seed=3)
+    assert sampled == random_configs(50, seed=3) and len(sampled) == 50
+    assert all(50 <= c['trend_confidence'] <= 80 for c in sampled)
+
+def test_trade_evaluation():
+    print("Testing trade outcomes of a config...")
+    df = generate_sample_ohlcv(n_rows=400, seed=1)
+    history = SymbolHistory(df.reset_index(drop=True), np.arange(len(df), dtype=float), horizon=5)
+    times, returns, outcomes = history.trade_returns(DEFAULT_PLAN_PARAMS)
+    plan = TechnicalAnalyzer(df).actionable_plan_series()
+    directional = plan['decision'].isin(['LONG', 'SHORT']).to_numpy().copy()
+    directional[-5:] = False
+    assert len(returns) == directional.sum() > 0
+    # Exits at the stop or target pay exactly the plan's signed distance to that level
+    rows = times.astype(int)
+    price = plan['current_price'].to_numpy()[rows]
+    direction = np.where(plan['decision'].to_numpy()[rows] == 'LONG', 1, -1)
+    to_stop = direction * (plan['stop_loss'].to_numpy()[rows] - price) / price * 100
+    to_target = direction * (plan['target_1'].to_numpy()[rows] - price) / price * 100
+    assert np.allclose(returns[outcomes == 'stop'], to_stop[outcomes == 'stop'])
+    assert np.allclose(returns[outcomes == 'target'], to_target[outcomes == 'target'])
+    assert set(outcomes) <= {'stop', 'target', 'expired'}
+
+def test_parallel_sweep_matches_serial():
+    print("Testing shared-memory parallel sweep...")
+    data = {f"SYM{i}": generate_sample_ohlcv(n_rows=500, seed=i) for i in range(2)}
+    configs = random_configs(24, seed=5)
+    serial = ParamSweep(data, workers=1).run(configs, min_trades=5)
+    parallel = ParamSweep(data, workers=2).run(configs, min_trades=5)
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert serial['rank_score'].is_monotonic_increasing
+    histories = [SymbolHistory(frame.reset_index(drop=True), np.arange(len(frame), dtype=float), 5)
+                 for frame in data.values()]
+    best = evaluate_config(histories, {k: serial.iloc[0][k] for k in configs[0]})
+    assert best['trades'] == serial.iloc[0]['trades']
+    print(serial.head(3)[['trend_confidence', 'trades', 'hit_rate', 'expectancy', 'max_drawdown']])
+
+if __name__ == "__main__":
+    test_default_params_unchanged()
+    test_custom_params_series_matches_scalar()
+    test_config_generation()
+    test_trade_evaluation()
+    test_parallel_sweep_matches_serial()
+    print("All param sweep tests passed!")
@@ -0,0 +1,49 @@
+import sys
+import os
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.technical_analysis import TechnicalAnalyzer
+from test_indicator_cache import generate_sample_ohlcv
+
+def as_number(value):
+    """Plan levels are None (or a text stop for range trades) when not numeric"""
+    return np.nan if value is None or isinstance(value, str) else value
+
+def same(a, b):
+    return (np.isnan(a) and np.isnan(b)) or a == b
+
+def test_series_matches_scalar_plan():
+    print("Testing vectorized plan series against generate_actionable_plan...")
+    decisions = set()
+    for seed in range(4):
+        df = generate_sample_ohlcv(n_rows=260, seed=seed)
+        series = TechnicalAnalyzer(df).actionable_plan_series()
+        assert len(series) == len(df)
+        for t in range(1, len(df), 3):
+            plan = TechnicalAnalyzer(df.iloc[:t + 1]).generate_actionable_plan()
+            row = series.iloc[t]
+            decisions.add(plan['decision'])
+            assert row['decision'] == plan['decision'], (seed, t)
+            assert row['regime'] == plan['regime'], (seed, t)
+            assert row['confidence'] == plan['confidence'], (seed, t)
+            for key in ['stop_loss', 'target_1', 'target_2', 'risk_reward']:
+                assert same(row[key], as_number(plan[key])), (seed, t, key)
+    print(f"Decisions covered: {sorted(decisions)}")
+    assert {'LONG', 'SHORT', 'RANGE TRADE', 'NO TRADE'} <= decisions
+
+def test_last_row_matches_latest_plan():
+    print("Testing last row of plan series...")
+    analyzer = TechnicalAnalyzer(generate_sample_ohlcv())
+    plan = analyzer.generate_actionable_plan()
+    last = analyzer.actionable_plan_series().iloc[-1]
+    assert last['decision'] == plan['decision']
+    assert last['confidence'] == plan['confidence']
+    assert same(last['target_1'], as_number(plan['target_1']))
+    print(f"Last bar: {last['decision']} (confidence {last['confidence']})")
+
+if __name__ == "__main__":
+    test_series_matches_scalar_plan()
+    test_last_row_matches_latest_plan()
@@ -0,0 +1,92 @@
+import sys
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from app import create_app
+from app.services import preview_cache
+from app.services.preview_cache import PreviewCache
+
+def write_pdf(path, pages=2):
+    pdf = canvas.Canvas(path, pagesize=A4)
+    for page in range(pages):
+        pdf.drawString(100, 700, f"Preview test page {page + 1}")
+        pdf.showPage()
+    pdf.save()
+
+def test_prerender_then_serve_from_cache():
+    print("Testing preview pre-rendering...")
+    with tempfile.TemporaryDirectory() as workdir:
+        pdf_path = os.path.join(workdir, 'report.pdf')
+        write_pdf(pdf_path)
+        cache = PreviewCache(os.path.join(workdir, 'previews'))
+        assert cache.prerender(pdf_path) == 4  # 2 pages x (full, thumb)
+        assert cache.prerender(pdf_path) == 0
+
+        full, etag = cache.get(pdf_path, 1)
+        thumb, thumb_etag = cache.get(pdf_path, 1, 'thumb')
+        assert full.startswith(b'\x89PNG') and len(thumb) < len(full)
+        assert etag != thumb_etag
+        assert cache.get(pdf_path, 1) == (full, etag)
+        assert cache.stats == {'memory_hits': 1, 'disk_hits': 2, 'renders': 0}
+
+        for bad in [(0, 'full'), (3, 'full'), (1, 'huge')]:
+            try:
+                cache.get(pdf_path, *bad)
+                assert False, f"expected ValueError for {bad}"
+            except ValueError:
+                pass
+
+def test_miss_renders_once_in_worker_pool():
+    print("Testing on-demand preview rendering...")
+    with tempfile.TemporaryDirectory() as workdir:
+        pdf_path = os.path.join(workdir, 'report.pdf')
+        write_pdf(pdf_path, pages=1)
+        cache = PreviewCache(os.path.join(workdir, 'previews'), max_disk_bytes=1)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: cache.get(pdf_path, 1), range(4)))
+        assert len({etag for _, etag in results}) == 1
+        assert cache.stats['renders'] == 1
+        # max_disk_bytes=1 trims the disk copy; memory still serves it
+        assert not [name for name in os.listdir(cache.cache_dir) if name.endswith('.png')]
+        assert cache.get(pdf_path, 1) == results[0]
+        cache._executor.shutdown()
+
+def test_preview_endpoint_cache_headers():
+    print("Testing preview endpoint...")
+    reports_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'reports')
+    filename = 'PREVIEW_TEST_report.pdf'
+    pdf_path = os.path.join(reports_dir, filename)
+    original = preview_cache._preview_cache
+    workdir = tempfile.mkdtemp()
+    try:
+        write_pdf(pdf_path, pages=1)
+        preview_cache._preview_cache = PreviewCache(workdir)
+        preview_cache._preview_cache.prerender(pdf_path)
+        client = create_app().test_client()
+
+        response = client.get(f'/api/reports/preview/{filename}/1')
+        assert response.status_code == 200 and response.mimetype == 'image/png'
+        assert response.cache_control.max_age == 86400 and response.headers['ETag']
+        assert client.get(f'/api/reports/preview/{filename}/1',
+                          headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+        assert client.get(f'/api/reports/preview/{filename}/1?size=thumb').status_code == 200
+        assert client.get(f'/api/reports/preview/{filename}/9').status_code == 400
+        assert client.get('/api/reports/preview/missing.pdf/1').status_code == 404
+    finally:
+        preview_cache._preview_cache = original
+        os.remove(pdf_path)
+        shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    test_prerender_then_serve_from_cache()
+    test_miss_renders_once_in_worker_pool()
+    test_preview_endpoint_cache_headers()
+    print("All preview cache tests passed!")
@@ -0,0 +1,98 @@
+import sys
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.api import routes
+from app.services.response_cache import ResponseCache, ttl_for_interval
+from test_indicator_cache import generate_sample_ohlcv
+
+def test_singleflight_and_ttl():
+    print("Testing response cache...")
+    cache = ResponseCache()
+    calls = []
+    gate = threading.Event()
+
+    def slow_compute():
+        calls.append(1)
+        gate.wait(5)
+        return {'price': 100}
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        futures = [pool.submit(cache.get, 'BANKNIFTY', slow_compute, 60) for _ in range(10)]
+        # Let every request reach the cache before the fetch completes
+        deadline = time.monotonic() + 5
+        while cache.get_stats()['coalesced'] < 9 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        gate.set()
+        entries = [f.result() for f in futures]
+    assert len(calls) == 1
+    assert all(entry['etag'] == entries[0]['etag'] for entry in entries)
+    stats = cache.get_stats()
+    assert stats['misses'] == 1 and stats['coalesced'] == 9 and stats['hit_rate'] == 0.9
+
+    assert cache.get('BANKNIFTY', slow_compute, 60) is entries[0]
+    assert len(calls) == 1
+
+    # Expired entries are refetched; an unchanged body keeps its Last-Modified
+    first = cache.get('NIFTY', lambda: {'price': 1}, 0)
+    time.sleep(0.01)
+    second = cache.get('NIFTY', lambda: {'price': 1}, 0)
+    assert second is not first and second['last_modified'] == first['last_modified']
+    third = cache.get('NIFTY', lambda: {'price': 2}, 0)
+    assert third['etag'] != first['etag'] and third['last_modified'] > first['last_modified']
+
+    def fail():
+        raise ValueError('no data')
+    try:
+        cache.get('BAD', fail, 60)
+        assert False, "expected an error"
+    except ValueError:
+        pass
+    assert cache.get('BAD', lambda: {'ok': True}, 60)['body'] == {'ok': True}
+    assert cache.get_stats()['errors'] == 1
+    assert ttl_for_interval('5m') < ttl_for_interval('1d')
+
+class CountingFetcher:
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_data(self, symbol, period='3mo', interval='1d'):
+        self.calls += 1
+        return generate_sample_ohlcv(50)
+
+def test_market_data_endpoint_revalidation():
+    print("Testing market data endpoint caching...")
+    original_fetcher, original_cache = routes.get_data_fetcher, routes.market_data_cache
+    fetcher = CountingFetcher()
+    routes.get_data_fetcher = lambda: fetcher
+    routes.market_data_cache = ResponseCache()
+    try:
+        client = create_app().test_client()
+        first = client.get('/api/market-data/BANKNIFTY?period=3mo')
+        assert first.status_code == 200 and first.headers['ETag']
+        assert first.headers['Last-Modified'] and first.cache_control.max_age <= ttl_for_interval('1d')
+        assert len(first.get_json()['data']) == 10
+
+        assert client.get('/api/market-data/BANKNIFTY?period=3mo').get_json() == first.get_json()
+        revalidated = client.get('/api/market-data/BANKNIFTY?period=3mo',
+                                 headers={'If-None-Match': first.headers['ETag']})
+        assert revalidated.status_code == 304 and not revalidated.data
+        client.get('/api/market-data/BANKNIFTY?period=3mo&interval=5m')
+        assert fetcher.calls == 2
+
+        stats = client.get('/api/cache/stats').get_json()['market_data']
+        assert stats['hits'] == 2 and stats['misses'] == 2 and stats['hit_rate'] == 0.5
+    finally:
+        routes.get_data_fetcher, routes.market_data_cache = original_fetcher, original_cache
+    print(f"Cache stats: {stats}")
+
+if __name__ == "__main__":
+    test_singleflight_and_ttl()
+    test_market_data_endpoint_revalidation()
+    print("All response cache tests passed!")
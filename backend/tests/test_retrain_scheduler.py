@@ -0,0 +1,130 @@
+import sys
+import os
+import json
+import time
+import tempfile
+from datetime import datetime, timedelta
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.data_fetcher import MarketDataFetcher
+import joblib
+import lightgbm as lgb
+import numpy as np
+
+from app.services.ml_service import LightGBMService, LGBM_FEATURES, SCHEMA_CHANGED
+from app.services.model_registry import ModelRegistry
+from app.services.retrain_scheduler import RetrainScheduler
+
+def make_service(model_dir):
+    service = LightGBMService(model_dir=model_dir, registry=ModelRegistry(), scheduler=RetrainScheduler())
+    service.fetcher = MarketDataFetcher(source='synthetic')
+    return service
+
+def test_prediction_never_trains_inline():
+    print("Testing non-blocking prediction with background retrain...")
+    with tempfile.TemporaryDirectory() as model_dir:
+        service = make_service(model_dir)
+        data = service.fetcher.fetch_data('BANKNIFTY', period='6mo')
+
+        started = time.perf_counter()
+        result = service.predict_with_status('BANKNIFTY', data)
+        print(f"Missing model answered in {time.perf_counter() - started:.3f}s: {result}")
+        assert result['status'] == 'unavailable' and result['probability'] is None
+        assert service.scheduler.pending()
+
+        assert service.scheduler.wait(timeout=120)
+        assert service.scheduler.history[-1]['ok']
+        metadata = service.load_metadata('BANKNIFTY')
+        assert metadata['features'] == LGBM_FEATURES
+        assert metadata['train_rows'] > 0 and 'auc' in metadata
+
+        result = service.predict_with_status('BANKNIFTY', data)
+        print(f"After retrain: {result}")
+        # 'stale' is possible if the recent window drifted from the training data
+        assert result['status'] in ('ok', 'stale'), result
+        assert 0.0 <= result['probability'] <= 1.0
+        assert service.predict('BANKNIFTY', data) == result['probability']
+        service.scheduler.wait(timeout=120)
+
+def test_stale_model_still_predicts():
+    print("Testing staleness detection...")
+    with tempfile.TemporaryDirectory() as model_dir:
+        service = make_service(model_dir)
+        assert service.train_model('NIFTY50')
+        data = service.fetcher.fetch_data('NIFTY50', period='6mo')
+
+        meta_path = os.path.join(model_dir, "lgb_NIFTY50.json")
+        with open(meta_path) as f:
+            metadata = json.load(f)
+        metadata['trained_at'] = (datetime.now() - timedelta(days=30)).isoformat(timespec='seconds')
+        with open(meta_path, 'w') as f:
+            json.dump(metadata, f)
+
+        status = service.model_status('NIFTY50')
+        print(f"Status: {status['state']} {status['reasons']}")
+        assert status['state'] == 'stale'
+        assert any('days ago' in r for r in status['reasons'])
+        assert SCHEMA_CHANGED not in status['reasons']
+
+        result = service.predict_with_status('NIFTY50', data)
+        assert result['status'] == 'stale' and result['probability'] is not None
+        assert service.scheduler.wait(timeout=120)
+        reasons = service.model_status('NIFTY50')['reasons']
+        assert reasons == [], reasons
+
+def save_booster(service, symbol, features, metadata_features):
+    """A real booster trained on `features` columns, saved as the symbol's model"""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, len(features)))
+    y = (X[:, 0] + rng.normal(scale=0.5, size=300) > 0).astype(int)
+    model = lgb.train({'objective': 'binary', 'verbose': -1}, lgb.Dataset(X, label=y, feature_name=features),
+                      num_boost_round=10)
+    joblib.dump(model, service._model_path(symbol))
+    metadata = {'trained_at': datetime.now().isoformat(timespec='seconds'), 'features': metadata_features}
+    with open(service._metadata_path(symbol), 'w') as f:
+        json.dump(metadata, f)
+
+def test_schema_change_is_unavailable():
+    print("Testing a model trained on another feature set...")
+    with tempfile.TemporaryDirectory() as model_dir:
+        service = make_service(model_dir)
+        data = service.fetcher.fetch_data('SENSEX', period='6mo')
+        old_features = LGBM_FEATURES[:5]
+
+        # Metadata records the old schema
+        save_booster(service, 'SENSEX', old_features, old_features)
+        result = service.predict_with_status('SENSEX', data)
+        print(f"Result: {result}")
+        assert result['status'] == 'unavailable' and result['probability'] is None
+        assert SCHEMA_CHANGED in result['reasons']
+        assert service.scheduler.wait(timeout=120)
+        assert service.predict_with_status('SENSEX', data)['probability'] is not None
+        service.scheduler.wait(timeout=120)
+
+        # Metadata claims the current schema, but the booster has 5 features
+        save_booster(service, 'SENSEX', old_features, LGBM_FEATURES)
+        service.registry.invalidate(service._model_path('SENSEX'))
+        result = service.predict_with_status('SENSEX', data)
+        assert result['status'] == 'unavailable' and result['probability'] is None
+        assert SCHEMA_CHANGED in result['reasons'] and service.scheduler.pending()
+        service.scheduler.wait(timeout=120)
+
+def test_drift_detection():
+    print("Testing feature drift detection...")
+    with tempfile.TemporaryDirectory() as model_dir:
+        service = make_service(model_dir)
+        assert service.train_model('SENSEX')
+        X, _ = service._prepare_features(service.fetcher.fetch_data('SENSEX', period='6mo'))
+        X = X.copy()
+        X['rsi'] = 99.0
+        reasons = service.model_status('SENSEX', X)['reasons']
+        print(f"Reasons: {reasons}")
+        assert any(r.startswith('rsi drifted') for r in reasons)
+
+if __name__ == "__main__":
+    test_prediction_never_trains_inline()
+    test_stale_model_still_predicts()
+    test_schema_change_is_unavailable()
+    test_drift_detection()
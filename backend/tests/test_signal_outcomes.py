@@ -0,0 +1,102 @@
+import sys
+import os
+import json
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.signal_outcomes import evaluate_signals, summarize_outcomes
+from app.services.signal_tracker import SignalTracker
+from test_indicator_cache import generate_sample_ohlcv
+
+class FakeFetcher:
+    def __init__(self, data):
+        self.data = data
+        self.calls = []
+
+    def fetch_data(self, symbol, period='3mo', interval='1d'):
+        self.calls.append((symbol, period, interval))
+        return self.data
+
+def make_bars():
+    index = pd.date_range('2024-01-01', periods=8, freq='D', tz='Asia/Kolkata')
+    close = np.array([100, 102, 99, 104, 106, 101, 98, 97], dtype=float)
+    return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close, 'Volume': 1.0},
+                        index=index)
+
+def test_evaluate_signals():
+    print("Testing vectorized outcome evaluation...")
+    signals = pd.DataFrame({
+        'symbol': ['NIFTY', 'NIFTY', 'NIFTY', 'NIFTY'],
+        # Intraday timestamps match that day's bar; the last signal has only 1 forward bar
+        'date': pd.to_datetime(['2024-01-01 13:30', '2024-01-02 09:15', '2024-01-03 00:00', '2024-01-07 00:00']),
+        'decision': ['LONG', 'SHORT', 'NO TRADE', 'LONG'],
+        'entry_price': [100.0, 102.0, 99.0, 98.0],
+        'stop_loss': [96.0, 104.5, None, 90.0],
+        'target': [104.5, 95.0, None, 110.0],
+    })
+    out = evaluate_signals(signals, {'NIFTY': make_bars()})
+
+    assert list(out['entry_bar']) == ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-07']
+    assert np.isclose(out['return_1d'].iloc[0], 2.0) and np.isclose(out['return_5d'].iloc[0], 1.0)
+    assert out['hit_1d'].iloc[0] and out['hit_3d'].iloc[0]
+    assert out['hit_1d'].iloc[1] and not out['hit_3d'].iloc[1]
+    assert pd.isna(out['hit_1d'].iloc[2])
+    assert list(out['matured']) == [True, True, True, False]
+    assert np.isnan(out['return_3d'].iloc[3])
+
+    # LONG: highs 103, 100, 105 -> target 104.5 on day 3; SHORT: high 105 on day 2 >= 104.5 stop
+    assert out['outcome'].iloc[0] == 'target' and out['days_to_outcome'].iloc[0] == 3
+    assert out['outcome'].iloc[1] == 'stop' and out['days_to_outcome'].iloc[1] == 2
+    assert pd.isna(out['outcome'].iloc[2])
+    assert out['outcome'].iloc[3] == 'open'
+
+    summary = summarize_outcomes(out)
+    assert summary['matured'] == 3 and summary['trades'] == 2
+    assert summary['hit_rate_1d'] == 1.0 and summary['hit_rate_3d'] == 0.5
+    assert summary['target_rate'] == 0.5 and summary['stop_rate'] == 0.5
+    print(f"Summary: {summary}")
+
+def test_incremental_outcomes():
+    print("Testing incremental outcome storage...")
+    data = generate_sample_ohlcv(60)
+    with tempfile.TemporaryDirectory() as workdir:
+        tracker = SignalTracker(signals_dir=workdir)
+        for day in (10, 20, 58):
+            ts = data.index[day]
+            tracker.log_signal('BANKNIFTY', 'LONG' if day % 20 else 'SHORT', float(data['Close'].iloc[day]),
+                               ts.strftime('%Y-%m-%d %H:%M:%S'), stop_loss=1.0, target=1e9)
+        fetcher = FakeFetcher(data)
+
+        outcomes = tracker.check_outcome(fetcher=fetcher)
+        assert len(outcomes) == 3 and outcomes['matured'].sum() == 2
+        assert len(fetcher.calls) == 1 and fetcher.calls[0][2] == '1d'
+        with open(tracker.outcomes_file) as f:
+            stored = [json.loads(line) for line in f]
+        # The SHORT's stop at 1.0 is hit on day one; the LONG's levels are never reached
+        assert sorted(r['outcome'] for r in stored) == ['expired', 'stop']
+        assert all(isinstance(r['hit_1d'], bool) for r in stored)
+
+        # Matured signals are not evaluated again; only the pending one is
+        evaluated = []
+        import app.services.signal_outcomes as signal_outcomes
+        original = signal_outcomes.evaluate_signals
+        signal_outcomes.evaluate_signals = lambda signals, history: evaluated.append(len(signals)) or original(signals, history)
+        try:
+            again = tracker.check_outcome(fetcher=fetcher)
+        finally:
+            signal_outcomes.evaluate_signals = original
+        assert evaluated == [1] and len(again) == 3
+        assert list(again.sort_values('date')['return_1d'][:2]) == list(outcomes.sort_values('date')['return_1d'][:2])
+
+        day = tracker.check_outcome(signal_date=data.index[20], fetcher=fetcher)
+        assert len(day) == 1 and day['decision'].iloc[0] == 'SHORT'
+
+if __name__ == "__main__":
+    test_evaluate_signals()
+    test_incremental_outcomes()
+    print("All signal outcome tests passed!")
@@ -0,0 +1,130 @@
+import sys
+import os
+import json
+import time
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.signal_store import SignalStore
+from app.services.signal_tracker import SignalTracker
+
+DECISIONS = ['LONG', 'SHORT', 'NO TRADE', 'RANGE TRADE']
+
+def append_signals(signals_dir, worker, count):
+    store = SignalStore(signals_dir, compact_bytes=4096)
+    for i in range(count):
+        day = pd.Timestamp('2025-11-20') + pd.Timedelta(days=i)
+        store.append({'symbol': ['NIFTY', 'BANKNIFTY'][i % 2], 'date': day.strftime('%Y-%m-%d %H:%M:%S'),
+                      'decision': DECISIONS[(i + worker) % 4], 'entry_price': 100.0 + i,
+                      'logged_at': f"{worker}-{i}"})
+
+def test_concurrent_appends_and_compaction():
+    print("Testing concurrent appends with compaction...")
+    with tempfile.TemporaryDirectory() as workdir:
+        # Small compaction threshold: workers compact while others append
+        with ProcessPoolExecutor(max_workers=3) as pool:
+            list(pool.map(append_signals, [workdir] * 3, range(3), [40] * 3))
+        store = SignalStore(workdir)
+        assert store.get_stats()['partitions'] > 0
+
+        signals = store.query()
+        assert len(signals) == 120 and signals['signal_id'].is_unique
+        assert signals['date'].is_monotonic_increasing
+
+        store.compact()
+        stats = store.get_stats()
+        assert stats['wal_bytes'] == 0 and stats['compacted_rows'] == 120
+        # symbol x month partitions: November and December for both symbols
+        assert stats['partitions'] == 4
+        assert os.path.exists(os.path.join(workdir, 'store', 'NIFTY', '2025-12.parquet'))
+        print(f"Store stats: {stats}")
+
+def test_query_filters():
+    print("Testing indexed queries...")
+    with tempfile.TemporaryDirectory() as workdir:
+        append_signals(workdir, 0, 60)
+        store = SignalStore(workdir)
+        store.compact()
+        # A few rows left in the log are still visible to queries
+        store.append({'symbol': 'NIFTY', 'date': '2025-12-15 10:00:00', 'decision': 'LONG',
+                      'entry_price': 1.0, 'logged_at': 'late'})
+
+        everything = store.query()
+        expected = everything[(everything['symbol'] == 'NIFTY') & (everything['decision'] == 'LONG')
+                              & (everything['date'] >= '2025-12-01') & (everything['date'] <= '2025-12-31')]
+        result = store.query(symbol='NIFTY', decision='LONG', start='2025-12-01', end='2025-12-31')
+        assert list(result['signal_id']) == list(expected['signal_id'])
+        assert 'late' in set(result['logged_at'])
+
+        # Partitions outside the range are not opened
+        assert store._matching_partitions({'NIFTY'}, pd.Timestamp('2025-12-01'), pd.Timestamp('2025-12-31'),
+                                          None) == ['NIFTY/2025-12']
+        both = store.query(symbol=['NIFTY', 'BANKNIFTY'], decision=['LONG', 'SHORT'], columns=['symbol', 'decision'])
+        assert list(both.columns) == ['symbol', 'decision'] and set(both['decision']) == {'LONG', 'SHORT'}
+        assert store.query(symbol='SENSEX').empty
+
+def test_compaction_replay_is_idempotent():
+    print("Testing compaction replay...")
+    with tempfile.TemporaryDirectory() as workdir:
+        append_signals(workdir, 0, 10)
+        store = SignalStore(workdir)
+        with open(store.wal_file) as f:
+            wal = f.read()
+        store.compact()
+        # As if the process died after writing partitions but before emptying the log
+        with open(store.wal_file, 'w') as f:
+            f.write(wal)
+        store.compact()
+        assert len(store.query()) == 10 and store.get_stats()['compacted_rows'] == 10
+
+def test_tracker_uses_store():
+    print("Testing SignalTracker on the store...")
+    with tempfile.TemporaryDirectory() as workdir:
+        tracker = SignalTracker(signals_dir=workdir)
+        # Legacy lines without ids or levels load alongside new ones
+        with open(tracker.signals_file, 'w') as f:
+            f.write(json.dumps({'symbol': 'NIFTY', 'date': '2026-01-05 00:00:00', 'decision': 'NO TRADE',
+                                'entry_price': 'N/A', 'logged_at': '2026-01-05T10:00:00'}) + '\n')
+        tracker.log_signal('NIFTY', 'LONG', 25000.0, '2026-01-06 12:00:00', stop_loss=24800.0, target=25300.0)
+        tracker.store.compact()
+        signals = tracker.load_signals(symbol='NIFTY')
+        assert list(signals['decision']) == ['NO TRADE', 'LONG']
+        assert pd.isna(signals['entry_price'].iloc[0]) and signals['target'].iloc[1] == 25300.0
+        assert len(tracker.load_signals(decision='LONG', start='2026-01-06')) == 1
+
+def test_query_speed():
+    print("Testing query speed on a large store...")
+    with tempfile.TemporaryDirectory() as workdir:
+        store = SignalStore(workdir)
+        n = 200000
+        dates = pd.Timestamp('2022-01-01') + pd.to_timedelta(pd.RangeIndex(n) % 1400, unit='D')
+        frame = pd.DataFrame({
+            'symbol': ['NIFTY', 'BANKNIFTY', 'SENSEX', 'FINNIFTY'] * (n // 4),
+            'date': dates.strftime('%Y-%m-%d %H:%M:%S'),
+            'decision': [DECISIONS[i % 4] for i in range(n)],
+            'entry_price': 100.0,
+            'logged_at': pd.RangeIndex(n).astype(str),
+        })
+        frame['signal_id'] = frame['symbol'] + '|' + frame['date'] + '|' + frame['logged_at']
+        frame.to_json(store.wal_file, orient='records', lines=True)
+        store.compact()
+
+        started = time.perf_counter()
+        result = store.query(symbol='NIFTY', start='2024-03-01', end='2024-03-31', decision='LONG')
+        elapsed = time.perf_counter() - started
+        assert not result.empty and set(result['symbol']) == {'NIFTY'}
+        print(f"Range query over {n} signals: {elapsed * 1000:.1f}ms, {len(result)} rows")
+        assert elapsed < 1.0
+
+if __name__ == "__main__":
+    test_concurrent_appends_and_compaction()
+    test_query_filters()
+    test_compaction_replay_is_idempotent()
+    test_tracker_uses_store()
+    test_query_speed()
+    print("All signal store tests passed!")
@@ -0,0 +1,48 @@
+import sys
+import os
+import json
+import subprocess
+
+# Add the backend directory to the Python path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+HEAVY_MODULES = ['pandas', 'numpy', 'talib', 'matplotlib', 'reportlab', 'lightgbm', 'openai', 'yfinance', 'sqlalchemy']
+
+def loaded_heavy_modules(code):
+    """Heavy packages imported by `code` in a fresh interpreter"""
+    probe = code + f"\nimport json, sys\nprint(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    result = subprocess.run([sys.executable, '-c', probe], cwd=backend_dir, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_api_starts_without_scientific_stack():
+    print("Testing API cold start imports...")
+    loaded = loaded_heavy_modules(
+        "from app import create_app\n"
+        "client = create_app().test_client()\n"
+        "assert client.get('/api/health').status_code == 200\n"
+        "assert client.get('/api/cache/stats').status_code == 200"
+    )
+    assert loaded == [], loaded
+
+def test_report_script_defers_heavy_imports():
+    print("Testing generate_reports import...")
+    assert loaded_heavy_modules("import generate_reports\nargs = generate_reports.parse_args") == []
+    # The stages still load what they need
+    assert 'matplotlib' in loaded_heavy_modules("import generate_reports\ngenerate_reports._import_render_stack()")
+
+def test_models_get_a_database():
+    print("Testing lazy database extension...")
+    loaded = loaded_heavy_modules(
+        "from app import create_app\n"
+        "app = create_app()\n"
+        "from app.models import User\n"
+        "assert app.extensions['sqlalchemy'] is not None"
+    )
+    assert 'sqlalchemy' in loaded
+
+if __name__ == "__main__":
+    test_api_starts_without_scientific_stack()
+    test_report_script_defers_heavy_imports()
+    test_models_get_a_database()
+    print("All startup tests passed!")
@@ -41,11 +41,26 @@ function App() {
         },
         body: JSON.stringify({ symbol, period: '3mo' })
       })
-      const data = await response.json()
-      if (response.ok) {
-        setStatus(`Report generated successfully! Path: ${data.report_path}`)
-      } else {
-        setStatus(`Error: ${data.error}`)
+      const job = await response.json()
+      if (!response.ok) {
+        setStatus(`Error: ${job.error}`)
+        setLoading(false)
+        return
+      }
+      // The report is built by a background job: poll its status until it finishes
+      const statusUrl = `${API_URL.replace(/\/api$/, '')}${job.status_url}`
+      while (true) {
+        await new Promise((resolve) => setTimeout(resolve, 1000))
+        const data = await (await fetch(statusUrl)).json()
+        if (data.status === 'done') {
+          setStatus(`Report generated successfully! Path: ${data.report_path}`)
+          break
+        }
+        if (data.status === 'failed' || data.error) {
+          setStatus(`Error: ${data.error}`)
+          break
+        }
+        setStatus(`Generating report... ${data.stage} (${Math.round(data.progress * 100)}%)`)
       }
     } catch (error) {
       setStatus(`Error: ${error}`)
@@ -4,16 +4,38 @@ import os
 # Add backend directory to path so we can import app
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
 
+from sqlalchemy import inspect, text
+
 from app import create_app, db
 from app.models import User, MarketData, Indicator, News, Report, IPO, OptionData
 
 app = create_app()
 
+# Widened from NUMERIC(5, 4), which overflows on index theta/vega and rounds gamma to 0
+GREEK_COLUMNS = ['delta', 'gamma', 'theta', 'vega']
+
+def upgrade_option_greeks():
+    """Widen the greek columns of an existing options_data table; create_all() never alters tables"""
+    if db.engine.dialect.name != 'postgresql':
+        # SQLite does not enforce NUMERIC precision, so old tables already fit
+        return
+    existing = {column['name']: column['type'] for column in inspect(db.engine).get_columns('options_data')}
+    with db.engine.begin() as conn:
+        for name in GREEK_COLUMNS:
+            wanted = OptionData.__table__.c[name].type
+            current = existing.get(name)
+            if current is None or (current.precision, current.scale) == (wanted.precision, wanted.scale):
+                continue
+            print(f"Widening options_data.{name} to NUMERIC({wanted.precision}, {wanted.scale})...")
+            conn.execute(text(f"ALTER TABLE options_data ALTER COLUMN {name} "
+                              f"TYPE NUMERIC({wanted.precision}, {wanted.scale})"))
+
 def init_db():
     with app.app_context():
         print("Creating database tables...")
         db.create_all()
         print("Database tables created successfully!")
+        upgrade_option_greeks()
 
 if __name__ == "__main__":
     init_db()